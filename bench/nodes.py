@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pal
+
+template = '''var a{n} = {n} + 2 * 3 - 4 / (5 - 1);
+var b{n} = !(a{n} < 10) or a{n} >= 2 and -a{n} != a{n} == true;
+if (a{n} <= b{n} or nil) {{
+	a{n} = b{n} = a{n} * (a{n} + 1) - -2;
+}} else print "a" + "b" + "c";
+for (var i = 0; i < a{n}; i = i + 1) print i * i + i / 2 > a{n} - 1;
+'''
+
+nodeClasses = ["expressionStatement", "ifStatement", "whileStatement", "printStatement", "variableStatement",
+			   "blockStatement", "assignExpr", "binaryExpr", "logicalExpr", "unaryExpr", "literalExpr",
+			   "groupingExpr", "variableExpr", "callExpr"]
+
+
+def generate(size):
+	parts = []
+	total = 0
+	n = 0
+	while total < size:
+		block = template.format(n=n)
+		parts.append(block)
+		total += len(block)
+		n += 1
+	return "".join(parts)
+
+
+def withoutSlots(kind):
+	# the same class body laid out with a per-instance __dict__, as the nodes were before __slots__
+	body = {key: value for key, value in vars(kind).items()
+			if key not in ("__slots__", "__dict__", "__weakref__") and not isinstance(value, types.MemberDescriptorType)}
+	return type(kind.__name__, (object,), body)
+
+
+def count(node):
+	if isinstance(node, list):
+		return sum(count(item) for item in node)
+	if type(node).__name__ not in nodeClasses:
+		return 0
+	fields = [field for kind in type(node).__mro__ for field in getattr(kind, "__slots__", ())]
+	values = [getattr(node, field) for field in fields] if fields else list(vars(node).values())
+	return 1 + sum(count(value) for value in values)
+
+
+def measure(tokens):
+	tracemalloc.start()
+	before = tracemalloc.get_traced_memory()[0]
+	statements = pal.prattParser(tokens).parse()
+	after = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return statements, after - before
+
+
+def main():
+	argParser = argparse.ArgumentParser(
+		description="Report bytes per syntax tree node with and without __slots__")
+	argParser.add_argument("--size", type=float, default=1,
+						   help="size of the generated source in megabytes")
+	args = argParser.parse_args()
+	source = generate(int(args.size * 1024 * 1024))
+	handle, path = tempfile.mkstemp(suffix=".pal")
+	with os.fdopen(handle, "w") as file:
+		file.write(source)
+	try:
+		tokens = pal.regexScanner([path]).scanTokens()
+	finally:
+		os.remove(path)
+	statements, slotted = measure(tokens)
+	nodes = count(statements)
+	del statements
+	originals = {name: getattr(pal, name) for name in nodeClasses}
+	try:
+		for name, kind in originals.items():
+			setattr(pal, name, withoutSlots(kind))
+		statements, plain = measure(tokens)
+		if count(statements) != nodes:
+			print("node counts differ")
+			sys.exit(1)
+	finally:
+		for name, kind in originals.items():
+			setattr(pal, name, kind)
+	print("source: " + str(round(len(source) / (1024 * 1024), 2)) + " MB, " + str(nodes) + " nodes")
+	print("before (__dict__) " + str(round(plain / nodes, 1)).rjust(8) + " bytes/node")
+	print("after (__slots__) " + str(round(slotted / nodes, 1)).rjust(8) + " bytes/node")
+	print("reduction: " + str(round(plain / slotted, 2)) + "x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import sys
+import tempfile
+from timeit import default_timer as timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pal
+
+template = '''var a{n} = {n} + 2 * 3 - 4 / (5 - 1);
+var b{n} = !(a{n} < 10) or a{n} >= 2 and -a{n} != a{n} == true;
+if (a{n} <= b{n} or nil) {{
+	a{n} = b{n} = a{n} * (a{n} + 1) - -2;
+}} else print "a" + "b" + "c";
+for (var i = 0; i < a{n}; i = i + 1) print i * i + i / 2 > a{n} - 1;
+'''
+
+
+def generate(size):
+	parts = []
+	total = 0
+	n = 0
+	while total < size:
+		block = template.format(n=n)
+		parts.append(block)
+		total += len(block)
+		n += 1
+	return "".join(parts)
+
+
+def tree(node):
+	if isinstance(node, list):
+		return [tree(item) for item in node]
+	if isinstance(node, (pal.token, pal.tokenView)):
+		return (node.type, node.lexeme, node.line)
+	if isinstance(node, (pal.statement, pal.expr)):
+		fields = [field for kind in type(node).__mro__ for field in getattr(kind, "__slots__", ())]
+		return (type(node).__name__, sorted((field, tree(getattr(node, field))) for field in fields))
+	return node
+
+
+def measure(parserClass, tokens, repeat):
+	best = None
+	statements = []
+	for i in range(repeat):
+		start = timer()
+		statements = parserClass(tokens).parse()
+		elapsed = timer() - start
+		if best == None or elapsed < best:
+			best = elapsed
+	return statements, best
+
+
+def main():
+	argParser = argparse.ArgumentParser(
+		description="Compare parse throughput of the recursive descent, pratt and columnar token parsers")
+	argParser.add_argument("--size", type=float, default=2,
+						   help="size of the generated source in megabytes")
+	argParser.add_argument("--repeat", type=int, default=3,
+						   help="runs per parser, the fastest is reported")
+	args = argParser.parse_args()
+	source = generate(int(args.size * 1024 * 1024))
+	handle, path = tempfile.mkstemp(suffix=".pal")
+	with os.fdopen(handle, "w") as file:
+		file.write(source)
+	try:
+		tokens = pal.regexScanner([path]).scanTokens()
+		store = pal.columnarScanner([path]).scanTokens()
+	finally:
+		os.remove(path)
+	results = []
+	for name, parserClass, stream in [("descent", pal.parser, tokens), ("pratt", pal.prattParser, tokens),
+									  ("columnar", pal.columnarParser, store)]:
+		statements, seconds = measure(parserClass, stream, args.repeat)
+		results.append((name, statements, seconds))
+	for result in results[1:]:
+		if tree(results[0][1]) != tree(result[1]):
+			print("syntax trees differ: " + result[0])
+			sys.exit(1)
+	print("source: " + str(round(len(source) / (1024 * 1024), 2)) + " MB, " + str(len(tokens)) + " tokens")
+	for name, statements, seconds in results:
+		print(name.ljust(10) + " " + str(round(seconds, 3)).rjust(8) + " s " +
+			  str(int(len(tokens) / seconds)).rjust(12) + " tokens/s")
+	for name, statements, seconds in results[1:]:
+		print(name + " speedup: " + str(round(results[0][2] / seconds, 2)) + "x")
+
+
+if __name__ == "__main__":
+	main()
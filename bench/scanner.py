@@ -0,0 +1,98 @@
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+from timeit import default_timer as timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pal
+
+template = '''// generated block {n}
+var count{n} = {n};
+var name{n} = "item {n}";
+for (var i = 0; i < count{n}; i = i + 1.5) {{
+	if (i >= 10 and !(name{n} == "x") or i != nil) print name{n} + "!";
+	else {{
+		count{n} = count{n} - 1;
+	}}
+}}
+var list{n} = [1 2.5 "three" true false nil];
+'''
+
+
+def generate(size):
+	parts = []
+	total = 0
+	n = 0
+	while total < size:
+		block = template.format(n=n)
+		parts.append(block)
+		total += len(block)
+		n += 1
+	return "".join(parts)
+
+
+def measure(scannerClass, path, repeat):
+	best = None
+	tokens = []
+	for i in range(repeat):
+		instance = scannerClass([path])
+		start = timer()
+		tokens = instance.scanTokens()
+		elapsed = timer() - start
+		if best == None or elapsed < best:
+			best = elapsed
+	return tokens, best
+
+
+def retained(scannerClass, path):
+	tracemalloc.start()
+	instance = scannerClass([path])
+	before = tracemalloc.get_traced_memory()[0]
+	tokens = instance.scanTokens()
+	after, peak = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+	return after - before, peak - before
+
+
+def stream(tokens):
+	return [(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+def main():
+	argParser = argparse.ArgumentParser(
+		description="Compare tokens per second and token memory of the character, regex and columnar scanners")
+	argParser.add_argument("--size", type=float, default=4,
+						   help="size of the generated source in megabytes")
+	argParser.add_argument("--repeat", type=int, default=3,
+						   help="runs per scanner, the fastest is reported")
+	args = argParser.parse_args()
+	source = generate(int(args.size * 1024 * 1024))
+	handle, path = tempfile.mkstemp(suffix=".pal")
+	with os.fdopen(handle, "w") as file:
+		file.write(source)
+	try:
+		results = []
+		for name, scannerClass in [("character", pal.scanner), ("regex", pal.regexScanner), ("columnar", pal.columnarScanner)]:
+			tokens, seconds = measure(scannerClass, path, args.repeat)
+			size, peak = retained(scannerClass, path)
+			results.append((name, tokens, seconds, size, peak))
+	finally:
+		os.remove(path)
+	for result in results[1:]:
+		if stream(results[0][1]) != stream(result[1]):
+			print("token streams differ: " + result[0])
+			sys.exit(1)
+	print("source: " + str(round(len(source) / (1024 * 1024), 2)) + " MB, " + str(len(results[0][1])) + " tokens")
+	for name, tokens, seconds, size, peak in results:
+		print(name.ljust(10) + " " + str(round(seconds, 3)).rjust(8) + " s " +
+			  str(int(len(tokens) / seconds)).rjust(12) + " tokens/s " +
+			  str(round(size / len(tokens), 1)).rjust(8) + " bytes/token retained " +
+			  str(round(peak / len(tokens), 1)).rjust(8) + " bytes/token peak")
+	for name, tokens, seconds, size, peak in results[1:]:
+		print(name + " speedup: " + str(round(results[0][2] / seconds, 2)) + "x")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+from timeit import default_timer as timer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import pal
+
+fibonacci = '''var runs = 0;
+while (runs < {count}) {{
+  var a = 0;
+  var temp;
+
+  for (var b = 1; a < 100000000; b = temp + b) {{
+    temp = a;
+    a = b;
+  }}
+  runs = runs + 1;
+}}
+print runs;
+'''
+
+arrays = '''var x{n} = [[1 2 3] [true false] ["hello" "world"] ["P" 4 "L" "!=" nil] [{n} [{n} [{n}]]]];
+print x{n};
+while(false) print x{n};
+'''
+
+generated = '''// generated block {n}
+var a{n} = {n} + 2 * 3 - 4 / (5 - 1);
+var b{n} = !(a{n} < 10) or a{n} >= 2 and -a{n} != a{n} == true;
+var name{n} = "item {n}";
+if (a{n} <= {n} * 2 or b{n}) {{
+	a{n} = a{n} * (a{n} + 1) - -2;
+}} else print name{n} + "!";
+for (var i = 0; i < 5; i = i + 1) a{n} = a{n} + i / 2;
+'''
+
+phases = ["scan", "parse", "resolve", "interpret"]
+
+
+def repeated(template, size):
+	parts = []
+	total = 0
+	n = 0
+	while total < size:
+		block = template.format(n=n)
+		parts.append(block)
+		total += len(block)
+		n += 1
+	return "".join(parts)
+
+
+def nested(count, depth):
+	opening = "".join("{ var x" + str(d) + " = x" + str(d - 1) + " + 1;\n" for d in range(1, depth))
+	return ("var total = 0;\n" +
+			"for (var i = 0; i < " + str(count) + "; i = i + 1) { var x0 = i;\n" + opening +
+			"total = total + x" + str(depth - 1) + ";\n" + "}" * depth + "\nprint total;\n")
+
+
+def workloads(scale):
+	return {
+		"fibonacci": fibonacci.format(count=int(3000 * scale)),
+		"nested": nested(int(2000 * scale), 32),
+		"arrays": repeated(arrays, int(256 * 1024 * scale)),
+		"generated": repeated(generated, int(512 * 1024 * scale)),
+	}
+
+
+def settings(args):
+	# the same options pal.py would get on its command line, so new ones pick up their defaults here too
+	return pal.pal.arguments().parse_args(["--scanner", args.scanner, "--parser", args.parser, "--backend", args.backend,
+										   "--output", "block", "--no-optimize", "--no-cache"])
+
+
+def run(path, args):
+	# one pass through the phases, program output is kept in memory
+	scannerClass = {"regex": pal.regexScanner, "columnar": pal.columnarScanner, "character": pal.scanner}[args.scanner]
+	instance = scannerClass([path])
+	start = timer()
+	tokens = instance.scanTokens()
+	scanned = timer()
+	if args.parser == "pratt" and type(tokens) is pal.tokenStore:
+		tokenParser = pal.columnarParser(tokens)
+	elif args.parser == "pratt":
+		tokenParser = pal.prattParser(tokens)
+	else:
+		tokenParser = pal.parser(tokens)
+	statements = tokenParser.parse()
+	parsed = timer()
+	runner = pal.interpreter(settings(args), instance)
+	runner.output = pal.outputSink("capture")
+	entry = {"tree": runner.interpret, "closures": runner.interpretClosures,
+			 "bytecode": runner.interpretBytecode, "python": runner.interpretPython}[args.backend]
+	begin = timer()
+	runner.resolve(statements)
+	resolved = timer()
+	entry(statements)
+	end = timer()
+	if pal.interpreter.hadError or pal.interpreter.hadRuntimeError:
+		print("workload failed: " + path)
+		sys.exit(1)
+	return {"scan": scanned - start, "parse": parsed - scanned, "resolve": resolved - begin, "interpret": end - resolved}
+
+
+def summarize(samples):
+	return {
+		"min": min(samples),
+		"median": statistics.median(samples),
+		"mean": statistics.mean(samples),
+		"stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+		"runs": len(samples),
+	}
+
+
+def measure(source, args):
+	handle, path = tempfile.mkstemp(suffix=".pal")
+	with os.fdopen(handle, "w") as file:
+		file.write(source)
+	try:
+		samples = {phase: [] for phase in phases}
+		for i in range(args.repeat):
+			for phase, seconds in run(path, args).items():
+				samples[phase].append(seconds)
+	finally:
+		os.remove(path)
+	return {phase: summarize(values) for phase, values in samples.items()}
+
+
+def compare(results, baseline, threshold, minimum):
+	# a phase regresses when its median is both threshold times and minimum seconds slower, so sub-millisecond noise never counts
+	regressions = []
+	for name, measured in results.items():
+		for phase in phases:
+			previous = baseline.get("results", {}).get(name, {}).get(phase)
+			if previous == None or previous["median"] <= 0:
+				continue
+			ratio = measured[phase]["median"] / previous["median"]
+			slower = measured[phase]["median"] - previous["median"]
+			verdict = "REGRESSION" if ratio > 1 + threshold and slower > minimum else "ok"
+			print(name.ljust(10) + " " + phase.ljust(10) + " " + str(round(ratio, 2)).rjust(6) + "x baseline  " + verdict)
+			if verdict != "ok":
+				regressions.append(name + " " + phase)
+	return regressions
+
+
+def main():
+	argParser = argparse.ArgumentParser(
+		description="Time the scan, parse, resolve and interpret phases over representative workloads and check them against a baseline")
+	argParser.add_argument("--repeat", type=int, default=5,
+						   help="runs per workload, statistics are taken over all of them")
+	argParser.add_argument("--scale", type=float, default=1,
+						   help="multiplier for the loop counts and generated source sizes")
+	argParser.add_argument("--workload", action="append", choices=["fibonacci", "nested", "arrays", "generated"],
+						   help="only run the given workload, may be repeated")
+	argParser.add_argument("--scanner", choices=["regex", "columnar", "character"], default="regex")
+	argParser.add_argument("--parser", choices=["pratt", "descent"], default="pratt")
+	argParser.add_argument("--backend", choices=["tree", "closures", "bytecode", "python"], default="tree")
+	argParser.add_argument("--save", metavar="PATH", help="write the results as a json baseline")
+	argParser.add_argument("--baseline", metavar="PATH", help="compare against a json baseline and fail on regressions")
+	argParser.add_argument("--threshold", type=float, default=0.25,
+						   help="allowed slowdown of a phase median before it counts as a regression")
+	argParser.add_argument("--min-delta", dest="minDelta", type=float, default=0.002, metavar="SECONDS",
+						   help="slowdowns of a phase median smaller than this never count as a regression")
+	args = argParser.parse_args()
+	results = {}
+	for name, source in workloads(args.scale).items():
+		if args.workload and name not in args.workload:
+			continue
+		results[name] = measure(source, args)
+		print(name + ": " + str(round(len(source) / 1024, 1)) + " KB")
+		for phase in phases:
+			stats = results[name][phase]
+			print("  " + phase.ljust(10) + " median " + str(round(stats["median"], 4)).rjust(8) + " s  min " +
+				  str(round(stats["min"], 4)).rjust(8) + " s  stdev " + str(round(stats["stdev"], 4)).rjust(8) + " s")
+	if args.save:
+		with open(args.save, "w") as file:
+			json.dump({"settings": vars(settings(args)), "scale": args.scale, "results": results}, file, indent=2)
+	if args.baseline:
+		with open(args.baseline) as file:
+			baseline = json.load(file)
+		if baseline.get("scale") != args.scale or baseline.get("settings") != vars(settings(args)):
+			print("baseline was recorded with different settings, ratios are not comparable")
+		regressions = compare(results, baseline, args.threshold, args.minDelta)
+		if regressions:
+			print("regressed past " + str(int(args.threshold * 100)) + "%: " + ", ".join(regressions))
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
@@ -1,944 +1,5380 @@
-import argparse
-import os
-import re
-import sys
-from enum import Enum
-from timeit import default_timer as timer
-
-paths = [".", "./lib"]
-TokenType = Enum("TokenType", "LEFT_PAREN RIGHT_PAREN LEFT_BRACE RIGHT_BRACE COMMA DOT MINUS PLUS SEMICOLON SLASH STAR BANG BANG_EQUAL EQUAL EQUAL_EQUAL GREATER GREATER_EQUAL LESS LESS_EQUAL IDENTIFIER STRING NUMBER ARRAY AND CLASS ELSE FALSE FUN FOR IF NIL OR PRINT RETURN SUPER THIS TRUE VAR WHILE EOF")
-TokenChar = {'(': "LEFT_PAREN", ')': "RIGHT_PAREN", '{': "LEFT_BRACE", '}': "RIGHT_BRACE", ',': "COMMA", '.': "DOT", '-': "MINUS", '+': "PLUS", ';': "SEMICOLON",
-			 '*': "STAR", "!": "BANG", "!=": "BANG_EQUAL", "=": "EQUAL", "==": "EQUAL_EQUAL", "<": "LESS", "<=": "LESS_EQUAL", ">": "MORE", ">= ": "MORE_EQUAL", "/": "SLASH", "[" : "LEFT_CROTCHET", "]" : "RIGHT_CROTCHET"}
-Identifiers = {"and": "AND", "class": "CLASS", "else": "ELSE", "false": "FALSE", "for": "FOR", "fun": "FUN", "if": "IF", "nil": "NIL",
-			   "or": "OR", "print": "PRINT", "return": "RETURN", "super": "SUPER", "this": "THIS", "true": "TRUE", "var": "VAR", "while": "WHILE"}
-
-
-class scanner:
-	'''
-	attrs: source(string), tokens(token), start(int), current(int), line(int)
-	'''
-
-	def __init__(self, inputFilePath):
-		self.source = ""
-		self.read(inputFilePath)
-		self.start = 0
-		self.current = 0
-		self.line = 0
-		self.tokens = []
-
-	def read(self, inputFilePath):
-		path = inputFilePath[0]
-		file = open(path)
-		self.source = file.read()
-		file.close()
-
-	def scanTokens(self):
-		while self.current < len(self.source):
-			self.start = self.current
-			self.scanToken()
-		self.tokens.append(token("EOF", "", None, self.line))
-		return self.tokens
-
-	def scanToken(self):
-		c = self.source[self.current]
-		self.current += 1
-		if c == " " or c == "\r" or c == "\t":
-			return
-		elif c == '"':
-			self.string()
-			return
-		elif c == "\n":
-			self.line += 1
-			return
-		elif c == "/":
-			if self.match("/"):
-				while self.peek() != "\n" and self.current < len(self.source):
-					self.current += 1
-			else:
-				self.addToken(TokenChar[c], None)
-			return
-		elif self.match("=") and c+"=" in TokenChar:
-			self.addToken(TokenChar[c+"="], None)
-			return
-		elif c in TokenChar:
-			self.addToken(TokenChar[c], None)
-			return
-		elif c == "o":
-			if self.match("r"):
-				self.addToken("OR", None)
-				return
-		else:
-			if c.isnumeric():
-				self.number()
-				return
-			elif c.isalpha() or c == "_":
-				self.identifier()
-				return
-			else:
-				interpreter.error(self.line, "Unexpected character.")
-
-	def identifier(self):
-		while self.peek().isalpha() or self.peek().isnumeric() or self.peek() == "_":
-			self.current += 1
-		string = self.source[self.start:self.current]
-		if string in Identifiers:
-			self.addToken(Identifiers[string], None)
-		else:
-			self.addToken("IDENTIFIER", None)
-
-	def number(self):
-		while self.peek().isnumeric():
-			self.current += 1
-		if self.peek == "." and self.peekNext().isnumeric():
-			self.current += 1
-			while self.peek().isnumeric():
-				self.current += 1
-		self.addToken("NUMBER", float(self.source[self.start:self.current]))
-
-	def peekNext(self):
-		if self.current + 1 >= len(self.source):
-			return "\0"
-		return self.source[self.current+1]
-
-	def string(self):
-		while self.peek() != '"' and self.current < len(self.source):
-			if self.peek() == "\n":
-				self.line += 1
-			self.current += 1
-		if self.current >= len(self.source):
-			interpreter.error(self.line, "Unterminated string.")
-			return
-		self.current += 1
-		self.addToken("STRING", self.source[self.start+1:self.current-1])
-
-	def addToken(self, type, literal):
-		self.tokens.append(
-			token(type, self.source[self.start:self.current], literal, self.line))
-
-	def match(self, c):
-		if (self.current >= len(self.source)) or (self.source[self.current] != c):
-			return False
-		self.current += 1
-		return True
-
-	def peek(self):
-		if self.current >= len(self.source):
-			return "\0"
-		return self.source[self.current]
-
-
-class token:
-	'''
-	attrs: type(string), lexeme(string), literal(string), line(int)
-	'''
-
-	def __init__(self, type, lexeme, literal, line):
-		self.type = type
-		self.lexeme = lexeme
-		self.literal = literal
-		self.line = line
-
-	def toString(self):
-		return str(self.type) + " " + str(self.lexeme) + " " + str(self.literal)
-
-
-class statement(object):
-	pass
-
-
-class expressionStatement(statement):
-	'''
-	attrs: expression(expr)
-	'''
-
-	def __init__(self, expression):
-		self.expression = expression
-
-	def toString(self):
-		return self.expression.toString()
-
-
-class ifStatement(statement):
-	'''
-	attrs: condition(expr), thenBranch(statement), elseBranch(statement)
-	'''
-
-	def __init__(self, condition, thenBranch, elseBranch):
-		self.condition = condition
-		self.thenBranch = thenBranch
-		self.elseBranch = elseBranch
-	
-	def toString(self):
-		return "(if " + self.condition.toString() + " then " + self.thenBranch.toString() + " else " + self.elseBranch.toString() + ")"
-
-
-class whileStatement(statement):
-	'''
-	attrs: condition(expr), body(statement)
-	'''
-
-	def __init__(self, condition, body):
-		self.condition = condition
-		self.body = body
-
-	def toString(self):
-		return "(while " + self.condition.toString() + " " + self.body.toString() + ")"
-
-
-class printStatement(statement):
-	'''
-	attrs: expression(expr)
-	'''
-
-	def __init__(self, expression):
-		self.expression = expression
-
-	def toString(self):
-		return "(print " + self.expression.toString() + ")"
-
-
-class variableStatement(statement):
-	'''
-	attrs: name(token), initializer(expr)
-	'''
-
-	def __init__(self, name, initializer):
-		self.initializer = initializer
-		self.name = name
-
-	def toString(self):
-		return "(" + self.name.toString() + " " + self.initializer.toString() + ")"
-
-
-class blockStatement(statement):
-	'''
-	attrs: statements(statement)
-	'''
-
-	def __init__(self, statements):
-		self.statements = statements
-
-	def toString(self):
-		return str([statement.toString() for statement in self.statements])
-
-
-class parser():
-	'''
-	attrs: tokens(token), current(int)
-	'''
-
-	def __init__(self, tokens):
-		self.tokens = tokens
-		self.current = 0
-
-	def parse(self):
-		statements = []
-		while(not self.isAtEnd()):
-			statements.append(self.declaration())
-		return statements
-
-	def declaration(self):
-		try:
-			if self.match(["VAR"]):
-				return self.varDeclaration()
-			return self.statement()
-		except parseError as e:
-			self.synchronize()
-			return None
-
-	def varDeclaration(self):
-		name = self.consume("IDENTIFIER", "Expect variable name.")
-		initializer = None
-		if self.match(["EQUAL"]):
-			initializer = self.expression()
-		self.consume("SEMICOLON", "Expect ';' after variable declaration.")
-		return variableStatement(name, initializer)
-
-	def statement(self):
-		if self.match(["FOR"]):
-			return self.forStatement()
-		elif self.match(["IF"]):
-			return self.ifStatement()
-		elif self.match(["PRINT"]):
-			return self.printStatement()
-		elif self.match(["WHILE"]):
-			return self.whileStatement()
-		elif self.match(["LEFT_BRACE"]):
-			return blockStatement(self.block())
-		return self.expressionStatement()
-
-	def forStatement(self):
-		self.consume("LEFT_PAREN", "Expect '(' after 'for'.")
-		initializer = None
-		if self.match(["SEMICOLON"]):
-			initializer = None
-		elif self.match(["VAR"]):
-			initializer = self.varDeclaration()
-		else:
-			initializer = self.expressionStatement()
-		condition = None
-		if not self.check("SEMICOLON"):
-			condition = self.expression()
-		self.consume("SEMICOLON", "Expect ';' after loop condition.")
-		increment = None
-		if not self.check("RIGHT_PAREN"):
-			increment = self.expression()
-		self. consume("RIGHT_PAREN", "Expect ')' after for clauses.")
-		body = self.statement()
-		if increment != None:
-			body = blockStatement([body,expressionStatement(increment)])
-		if condition == None:
-			condition = literalExpr(True)
-		body = whileStatement(condition, body)
-		if initializer != None:
-			body = blockStatement([initializer, body])
-		return body
-
-	def whileStatement(self):
-		self.consume("LEFT_PAREN", "Expect '(' after 'while'.")
-		condition = self.expression()
-		self.consume("RIGHT_PAREN", "Expect ')' after condition.")
-		body = self.statement()
-		return whileStatement(condition, body)
-
-	def block(self):
-		statements = []
-		while not self.check("RIGHT_BRACE") and not self.isAtEnd():
-			statements.append(self.declaration())
-		self.consume("RIGHT_BRACE", "Expect '}' after block.")
-		return statements
-
-	def ifStatement(self):
-		self.consume("LEFT_PAREN", "Expect '(' after 'if'.")
-		condition = self.expression()
-		self.consume("RIGHT_PAREN", "Expect ')' after if condition.")
-		thenBranch = self.statement()
-		elseBranch = None
-		if self.match(["ELSE"]):
-			elseBranch = self.statement()
-		return ifStatement(condition, thenBranch, elseBranch)
-
-	def printStatement(self):
-		value = self.expression()
-		self.consume("SEMICOLON", "Expect ';' after value.")
-		return printStatement(value)
-
-	def expressionStatement(self):
-		expr = self.expression()
-		self.consume("SEMICOLON", "Expect ';' after value.")
-		return expressionStatement(expr)
-
-	def parseSingle(self):
-		try:
-			return self.expression()
-		except parseError:
-			return None
-
-	def expression(self):
-		return self.assignment()
-
-	def assignment(self):
-		expr = self.lOr()
-		if self.match(["EQUAL"]):
-			equals = self.previous()
-			value = self.assignment()
-			if type(expr) is variableExpr:
-				name = expr.name
-				return assignExpr(name, value)
-			self.error(equals, "Invalid assignment target.")
-		return expr
-
-	def lOr(self):
-		expr = self.lAnd()
-		while self.match(["OR"]):
-			operator = self.previous()
-			right = self.lAnd()
-			expr = logicalExpr(expr, operator, right)
-		return expr
-
-	def lAnd(self):
-		expr = self.equality()
-		while self.match(["AND"]):
-			operator = self.previous()
-			right = self.equality()
-			expr = logicalExpr(expr, operator, right)
-		return expr
-
-	def equality(self):
-		expr = self.comparison()
-		while self.match(["BANG_EQUAL", "EQUAL_EQUAL"]):
-			operator = self.previous()
-			right = self.comparison()
-			expr = binaryExpr(expr, operator, right)
-		return expr
-
-	def comparison(self):
-		expr = self.term()
-		while self.match(["GREATER", "GREATER_EQUAL", "LESS", "LESS_EQUAL"]):
-			operator = self.previous()
-			right = self.term()
-			expr = binaryExpr(expr, operator, right)
-		return expr
-
-	def term(self):
-		expr = self.factor()
-		while self.match(["MINUS", "PLUS"]):
-			operator = self.previous()
-			right = self.factor()
-			expr = binaryExpr(expr, operator, right)
-		return expr
-
-	def factor(self):
-		expr = self.unary()
-		while self.match(["SLASH", "STAR"]):
-			operator = self.previous()
-			right = self.unary()
-			expr = binaryExpr(expr, operator, right)
-		return expr
-
-	def unary(self):
-		if self.match(["BANG", "MINUS"]):
-			operator = self.previous()
-			right = self.unary()
-			return unaryExpr(operator, right)
-		return self.call()
-
-	def call(self):
-		expr = self.primary()
-		while True:
-			if self.match(["LEFT_PAREN"]):
-				expr = self.finishCall(expr)
-			else:
-				break
-		return expr
-
-	def finishCall(self, callee):
-		arguments = []
-		if not self.check("RIGHT_PAREN"):
-			arguments.append(self.expression())
-			while self.match(["COMMA"]):
-				if len(arguments) >== 255:
-					self.error(self.peek(), "Can't have more than 255 arguments.")
-				arguments.append(self.expression())
-		paren = self.consume("RIGHT_PAREN", "Expect ')' after arguments.")
-		return callExpr(callee, paren, arguments)
-
-	def primary(self):
-		if self.match(["FALSE"]):
-			return literalExpr(False)
-		elif self.match(["TRUE"]):
-			return literalExpr(True)
-		elif self.match(["NIL"]):
-			return literalExpr(None)
-		elif self.match(["NUMBER"]):
-			return literalExpr(float(self.previous().literal))
-		elif self.match(["STRING"]):
-			return literalExpr(str(self.previous().literal))
-		elif self.match(["IDENTIFIER"]):
-			return variableExpr(self.previous())
-		elif self.match(["LEFT_PAREN"]):
-			expr = self.expression()
-			self.consume("RIGHT_PAREN", "Expect ')' after expression.")
-			return groupingExpr(expr)
-		elif self.match(["LEFT_CROTCHET"]):
-			expr = self.array()
-			self.consume("RIGHT_CROTCHET", "Expect ']' after elements.")
-			return expr
-		raise self.error(self.peek(), "Expect expression.")
-
-	def array(self):
-		array = []
-		while not self.isAtEnd() and not self.check("RIGHT_CROTCHET"):
-			expr = self.expression()
-			if type(expr) is not literalExpr:
-				raise self.error(self.peek(), "Expect expression.")
-				return
-			array.append(expr.value)
-		return literalExpr(array)
-
-	def error(self, peek, message):
-		interpreter.parseError(peek, message)
-		return parseError()
-
-	def consume(self, type, message):
-		if self.check(type):
-			return self.advance()
-		raise self.error(self.peek(), message)
-
-	def synchronize(self):
-		self.advance()
-		while not self.isAtEnd():
-			if self.previous().type == "SEMICOLON":
-				return
-			elif self.peek().type in ["CLASS", "FUN", "VAR", "FOR", "IF", "WHILE", "PRINT", "RETURN"]:
-				return
-			self.advance()
-
-	def match(self, types):
-		for type in types:
-			if self.check(type):
-				self.advance()
-				return True
-		return False
-
-	def check(self, type):
-		if self.isAtEnd():
-			return False
-		return self.peek().type == type
-
-	def advance(self):
-		if not self.isAtEnd():
-			self.current += 1
-		return self.previous()
-
-	def isAtEnd(self):
-		return self.peek().type == "EOF"
-
-	def peek(self):
-		return self.tokens[self.current]
-
-	def previous(self):
-		return self.tokens[self.current-1]
-
-
-class parseError(RuntimeError):
-	pass
-
-
-class interpreterRuntimeError(RuntimeError):
-	'''
-	attrs: token(token), message(string)
-	'''
-
-	def __init__(self, token, message):
-		self.message = message
-		self.token = token
-
-
-class interpreter:
-	'''
-	attrs: scanner(scanner), hadError(bool), args(dict), enviroment(enviroment)
-	'''
-
-	hadError = False
-	hadRuntimeError = False
-
-	def __init__(self, args, scanner):
-		self.args = args
-		self.scanner = scanner
-		self.enviroment = enviroment()
-
-	def run(self):
-		if interpreter.hadError or interpreter.hadRuntimeError:
-			exit()
-		tokens = self.scanner.scanTokens()
-		if self.args.verbose:
-			print("======= tokens =======")
-			for token in tokens:
-					print(token.toString())
-			print("======================\n")
-		tokenParser = parser(tokens)
-		statements = tokenParser.parse()
-		if interpreter.hadError:
-			return
-		if self.args.verbose:
-			print("===== statements =====")
-			for s in statements:
-				try:
-					print(str(type(s)) + " " + s.toString())
-				except:
-					print(str(type(s)))
-			print("======================\n")
-		print("======= output =======")
-		self.interpret(statements)
-		print("======================\n")
-
-	def interpret(self, statements):
-		try:
-			for statement in statements:
-				self.execute(statement)
-		except interpreterRuntimeError as e:
-			interpreter.runTimeError(e)
-
-	def execute(self, statement):
-		self.evaluate(statement)
-
-	def stringify(self, obj):
-		if obj == None:
-			return "nil"
-		if type(obj) is float:
-			text = str(obj)
-			if len(text) > 2 and text[-2::] == ".0":
-				text = text[0:-2]
-			return text
-		if type(obj) is list:
-			return [self.stringify(item) for item in obj]
-		return str(obj)
-	
-	def visitCallExpr(self, expression):
-		callee = self.evaluate(expression.callee)
-		arguments = []
-		for argument in expression.arguments:
-			arguments.append(self.evaluate(argument))
-		function = callee
-		return function.call(self, arguments)
-
-	def visitExpressionStatement(self, statement):
-		self.evaluate(statement.expression)
-		return None
-
-	def visitBlockStatement(self, statement):
-		self.executeBlock(statement.statements, enviroment(self.enviroment))
-		return None
-
-	def visitWhileStatement(self, statement):
-		while self.isTruthy(self.evaluate(statement.condition)):
-			self.execute(statement.body)
-		return None
-
-	def executeBlock(self, statements, enviroment):
-		previous = self.enviroment
-		try:
-			self.enviroment = enviroment
-			for statement in statements:
-				self.execute(statement)
-		finally:
-			self.enviroment = previous
-
-	def visitIfStatement(self, statement):
-		if self.isTruthy(self.evaluate(statement.condition)):
-			self.execute(statement.thenBranch)
-		elif statement.elseBranch != None:
-			self.execute(statement.elseBranch)
-		return None
-
-	def visitLogicalExpr(self, expression):
-		left = self.evaluate(expression.left)
-		if expression.op.type == "OR":
-			if self.isTruthy(left):
-				return left
-		else:
-			if not self.isTruthy(left):
-				return left
-		return self.evaluate(expression.right)
-
-	def visitPrintStatement(self, statement):
-		value = self.evaluate(statement.expression)
-		print(self.stringify(value))
-		return None
-
-	def visitVarStatement(self, statement):
-		value = None
-		if statement.initializer != None:
-			value = self.evaluate(statement.initializer)
-		self.enviroment.define(statement.name.lexeme, value)
-		return None
-
-	def visitVariableExpr(self, expression):
-		return self.enviroment.get(expression.name)
-
-	def visitLiteralExpr(self, expression):
-		return expression.value
-
-	def visitGroupingExpr(self, expression):
-		return self.evaluate(expression.expression)
-
-	def visitUnaryExpr(self, expression):
-		right = self.evaluate(expression.right)
-		if expression.op.type == "MINUS":
-			self.checkNumberOperand(expression.op, right)
-			return -1*float(right)
-		elif expression.op.type == "BANG":
-			return not self.isTruthy(right)
-		return None
-
-	def visitAssignExpr(self, expression):
-		value = self.evaluate(expression.value)
-		self.enviroment.assign(expression.name, value)
-		return value
-
-	def isTruthy(self, object):
-		if object == None:
-			return False
-		elif type(object) is bool:
-			return bool(object)
-		return True
-
-	def visitBinaryExpr(self, expression):
-		left = self.evaluate(expression.left)
-		right = self.evaluate(expression.right)
-		if expression.op.type == "MINUS":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) - float(right)
-		elif expression.op.type == "SLASH":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) / float(right)
-		elif expression.op.type == "STAR":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) * float(right)
-		elif expression.op.type == "PLUS":
-			if type(left) is float and type(right) is float:
-				return float(left) + float(right)
-			elif type(left) is str and type(right) is str:
-				return str(left) + str(right)
-			raise interpreterRuntimeError(
-				expression.op, "Operands must be two numbers or two strings.")
-		elif expression.op.type == "GREATER":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) > float(right)
-		elif expression.op.type == "GREATER_EQUAL":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) >= float(right)
-		elif expression.op.type == "LESS":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) < float(right)
-		elif expression.op.type == "LESS_EQUAL":
-			self.checkNumberOperands(expression.op, left, right)
-			return float(left) <= float(right)
-		elif expression.op.type == "BANG_EQUAL":
-			return not self.isEqual(left, right)
-		elif expression.op.type == "EQUAL_EQUAL":
-			return self.isEqual(left, right)
-		return None
-
-	def checkNumberOperand(self, op, operand):
-		if type(operand) is float:
-			return
-		raise interpreterRuntimeError(op, "Operand must be a number.")
-
-	def checkNumberOperands(self, op, left, right):
-		if type(left) is float and type(right) is float:
-			return
-		raise interpreterRuntimeError(op, "Operands must be numbers")
-
-	def isEqual(self, left, right):
-		if left == None and right == None:
-			return True
-		if left == None:
-			return False
-		return left == right
-
-	def evaluate(self, obj):
-		if type(obj) is groupingExpr:
-			return self.visitGroupingExpr(obj)
-		elif type(obj) is literalExpr:
-			return self.visitLiteralExpr(obj)
-		elif type(obj) is binaryExpr:
-			return self.visitBinaryExpr(obj)
-		elif type(obj) is unaryExpr:
-			return self.visitUnaryExpr(obj)
-		elif type(obj) is expressionStatement:
-			return self.visitExpressionStatement(obj)
-		elif type(obj) is printStatement:
-			return self.visitPrintStatement(obj)
-		elif type(obj) is variableExpr:
-			return self.visitVariableExpr(obj)
-		elif type(obj) is variableStatement:
-			return self.visitVarStatement(obj)
-		elif type(obj) is assignExpr:
-			return self.visitAssignExpr(obj)
-		elif type(obj) is blockStatement:
-			return self.visitBlockStatement(obj)
-		elif type(obj) is ifStatement:
-			return self.visitIfStatement(obj)
-		elif type(obj) is logicalExpr:
-			return self.visitLogicalExpr(obj)
-		elif type(obj) is whileStatement:
-			return self.visitWhileStatement(obj)
-		elif type(obj) is callExpr:
-			return self.visitCallExpr(obj)
-
-	@staticmethod
-	def parseError(token,  message):
-		if token.type == "EOF":
-			interpreter.report(str(token.line), " at end", str(message))
-		else:
-			interpreter.report(str(token.line), " at '" +
-							   str(token.lexeme) + "'", str(message))
-
-	@staticmethod
-	def error(line, message):
-		interpreter.report(line, "", message)
-
-	@staticmethod
-	def report(line, where, message):
-		print("[line " + str(line) + "] Error" +
-			  str(where) + ": " + str(message))
-		interpreter.hadError = True
-
-	@staticmethod
-	def runTimeError(error):
-		print(str(error.message) + " [line " + str(error.token.line) + "]")
-		interpreter.hadRuntimeError = True
-
-
-class expr(object):
-	pass
-
-
-class assignExpr(expr):
-	'''
-	attrs: name(token), value(expr)
-	'''
-
-	def __init__(self, name, value):
-		self.name = name
-		self.value = value
-
-	def toString(self):
-		return "(" + self.name.toString() + " " + self.value.toString() + ")"
-
-
-class binaryExpr(expr):
-	'''
-	attrs: left(expr),op(token),right(expr)
-	'''
-
-	def __init__(self, left, op, right):
-		self.left = left
-		self.token = self.op = op
-		self.right = right
-
-	def toString(self):
-		return "((" + self.left.toString() + "),(" + str(self.token.toString()) + "),(" + self.right.toString() + "))"
-
-
-class logicalExpr(expr):
-	'''
-	attrs: left(expr),op(token),right(expr)
-	'''
-
-	def __init__(self, left, op, right):
-		self.left = left
-		self.token = self.op = op
-		self.right = right
-
-	def toString(self):
-		return "((" + self.left.toString() + "),(" + str(self.token.toString()) + "),(" + self.right.toString() + "))"
-
-
-class unaryExpr(expr):
-	'''
-	attrs: op(token),right(expr)
-	'''
-
-	def __init__(self, op, right):
-		self.token = self.op = op
-		self.right = right
-
-	def toString(self):
-		return "((" + str(self.token.toString()) + "),(" + self.right.toString() + "))"
-
-
-class literalExpr(expr):
-	'''
-	attrs: value(object)?
-	'''
-
-	def __init__(self, value):
-		self.value = value
-
-	def toString(self):
-		return "(" + str(self.value) + ")"
-
-
-class groupingExpr(expr):
-	'''
-	attrs: expression(expr)
-	'''
-
-	def __init__(self, expression):
-		self.expression = expression
-
-	def toString(self):
-		return "(" + self.expression.toString() + ")"
-
-
-class variableExpr(expr):
-	'''
-	attrs: name(token)
-	'''
-
-	def __init__(self, name):
-		self.name = name
-
-	def toString(self):
-		return "(" + self.name.toString() + ")"
-
-
-class callExpr(expr):
-	'''
-	attrs: callee(expr), paren(token), arguments(list(expr))
-	'''
-
-	def __init__(self, callee, paren, arguments):
-		self.callee = callee
-		self.paren = paren
-		self.arguments = arguments
-
-	def toString(self):
-		return "(" + self.callee.toString() + " " + self.paren.toString() + " " + str(self.arguments) + ")"
-
-
-class enviroment():
-	'''
-	attrs: values(dict), enclosing(enviroment)
-	'''
-
-	def __init__(self, enclosing=None):
-		self.values = {}
-		if enclosing == None:
-			self.enclosing = None
-		else:
-			self.enclosing = enclosing
-
-	def define(self, name, value):
-		self.values[str(name)] = value
-
-	def get(self, name):
-		if name.lexeme in self.values:
-			return self.values[name.lexeme]
-		if self.enclosing != None:
-			return self.enclosing.get(name)
-		raise interpreterRuntimeError(
-			name, "Undefined variable '" + str(name.lexeme) + "'.")
-
-	def assign(self, name, value):
-		if name.lexeme in self.values:
-			self.values[str(name.lexeme)] = value
-			return
-		if self.enclosing != None:
-			self.enclosing.assign(name, value)
-			return
-		raise interpreterRuntimeError(
-			name, "Undefined variable '" + str(name.lexeme) + "'.")
-
-
-class pal():
-
-	def __init__(self):
-		# input arguments
-		argParser = argparse.ArgumentParser(
-			description="A basic interpreter for Pal, a general purpouse programming language")
-		argParser.add_argument(
-			"input", nargs=1, help="specify a input file containing a program to run")
-		argParser.add_argument("-v", "--verbose", dest="verbose",
-							   action="store_true", help="show debugging output")
-		self.args = argParser.parse_args()
-		inputFilePath = self.args.input
-		# run
-		if inputFilePath != None:
-			try:
-				self.scanner = scanner(inputFilePath)
-				self.interpreter = interpreter(self.args, self.scanner)
-				start = timer()
-				self.interpreter.run()
-				end = timer()
-				if self.args.verbose:
-					print("Execution finished in", (end-start), "seconds")
-			except Exception as e:
-				print(e)
-
-
-if __name__ == "__main__":
-	pal()
+import argparse
+import ast
+import codecs
+import concurrent.futures
+import gc
+import glob
+import hashlib
+import io
+import json
+import marshal
+import math
+import operator
+import os
+import queue
+import re
+import select
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import warnings
+from array import array
+from collections import OrderedDict, deque
+from enum import Enum
+from timeit import default_timer as timer
+
+paths = [".", "./lib"]
+TokenType = Enum("TokenType", "LEFT_PAREN RIGHT_PAREN LEFT_BRACE RIGHT_BRACE COMMA DOT MINUS PLUS SEMICOLON SLASH STAR BANG BANG_EQUAL EQUAL EQUAL_EQUAL GREATER GREATER_EQUAL LESS LESS_EQUAL LEFT_CROTCHET RIGHT_CROTCHET COLON IDENTIFIER STRING NUMBER ARRAY AND CLASS ELSE FALSE FUN FOR IF NIL OR PRINT RETURN SUPER THIS TRUE VAR WHILE EOF")
+TokenChar = {'(': "LEFT_PAREN", ')': "RIGHT_PAREN", '{': "LEFT_BRACE", '}': "RIGHT_BRACE", ',': "COMMA", '.': "DOT", '-': "MINUS", '+': "PLUS", ';': "SEMICOLON",
+			 '*': "STAR", "!": "BANG", "!=": "BANG_EQUAL", "=": "EQUAL", "==": "EQUAL_EQUAL", "<": "LESS", "<=": "LESS_EQUAL", ">": "GREATER", ">=": "GREATER_EQUAL", "/": "SLASH", "[" : "LEFT_CROTCHET", "]" : "RIGHT_CROTCHET", ":": "COLON"}
+TokenCode = {member.name: member.value for member in TokenType}
+Identifiers = {"and": "AND", "class": "CLASS", "else": "ELSE", "false": "FALSE", "for": "FOR", "fun": "FUN", "if": "IF", "nil": "NIL",
+			   "or": "OR", "print": "PRINT", "return": "RETURN", "super": "SUPER", "this": "THIS", "true": "TRUE", "var": "VAR", "while": "WHILE"}
+
+
+class scanner:
+	'''
+	attrs: source(string), path(string), tokens(token), start(int), current(int), line(int)
+	the source is read from the first input path unless it is given directly, as the repl does
+	'''
+
+	def __init__(self, inputFilePath, source=None):
+		self.source = ""
+		self.path = None
+		if source == None:
+			self.read(inputFilePath)
+		else:
+			self.source = source
+		self.start = 0
+		self.current = 0
+		self.line = 0
+		self.tokens = []
+
+	def read(self, inputFilePath):
+		path = inputFilePath[0]
+		self.path = path
+		file = open(path)
+		self.source = file.read()
+		file.close()
+
+	def scanTokens(self):
+		while self.current < len(self.source):
+			self.start = self.current
+			self.scanToken()
+		self.tokens.append(token("EOF", "", None, self.line))
+		return self.tokens
+
+	def scanToken(self):
+		c = self.source[self.current]
+		self.current += 1
+		if c == " " or c == "\r" or c == "\t":
+			return
+		elif c == '"':
+			self.string()
+			return
+		elif c == "\n":
+			self.line += 1
+			return
+		elif c == "/":
+			if self.match("/"):
+				while self.peek() != "\n" and self.current < len(self.source):
+					self.current += 1
+			else:
+				self.addToken(TokenChar[c], None)
+			return
+		elif c+"=" in TokenChar and self.match("="):
+			self.addToken(TokenChar[c+"="], None)
+			return
+		elif c in TokenChar:
+			self.addToken(TokenChar[c], None)
+			return
+		else:
+			if c.isnumeric():
+				self.number()
+				return
+			elif c.isalpha() or c == "_":
+				self.identifier()
+				return
+			else:
+				interpreter.error(self.line, "Unexpected character.")
+
+	def identifier(self):
+		while self.peek().isalpha() or self.peek().isnumeric() or self.peek() == "_":
+			self.current += 1
+		string = self.source[self.start:self.current]
+		if string in Identifiers:
+			self.addToken(Identifiers[string], None)
+		else:
+			self.addToken("IDENTIFIER", None)
+
+	def number(self):
+		while self.peek().isnumeric():
+			self.current += 1
+		if self.peek() == "." and self.peekNext().isnumeric():
+			self.current += 1
+			while self.peek().isnumeric():
+				self.current += 1
+		self.addToken("NUMBER", float(self.source[self.start:self.current]))
+
+	def peekNext(self):
+		if self.current + 1 >= len(self.source):
+			return "\0"
+		return self.source[self.current+1]
+
+	def string(self):
+		while self.peek() != '"' and self.current < len(self.source):
+			if self.peek() == "\n":
+				self.line += 1
+			self.current += 1
+		if self.current >= len(self.source):
+			interpreter.error(self.line, "Unterminated string.")
+			return
+		self.current += 1
+		self.addToken("STRING", self.source[self.start+1:self.current-1])
+
+	def addToken(self, type, literal):
+		self.tokens.append(
+			token(type, self.source[self.start:self.current], literal, self.line))
+
+	def match(self, c):
+		if (self.current >= len(self.source)) or (self.source[self.current] != c):
+			return False
+		self.current += 1
+		return True
+
+	def peek(self):
+		if self.current >= len(self.source):
+			return "\0"
+		return self.source[self.current]
+
+
+class regexScanner(scanner):
+	'''
+	attrs: source(string), tokens(token), line(int)
+	splits the source with one compiled master pattern, then classifies each lexeme by its first character
+	'''
+
+	pattern = re.compile(r'[^\W\d]\w*|\d+(?:\.\d+)?|[!=<>]=|//[^\n]*|"[^"]*"?|\n|[^ \t\r\n]')
+
+	def scanTokens(self):
+		# tokens never form reference cycles, so the cyclic collector only slows down building millions of them
+		collecting = gc.isenabled()
+		gc.disable()
+		try:
+			self.scanLexemes(self.pattern.findall(self.source))
+		finally:
+			if collecting:
+				gc.enable()
+		self.current = len(self.source)
+		self.tokens.append(token("EOF", "", None, self.line))
+		return self.tokens
+
+	def scanLexemes(self, lexemes):
+		append = self.tokens.append
+		line = self.line
+		for lexeme in lexemes:
+			if lexeme in TokenChar:
+				append(token(TokenChar[lexeme], lexeme, None, line))
+				continue
+			c = lexeme[0]
+			if c == "\n":
+				line += 1
+			elif c == '"':
+				line += lexeme.count("\n")
+				if len(lexeme) > 1 and lexeme[-1] == '"':
+					append(token("STRING", lexeme, lexeme[1:-1], line))
+				else:
+					interpreter.error(line, "Unterminated string.")
+			elif c == "/":
+				continue
+			elif c.isdecimal():
+				append(token("NUMBER", lexeme, float(lexeme), line))
+			elif c.isalnum() or c == "_":
+				append(token(Identifiers.get(lexeme, "IDENTIFIER"), lexeme, None, line))
+			else:
+				interpreter.error(line, "Unexpected character.")
+		self.line = line
+
+
+class columnarScanner(regexScanner):
+	'''
+	attrs: source(string), tokens(tokenStore), line(int)
+	scans like regexScanner but records each token as a row of integers in a tokenStore
+	'''
+
+	charCodes = {char: TokenCode[kind] for char, kind in TokenChar.items()}
+	identifierCodes = {word: TokenCode[kind] for word, kind in Identifiers.items()}
+
+	def scanTokens(self):
+		store = tokenStore(self.source)
+		types = store.types.append
+		starts = store.starts.append
+		ends = store.ends.append
+		lines = store.lines.append
+		charCodes = self.charCodes
+		identifierCodes = self.identifierCodes
+		identifier = TokenCode["IDENTIFIER"]
+		number = TokenCode["NUMBER"]
+		string = TokenCode["STRING"]
+		line = self.line
+		for match in self.pattern.finditer(self.source):
+			lexeme = match.group()
+			c = lexeme[0]
+			if lexeme in charCodes:
+				code = charCodes[lexeme]
+			elif c == "\n":
+				line += 1
+				continue
+			elif c == '"':
+				line += lexeme.count("\n")
+				if len(lexeme) == 1 or lexeme[-1] != '"':
+					interpreter.error(line, "Unterminated string.")
+					continue
+				code = string
+			elif c == "/":
+				continue
+			elif c.isdecimal():
+				code = number
+			elif c.isalnum() or c == "_":
+				code = identifierCodes.get(lexeme, identifier)
+			else:
+				interpreter.error(line, "Unexpected character.")
+				continue
+			start, end = match.span()
+			types(code)
+			starts(start)
+			ends(end)
+			lines(line)
+		self.line = line
+		self.current = len(self.source)
+		store.append(TokenCode["EOF"], self.current, self.current, line)
+		self.tokens = store
+		return store
+
+
+class token:
+	'''
+	attrs: type(string), lexeme(string), literal(string), line(int)
+	'''
+
+	__slots__ = ("type", "lexeme", "literal", "line")
+
+	def __init__(self, type, lexeme, literal, line):
+		self.type = type
+		self.lexeme = lexeme
+		self.literal = literal
+		self.line = line
+
+	def toString(self):
+		return str(self.type) + " " + str(self.lexeme) + " " + str(self.literal)
+
+
+class tokenStore():
+	'''
+	attrs: source(string), types(array), starts(array), ends(array), lines(array)
+	keeps tokens as parallel arrays of integer codes, source offsets and lines, lexemes are sliced on demand
+	'''
+
+	names = {member.value: member.name for member in TokenType}
+
+	def __init__(self, source):
+		self.source = source
+		self.types = array("B")
+		self.starts = array("I")
+		self.ends = array("I")
+		self.lines = array("I")
+
+	def append(self, code, start, end, line):
+		self.types.append(code)
+		self.starts.append(start)
+		self.ends.append(end)
+		self.lines.append(line)
+
+	def __len__(self):
+		return len(self.types)
+
+	def __getitem__(self, index):
+		if index < 0:
+			index += len(self.types)
+		return tokenView(self, index)
+
+	def __iter__(self):
+		for index in range(len(self.types)):
+			yield tokenView(self, index)
+
+	def lexeme(self, index):
+		return self.source[self.starts[index]:self.ends[index]]
+
+	def token(self, index):
+		return token(self.names[self.types[index]], self.lexeme(index), self.literal(index), self.lines[index])
+
+	def literal(self, index):
+		code = self.types[index]
+		if code == TokenCode["NUMBER"]:
+			return float(self.lexeme(index))
+		elif code == TokenCode["STRING"]:
+			return self.source[self.starts[index]+1:self.ends[index]-1]
+		return None
+
+
+class tokenView():
+	'''
+	attrs: store(tokenStore), index(int)
+	reads one token out of a tokenStore with the same attributes as token
+	'''
+
+	__slots__ = ("store", "index")
+
+	def __init__(self, store, index):
+		self.store = store
+		self.index = index
+
+	@property
+	def type(self):
+		return self.store.names[self.store.types[self.index]]
+
+	@property
+	def lexeme(self):
+		return self.store.lexeme(self.index)
+
+	@property
+	def literal(self):
+		return self.store.literal(self.index)
+
+	@property
+	def line(self):
+		return self.store.lines[self.index]
+
+	def toString(self):
+		return str(self.type) + " " + str(self.lexeme) + " " + str(self.literal)
+
+
+class statement(object):
+	__slots__ = ()
+
+
+class expressionStatement(statement):
+	'''
+	attrs: expression(expr)
+	'''
+
+	__slots__ = ("expression",)
+
+	def __init__(self, expression):
+		self.expression = expression
+
+	def toString(self):
+		return self.expression.toString()
+
+
+class ifStatement(statement):
+	'''
+	attrs: condition(expr), thenBranch(statement), elseBranch(statement)
+	'''
+
+	__slots__ = ("condition", "thenBranch", "elseBranch")
+
+	def __init__(self, condition, thenBranch, elseBranch):
+		self.condition = condition
+		self.thenBranch = thenBranch
+		self.elseBranch = elseBranch
+	
+	def toString(self):
+		return "(if " + self.condition.toString() + " then " + self.thenBranch.toString() + " else " + self.elseBranch.toString() + ")"
+
+
+class whileStatement(statement):
+	'''
+	attrs: condition(expr), body(statement), scope(blockStatement), counted(bool)
+	scope is the block of the body whose enviroment one run of the loop allocates once and clears every pass,
+	the body itself or the first block of a for loop's body, and only when no function can capture it
+	counted loops have the shape for (var i = a; i < n; i = i + k) and run without evaluating the condition and increment as nodes,
+	the resolver marks them once constants are folded
+	'''
+
+	__slots__ = ("condition", "body", "scope", "counted")
+
+	def __init__(self, condition, body):
+		self.condition = condition
+		self.body = body
+		self.scope = None
+		candidates = body.statements if type(body) is blockStatement and not body.scoped else [body]
+		for candidate in candidates:
+			if type(candidate) is blockStatement and candidate.scoped and not blockStatement.closes(candidate.statements):
+				self.scope = candidate
+				break
+		self.counted = False
+
+	def toString(self):
+		return "(while " + self.condition.toString() + " " + self.body.toString() + ")"
+
+
+class printStatement(statement):
+	'''
+	attrs: expression(expr)
+	'''
+
+	__slots__ = ("expression",)
+
+	def __init__(self, expression):
+		self.expression = expression
+
+	def toString(self):
+		return "(print " + self.expression.toString() + ")"
+
+
+class variableStatement(statement):
+	'''
+	attrs: name(token), initializer(expr), slot(int)
+	'''
+
+	__slots__ = ("name", "initializer", "slot")
+
+	def __init__(self, name, initializer):
+		self.initializer = initializer
+		self.name = name
+		self.slot = None
+
+	def toString(self):
+		return "(" + self.name.toString() + " " + self.initializer.toString() + ")"
+
+
+class blockStatement(statement):
+	'''
+	attrs: statements(statement), slotCount(int), scoped(bool)
+	blocks that declare nothing are not scoped, they run in the enclosing enviroment and the resolver gives them no scope
+	'''
+
+	__slots__ = ("statements", "slotCount", "scoped")
+
+	def __init__(self, statements):
+		self.statements = statements
+		self.slotCount = 0
+		self.scoped = any(type(inner) is variableStatement or type(inner) is functionStatement for inner in statements)
+
+	@staticmethod
+	def closes(statements):
+		# whether a function is declared anywhere in the statements, its closure would outlive a reused enviroment
+		for inner in statements:
+			kind = type(inner)
+			if kind is functionStatement:
+				return True
+			elif kind is blockStatement and blockStatement.closes(inner.statements):
+				return True
+			elif kind is ifStatement and blockStatement.closes(
+					[inner.thenBranch] + ([inner.elseBranch] if inner.elseBranch != None else [])):
+				return True
+			elif kind is whileStatement and blockStatement.closes([inner.body]):
+				return True
+		return False
+
+	def toString(self):
+		return str([statement.toString() for statement in self.statements])
+
+
+class functionStatement(statement):
+	'''
+	attrs: name(token), params(list(token)), body(list(statement)), slot(int), slotCount(int), pooled(bool)
+	pooled is set by the resolver when no closure can outlive a call, so its frame can be reused
+	'''
+
+	__slots__ = ("name", "params", "body", "slot", "slotCount", "pooled")
+
+	def __init__(self, name, params, body):
+		self.name = name
+		self.params = params
+		self.body = body
+		self.slot = None
+		self.slotCount = 0
+		self.pooled = False
+
+	def toString(self):
+		return ("(fun " + self.name.toString() + " " + str([param.lexeme for param in self.params]) + " " +
+				str([statement.toString() for statement in self.body]) + ")")
+
+
+class returnStatement(statement):
+	'''
+	attrs: keyword(token), value(expr)
+	'''
+
+	__slots__ = ("keyword", "value")
+
+	def __init__(self, keyword, value):
+		self.keyword = keyword
+		self.value = value
+
+	def toString(self):
+		if self.value == None:
+			return "(return)"
+		return "(return " + self.value.toString() + ")"
+
+
+class parser():
+	'''
+	attrs: tokens(token), current(int), elements(int), functions(int)
+	'''
+
+	def __init__(self, tokens):
+		self.tokens = tokens
+		self.current = 0
+		self.elements = 0
+		self.functions = 0
+
+	def parse(self):
+		statements = []
+		while(not self.isAtEnd()):
+			statements.append(self.declaration())
+		return statements
+
+	def declaration(self):
+		try:
+			if self.match(["FUN"]):
+				return self.funDeclaration()
+			if self.match(["VAR"]):
+				return self.varDeclaration()
+			return self.statement()
+		except parseError as e:
+			self.synchronize()
+			return None
+
+	def varDeclaration(self):
+		name = self.consume("IDENTIFIER", "Expect variable name.")
+		initializer = None
+		if self.match(["EQUAL"]):
+			initializer = self.expression()
+		self.consume("SEMICOLON", "Expect ';' after variable declaration.")
+		return variableStatement(name, initializer)
+
+	def funDeclaration(self):
+		name = self.consume("IDENTIFIER", "Expect function name.")
+		self.consume("LEFT_PAREN", "Expect '(' after function name.")
+		params = []
+		if not self.check("RIGHT_PAREN"):
+			params.append(self.consume("IDENTIFIER", "Expect parameter name."))
+			while self.match(["COMMA"]):
+				if len(params) >= 255:
+					self.error(self.peek(), "Can't have more than 255 parameters.")
+				params.append(self.consume("IDENTIFIER", "Expect parameter name."))
+		self.consume("RIGHT_PAREN", "Expect ')' after parameters.")
+		self.consume("LEFT_BRACE", "Expect '{' before function body.")
+		self.functions += 1
+		try:
+			body = self.block()
+		finally:
+			self.functions -= 1
+		return functionStatement(name, params, body)
+
+	def statement(self):
+		if self.match(["FOR"]):
+			return self.forStatement()
+		elif self.match(["IF"]):
+			return self.ifStatement()
+		elif self.match(["PRINT"]):
+			return self.printStatement()
+		elif self.match(["RETURN"]):
+			return self.returnStatement()
+		elif self.match(["WHILE"]):
+			return self.whileStatement()
+		elif self.match(["LEFT_BRACE"]):
+			return blockStatement(self.block())
+		return self.expressionStatement()
+
+	def forStatement(self):
+		self.consume("LEFT_PAREN", "Expect '(' after 'for'.")
+		initializer = None
+		if self.match(["SEMICOLON"]):
+			initializer = None
+		elif self.match(["VAR"]):
+			initializer = self.varDeclaration()
+		else:
+			initializer = self.expressionStatement()
+		condition = None
+		if not self.check("SEMICOLON"):
+			condition = self.expression()
+		self.consume("SEMICOLON", "Expect ';' after loop condition.")
+		increment = None
+		if not self.check("RIGHT_PAREN"):
+			increment = self.expression()
+		self. consume("RIGHT_PAREN", "Expect ')' after for clauses.")
+		body = self.statement()
+		if increment != None:
+			body = blockStatement([body,expressionStatement(increment)])
+		if condition == None:
+			condition = literalExpr(True)
+		body = whileStatement(condition, body)
+		if initializer != None:
+			body = blockStatement([initializer, body])
+		return body
+
+	def whileStatement(self):
+		self.consume("LEFT_PAREN", "Expect '(' after 'while'.")
+		condition = self.expression()
+		self.consume("RIGHT_PAREN", "Expect ')' after condition.")
+		body = self.statement()
+		return whileStatement(condition, body)
+
+	def block(self):
+		statements = []
+		while not self.check("RIGHT_BRACE") and not self.isAtEnd():
+			statements.append(self.declaration())
+		self.consume("RIGHT_BRACE", "Expect '}' after block.")
+		return statements
+
+	def ifStatement(self):
+		self.consume("LEFT_PAREN", "Expect '(' after 'if'.")
+		condition = self.expression()
+		self.consume("RIGHT_PAREN", "Expect ')' after if condition.")
+		thenBranch = self.statement()
+		elseBranch = None
+		if self.match(["ELSE"]):
+			elseBranch = self.statement()
+		return ifStatement(condition, thenBranch, elseBranch)
+
+	def printStatement(self):
+		value = self.expression()
+		self.consume("SEMICOLON", "Expect ';' after value.")
+		return printStatement(value)
+
+	def returnStatement(self):
+		keyword = self.previous()
+		if not self.functions:
+			self.error(keyword, "Can't return from top-level code.")
+		value = None
+		if not self.check("SEMICOLON"):
+			value = self.expression()
+		self.consume("SEMICOLON", "Expect ';' after return value.")
+		return returnStatement(keyword, value)
+
+	def expressionStatement(self):
+		expr = self.expression()
+		self.consume("SEMICOLON", "Expect ';' after value.")
+		return expressionStatement(expr)
+
+	def parseSingle(self):
+		try:
+			return self.expression()
+		except parseError:
+			return None
+
+	def expression(self):
+		return self.assignment()
+
+	def assignment(self):
+		expr = self.lOr()
+		if self.match(["EQUAL"]):
+			equals = self.previous()
+			value = self.assignment()
+			if type(expr) is variableExpr:
+				name = expr.name
+				return assignExpr(name, value)
+			elif type(expr) is indexExpr:
+				return setIndexExpr(expr.object, expr.bracket, expr.index, value)
+			self.error(equals, "Invalid assignment target.")
+		return expr
+
+	def lOr(self):
+		expr = self.lAnd()
+		while self.match(["OR"]):
+			operator = self.previous()
+			right = self.lAnd()
+			expr = logicalExpr(expr, operator, right)
+		return expr
+
+	def lAnd(self):
+		expr = self.equality()
+		while self.match(["AND"]):
+			operator = self.previous()
+			right = self.equality()
+			expr = logicalExpr(expr, operator, right)
+		return expr
+
+	def equality(self):
+		expr = self.comparison()
+		while self.match(["BANG_EQUAL", "EQUAL_EQUAL"]):
+			operator = self.previous()
+			right = self.comparison()
+			expr = binaryExpr(expr, operator, right)
+		return expr
+
+	def comparison(self):
+		expr = self.term()
+		while self.match(["GREATER", "GREATER_EQUAL", "LESS", "LESS_EQUAL"]):
+			operator = self.previous()
+			right = self.term()
+			expr = binaryExpr(expr, operator, right)
+		return expr
+
+	def term(self):
+		expr = self.factor()
+		while self.match(["MINUS", "PLUS"]):
+			operator = self.previous()
+			right = self.factor()
+			expr = binaryExpr(expr, operator, right)
+		return expr
+
+	def factor(self):
+		expr = self.unary()
+		while self.match(["SLASH", "STAR"]):
+			operator = self.previous()
+			right = self.unary()
+			expr = binaryExpr(expr, operator, right)
+		return expr
+
+	def unary(self):
+		if self.match(["BANG", "MINUS"]):
+			operator = self.previous()
+			right = self.unary()
+			return unaryExpr(operator, right)
+		return self.call()
+
+	def call(self):
+		expr = self.primary()
+		while True:
+			if self.match(["LEFT_PAREN"]):
+				expr = self.finishCall(expr)
+			elif not self.elements and self.match(["LEFT_CROTCHET"]):
+				expr = self.finishIndex(expr)
+			else:
+				break
+		return expr
+
+	def finishCall(self, callee):
+		arguments = []
+		if not self.check("RIGHT_PAREN"):
+			arguments.append(self.expression())
+			while self.match(["COMMA"]):
+				if len(arguments) >= 255:
+					self.error(self.peek(), "Can't have more than 255 arguments.")
+				arguments.append(self.expression())
+		paren = self.consume("RIGHT_PAREN", "Expect ')' after arguments.")
+		return callExpr(callee, paren, arguments)
+
+	def finishIndex(self, array):
+		bracket = self.previous()
+		start = None
+		if not self.check("COLON"):
+			start = self.expression()
+		if self.match(["COLON"]):
+			stop = None
+			if not self.check("RIGHT_CROTCHET"):
+				stop = self.expression()
+			self.consume("RIGHT_CROTCHET", "Expect ']' after slice.")
+			return sliceExpr(array, bracket, start, stop)
+		self.consume("RIGHT_CROTCHET", "Expect ']' after index.")
+		return indexExpr(array, bracket, start)
+
+	def primary(self):
+		if self.match(["FALSE"]):
+			return literalExpr(False)
+		elif self.match(["TRUE"]):
+			return literalExpr(True)
+		elif self.match(["NIL"]):
+			return literalExpr(None)
+		elif self.match(["NUMBER"]):
+			return literalExpr(float(self.previous().literal))
+		elif self.match(["STRING"]):
+			return literalExpr(str(self.previous().literal))
+		elif self.match(["IDENTIFIER"]):
+			return variableExpr(self.previous())
+		elif self.match(["LEFT_PAREN"]):
+			expr = self.expression()
+			self.consume("RIGHT_PAREN", "Expect ')' after expression.")
+			return groupingExpr(expr)
+		elif self.match(["LEFT_CROTCHET"]):
+			expr = self.array()
+			self.consume("RIGHT_CROTCHET", "Expect ']' after elements.")
+			return expr
+		raise self.error(self.peek(), "Expect expression.")
+
+	def array(self):
+		array = []
+		# elements follow each other without separators, so a bracket after one starts the next element
+		self.elements += 1
+		try:
+			while not self.isAtEnd() and not self.check("RIGHT_CROTCHET"):
+				expr = self.expression()
+				if type(expr) is not literalExpr:
+					raise self.error(self.peek(), "Expect expression.")
+					return
+				array.append(expr.value)
+		finally:
+			self.elements -= 1
+		return literalExpr(numericArray.fromList(array))
+
+	def error(self, peek, message):
+		interpreter.parseError(peek, message)
+		return parseError()
+
+	def consume(self, type, message):
+		if self.check(type):
+			return self.advance()
+		raise self.error(self.peek(), message)
+
+	def synchronize(self):
+		self.advance()
+		while not self.isAtEnd():
+			if self.previous().type == "SEMICOLON":
+				return
+			elif self.peek().type in ["CLASS", "FUN", "VAR", "FOR", "IF", "WHILE", "PRINT", "RETURN"]:
+				return
+			self.advance()
+
+	def match(self, types):
+		for type in types:
+			if self.check(type):
+				self.advance()
+				return True
+		return False
+
+	def check(self, type):
+		if self.isAtEnd():
+			return False
+		return self.peek().type == type
+
+	def advance(self):
+		if not self.isAtEnd():
+			self.current += 1
+		return self.previous()
+
+	def isAtEnd(self):
+		return self.peek().type == "EOF"
+
+	def peek(self):
+		return self.tokens[self.current]
+
+	def previous(self):
+		return self.tokens[self.current-1]
+
+
+class prattParser(parser):
+	'''
+	attrs: tokens(token), kinds(list), current(int), elements(int), functions(int)
+	parses expressions by precedence climbing over a binding power table instead of one method per level
+	'''
+
+	bindingPower = {"OR": 1, "AND": 2, "BANG_EQUAL": 3, "EQUAL_EQUAL": 3, "GREATER": 4, "GREATER_EQUAL": 4,
+					"LESS": 4, "LESS_EQUAL": 4, "MINUS": 5, "PLUS": 5, "SLASH": 6, "STAR": 6}
+	logical = frozenset(["OR", "AND"])
+	prefix = frozenset(["BANG", "MINUS"])
+	constants = {"FALSE": False, "TRUE": True, "NIL": None}
+	EQUAL, LEFT_PAREN, LEFT_CROTCHET, IDENTIFIER, NUMBER, STRING = (
+		"EQUAL", "LEFT_PAREN", "LEFT_CROTCHET", "IDENTIFIER", "NUMBER", "STRING")
+
+	def __init__(self, tokens):
+		parser.__init__(self, tokens)
+		self.kinds = [token.type for token in tokens]
+
+	def parse(self):
+		collecting = gc.isenabled()
+		gc.disable()
+		try:
+			return parser.parse(self)
+		finally:
+			if collecting:
+				gc.enable()
+
+	def assignment(self):
+		expr = self.binary(0)
+		if self.kinds[self.current] == self.EQUAL:
+			equals = self.advance()
+			value = self.assignment()
+			if type(expr) is variableExpr:
+				return assignExpr(expr.name, value)
+			elif type(expr) is indexExpr:
+				return setIndexExpr(expr.object, expr.bracket, expr.index, value)
+			self.error(equals, "Invalid assignment target.")
+		return expr
+
+	def binary(self, minPower):
+		expr = self.unary()
+		kinds = self.kinds
+		bindingPower = self.bindingPower
+		while True:
+			kind = kinds[self.current]
+			power = bindingPower.get(kind, 0)
+			if power <= minPower:
+				return expr
+			op = self.take()
+			right = self.binary(power)
+			if kind in self.logical:
+				expr = logicalExpr(expr, op, right)
+			else:
+				expr = binaryExpr(expr, op, right)
+
+	def unary(self):
+		if self.kinds[self.current] in self.prefix:
+			return unaryExpr(self.take(), self.unary())
+		return self.call()
+
+	def call(self):
+		expr = self.primary()
+		while True:
+			kind = self.kinds[self.current]
+			if kind == self.LEFT_PAREN:
+				self.current += 1
+				expr = self.finishCall(expr)
+			elif kind == self.LEFT_CROTCHET and not self.elements:
+				self.current += 1
+				expr = self.finishIndex(expr)
+			else:
+				return expr
+
+	def primary(self):
+		kind = self.kinds[self.current]
+		if kind == self.IDENTIFIER:
+			return variableExpr(self.take())
+		elif kind == self.NUMBER:
+			return literalExpr(float(self.take().literal))
+		elif kind == self.STRING:
+			return literalExpr(str(self.take().literal))
+		elif kind in self.constants:
+			self.current += 1
+			return literalExpr(self.constants[kind])
+		return parser.primary(self)
+
+	def take(self):
+		self.current += 1
+		return self.tokens[self.current-1]
+
+
+class columnarParser(prattParser):
+	'''
+	attrs: tokens(tokenStore), kinds(array), current(int), elements(int), functions(int)
+	runs the pratt parser over a tokenStore, comparing integer token codes
+	'''
+
+	bindingPower = {TokenCode[kind]: power for kind, power in prattParser.bindingPower.items()}
+	logical = frozenset(TokenCode[kind] for kind in prattParser.logical)
+	prefix = frozenset(TokenCode[kind] for kind in prattParser.prefix)
+	constants = {TokenCode[kind]: value for kind, value in prattParser.constants.items()}
+	EQUAL, LEFT_PAREN, LEFT_CROTCHET, IDENTIFIER, NUMBER, STRING = (TokenCode[kind] for kind in (
+		"EQUAL", "LEFT_PAREN", "LEFT_CROTCHET", "IDENTIFIER", "NUMBER", "STRING"))
+	EOF = TokenCode["EOF"]
+
+	def __init__(self, tokens):
+		self.tokens = tokens
+		self.kinds = tokens.types
+		self.current = 0
+		self.elements = 0
+		self.functions = 0
+
+	def check(self, type):
+		kind = self.kinds[self.current]
+		return kind != self.EOF and kind == TokenCode[type]
+
+	def isAtEnd(self):
+		return self.kinds[self.current] == self.EOF
+
+	def primary(self):
+		kind = self.kinds[self.current]
+		if kind == self.NUMBER or kind == self.STRING:
+			self.current += 1
+			return literalExpr(self.tokens.literal(self.current-1))
+		return prattParser.primary(self)
+
+	def advance(self):
+		if self.kinds[self.current] != self.EOF:
+			self.current += 1
+		return tokenView(self.tokens, self.current-1)
+
+	def take(self):
+		self.current += 1
+		return self.tokens.token(self.current-1)
+
+
+class optimizer():
+	'''
+	attrs: interpreter(interpreter), removed(int)
+	folds constant expression subtrees into literals and drops grouping wrappers
+	'''
+
+	def __init__(self, interpreter):
+		self.interpreter = interpreter
+		self.removed = 0
+
+	def optimize(self, statements):
+		for statement in statements:
+			self.optimizeStatement(statement)
+		return statements
+
+	def optimizeStatement(self, statement):
+		kind = type(statement)
+		if kind is expressionStatement or kind is printStatement:
+			statement.expression = self.fold(statement.expression)
+		elif kind is variableStatement:
+			if statement.initializer != None:
+				statement.initializer = self.fold(statement.initializer)
+		elif kind is blockStatement:
+			for inner in statement.statements:
+				self.optimizeStatement(inner)
+		elif kind is ifStatement:
+			statement.condition = self.fold(statement.condition)
+			self.optimizeStatement(statement.thenBranch)
+			if statement.elseBranch != None:
+				self.optimizeStatement(statement.elseBranch)
+		elif kind is whileStatement:
+			statement.condition = self.fold(statement.condition)
+			self.optimizeStatement(statement.body)
+		elif kind is functionStatement:
+			for inner in statement.body:
+				self.optimizeStatement(inner)
+		elif kind is returnStatement:
+			if statement.value != None:
+				statement.value = self.fold(statement.value)
+
+	def fold(self, expression):
+		kind = type(expression)
+		if kind is groupingExpr:
+			self.removed += 1
+			return self.fold(expression.expression)
+		elif kind is unaryExpr:
+			expression.right = self.fold(expression.right)
+			if type(expression.right) is literalExpr:
+				return self.evaluate(expression, 1)
+		elif kind is binaryExpr:
+			expression.left = self.fold(expression.left)
+			expression.right = self.fold(expression.right)
+			if type(expression.left) is literalExpr and type(expression.right) is literalExpr:
+				return self.evaluate(expression, 2)
+		elif kind is logicalExpr:
+			expression.left = self.fold(expression.left)
+			expression.right = self.fold(expression.right)
+			if type(expression.left) is literalExpr:
+				# a constant left operand decides whether the right one is ever evaluated
+				truthy = self.interpreter.isTruthy(expression.left.value)
+				if truthy == (expression.op.type == "OR"):
+					self.removed += 1 + self.count(expression.right)
+					return expression.left
+				self.removed += 2
+				return expression.right
+		elif kind is assignExpr:
+			expression.value = self.fold(expression.value)
+		elif kind is callExpr:
+			expression.callee = self.fold(expression.callee)
+			expression.arguments = [self.fold(argument) for argument in expression.arguments]
+		elif kind is indexExpr or kind is setIndexExpr:
+			expression.object = self.fold(expression.object)
+			expression.index = self.fold(expression.index)
+			if kind is setIndexExpr:
+				expression.value = self.fold(expression.value)
+		elif kind is sliceExpr:
+			expression.object = self.fold(expression.object)
+			expression.start = None if expression.start == None else self.fold(expression.start)
+			expression.stop = None if expression.stop == None else self.fold(expression.stop)
+		elif kind is lengthExpr:
+			expression.argument = self.fold(expression.argument)
+		return expression
+
+	def evaluate(self, expression, children):
+		# operations that would fail are left for the interpreter to report when they run
+		try:
+			value = self.interpreter.evaluate(expression)
+		except (interpreterRuntimeError, ArithmeticError):
+			return expression
+		self.removed += children
+		return literalExpr(value)
+
+	def count(self, expression):
+		kind = type(expression)
+		if kind is binaryExpr or kind is logicalExpr:
+			return 1 + self.count(expression.left) + self.count(expression.right)
+		elif kind is unaryExpr:
+			return 1 + self.count(expression.right)
+		elif kind is groupingExpr:
+			return 1 + self.count(expression.expression)
+		elif kind is assignExpr:
+			return 1 + self.count(expression.value)
+		elif kind is callExpr:
+			return 1 + self.count(expression.callee) + sum(self.count(argument) for argument in expression.arguments)
+		elif kind is indexExpr:
+			return 1 + self.count(expression.object) + self.count(expression.index)
+		elif kind is setIndexExpr:
+			return 1 + self.count(expression.object) + self.count(expression.index) + self.count(expression.value)
+		elif kind is sliceExpr:
+			return 1 + self.count(expression.object) + sum(self.count(bound) for bound in (expression.start, expression.stop)
+														   if bound != None)
+		elif kind is lengthExpr:
+			return 1 + self.count(expression.argument)
+		return 1
+
+
+class nativeFunction():
+	'''
+	attrs: name(string), arity(int), function(function)
+	a built-in implemented in python, bad arguments are reported by raising ValueError, overflows by python's ArithmeticError
+	'''
+
+	__slots__ = ("name", "arity", "function")
+
+	def __init__(self, name, arity, function):
+		self.name = name
+		self.arity = arity
+		self.function = function
+
+	def call(self, interpreter, arguments):
+		return self.function(*arguments)
+
+	def guarded(self, paren):
+		# the function with its errors reported at the call, one wrapper per arity so no argument tuple is built
+		function = self.function
+		if self.arity == 0:
+			def call0():
+				try:
+					return function()
+				except (ValueError, ArithmeticError) as e:
+					raise interpreterRuntimeError(paren, str(e))
+			return call0
+		elif self.arity == 1:
+			def call1(a):
+				try:
+					return function(a)
+				except (ValueError, ArithmeticError) as e:
+					raise interpreterRuntimeError(paren, str(e))
+			return call1
+		elif self.arity == 2:
+			def call2(a, b):
+				try:
+					return function(a, b)
+				except (ValueError, ArithmeticError) as e:
+					raise interpreterRuntimeError(paren, str(e))
+			return call2
+
+		def call(*arguments):
+			try:
+				return function(*arguments)
+			except (ValueError, ArithmeticError) as e:
+				raise interpreterRuntimeError(paren, str(e))
+		return call
+
+	def __str__(self):
+		return "<native fn " + self.name + ">"
+
+
+class palFunction():
+	'''
+	attrs: declaration(functionStatement), closure(enviroment), body(function)
+	a function declared in pal, body is its compiled form when the closure backend declared it
+	'''
+
+	__slots__ = ("declaration", "closure", "body")
+
+	def __init__(self, declaration, closure, body=None):
+		self.declaration = declaration
+		self.closure = closure
+		self.body = body
+
+	def __str__(self):
+		return "<fn " + str(self.declaration.name.lexeme) + ">"
+
+
+class memoizedFunction():
+	'''
+	attrs: function(palFunction), name(string), pure(bool), cache(OrderedDict), size(int), hits(int), misses(int), evictions(int), bypassed(int)
+	what memo() returns, results are kept per argument tuple and the least recently used one is evicted past size
+	calls of a function with side effects, or with arguments other than numbers, strings, booleans and nil, bypass the cache
+	reading a variable from outside the function or calling anything but a built-in, a local function or itself counts as an effect
+	size stays None until the interpreter running the first call sets it
+	'''
+
+	__slots__ = ("function", "name", "pure", "cache", "size", "hits", "misses", "evictions", "bypassed")
+	hashable = frozenset([float, str, bool, type(None)])
+
+	def __init__(self, function, declaration):
+		self.function = function
+		self.name = str(declaration.name.lexeme)
+		self.pure = not memoizedFunction.effects(declaration.body, [{declaration.name.lexeme: True},
+																	dict.fromkeys((param.lexeme for param in declaration.params), False)])
+		self.cache = OrderedDict()
+		self.size = None
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.bypassed = 0
+
+	def key(self, arguments):
+		# None when the call has to bypass the cache, true and false are tagged so they don't collide with 1 and 0,
+		# and numbers with their sign so -0 doesn't collide with 0
+		if not self.pure:
+			self.bypassed += 1
+			return None
+		tagged = False
+		for argument in arguments:
+			kind = type(argument)
+			if kind not in memoizedFunction.hashable:
+				self.bypassed += 1
+				return None
+			tagged = tagged or kind is bool or kind is float and argument == 0
+		if tagged:
+			return tuple(arguments) + tuple(math.copysign(1.0, argument) if type(argument) is float else type(argument)
+											for argument in arguments)
+		return tuple(arguments)
+
+	def hit(self, key):
+		self.hits += 1
+		self.cache.move_to_end(key)
+		return self.cache[key]
+
+	def store(self, key, value):
+		# arrays are mutable, handing the same one out again would leak changes between calls
+		self.misses += 1
+		if type(value) not in memoizedFunction.hashable:
+			return
+		self.cache[key] = value
+		if len(self.cache) > self.size:
+			self.cache.popitem(last=False)
+			self.evictions += 1
+
+	@staticmethod
+	def effects(statements, scopes):
+		# whether the statements print, store into arrays, read the clock or touch a variable declared outside them
+		# scopes map the names declared so far to whether they are a local function, the outermost one holds the function itself
+		for statement in statements:
+			kind = type(statement)
+			if kind is printStatement:
+				return True
+			elif kind is expressionStatement:
+				if memoizedFunction.effectsIn(statement.expression, scopes):
+					return True
+			elif kind is variableStatement:
+				if statement.initializer != None and memoizedFunction.effectsIn(statement.initializer, scopes):
+					return True
+				scopes[-1][statement.name.lexeme] = False
+			elif kind is blockStatement:
+				if memoizedFunction.effects(statement.statements, scopes + [{}]):
+					return True
+			elif kind is ifStatement:
+				if (memoizedFunction.effectsIn(statement.condition, scopes) or
+						memoizedFunction.effects([statement.thenBranch], scopes) or
+						statement.elseBranch != None and memoizedFunction.effects([statement.elseBranch], scopes)):
+					return True
+			elif kind is whileStatement:
+				if memoizedFunction.effectsIn(statement.condition, scopes) or memoizedFunction.effects([statement.body], scopes):
+					return True
+			elif kind is functionStatement:
+				scopes[-1][statement.name.lexeme] = True
+				if memoizedFunction.effects(statement.body, scopes + [dict.fromkeys((param.lexeme for param in statement.params), False)]):
+					return True
+			elif kind is returnStatement:
+				if statement.value != None and memoizedFunction.effectsIn(statement.value, scopes):
+					return True
+		return False
+
+	@staticmethod
+	def local(name, scopes):
+		# True for a local function or the function itself, False for another local, None for anything declared outside
+		for scope in reversed(scopes):
+			if name.lexeme in scope:
+				return scope[name.lexeme]
+		return None
+
+	@staticmethod
+	def effectsIn(expression, scopes):
+		kind = type(expression)
+		if kind is assignExpr:
+			# reassigning a local function would make the calls to it unknown
+			if memoizedFunction.local(expression.name, scopes) != False:
+				return True
+			return memoizedFunction.effectsIn(expression.value, scopes)
+		elif kind is setIndexExpr:
+			return True
+		elif kind is variableExpr:
+			return memoizedFunction.local(expression.name, scopes) == None
+		elif kind is callExpr:
+			callee = expression.callee
+			if type(callee) is variableExpr:
+				# built-ins are known once resolved and can't be reassigned, clock is the one that isn't pure
+				if expression.native != None:
+					pure = expression.native is not nativeLibrary.functions()["clock"]
+				else:
+					pure = memoizedFunction.local(callee.name, scopes) == True
+				if not pure:
+					return True
+			elif memoizedFunction.effectsIn(callee, scopes):
+				return True
+			return any(memoizedFunction.effectsIn(argument, scopes) for argument in expression.arguments)
+		elif kind is binaryExpr or kind is logicalExpr:
+			return memoizedFunction.effectsIn(expression.left, scopes) or memoizedFunction.effectsIn(expression.right, scopes)
+		elif kind is unaryExpr:
+			return memoizedFunction.effectsIn(expression.right, scopes)
+		elif kind is groupingExpr:
+			return memoizedFunction.effectsIn(expression.expression, scopes)
+		elif kind is indexExpr:
+			return memoizedFunction.effectsIn(expression.object, scopes) or memoizedFunction.effectsIn(expression.index, scopes)
+		elif kind is sliceExpr:
+			return any(memoizedFunction.effectsIn(inner, scopes) for inner in (expression.object, expression.start, expression.stop)
+					   if inner != None)
+		elif kind is lengthExpr:
+			return memoizedFunction.effectsIn(expression.argument, scopes)
+		return False
+
+	def __str__(self):
+		return "<memo fn " + self.name + ">"
+
+
+class nativeLibrary():
+	'''
+	the built-in functions every program starts with, each declared with its arity
+	'''
+
+	registry = None
+
+	@staticmethod
+	def functions():
+		if nativeLibrary.registry == None:
+			library = nativeLibrary
+			table = [("clock", 0, library.clock),
+					 ("sqrt", 1, library.unary("sqrt", math.sqrt)), ("abs", 1, library.unary("abs", abs)),
+					 ("floor", 1, library.unary("floor", math.floor)), ("ceil", 1, library.unary("ceil", math.ceil)),
+					 ("round", 1, library.unary("round", round)), ("exp", 1, library.unary("exp", math.exp)),
+					 ("log", 1, library.unary("log", math.log)), ("sin", 1, library.unary("sin", math.sin)),
+					 ("cos", 1, library.unary("cos", math.cos)), ("tan", 1, library.unary("tan", math.tan)),
+					 ("pow", 2, library.pow),
+					 ("str", 1, library.str), ("num", 1, library.num), ("upper", 1, library.upper),
+					 ("lower", 1, library.lower), ("trim", 1, library.trim), ("find", 2, library.find),
+					 ("substr", 3, library.substr),
+					 ("sum", 1, library.sum), ("min", 1, library.min), ("max", 1, library.max), ("sort", 1, library.sort),
+					 ("len", 1, library.len), ("memo", 1, library.memo)]
+			nativeLibrary.registry = {name: nativeFunction(name, arity, function) for name, arity, function in table}
+		return nativeLibrary.registry
+
+	@staticmethod
+	def number(name, value):
+		if type(value) is not float:
+			raise ValueError(name + " expects a number.")
+		return value
+
+	@staticmethod
+	def string(name, value):
+		if type(value) is not str:
+			raise ValueError(name + " expects a string.")
+		return value
+
+	@staticmethod
+	def items(name, value):
+		if type(value) is numericArray or type(value) is listView:
+			return value.tolist()
+		elif type(value) is list:
+			return value
+		raise ValueError(name + " expects an array.")
+
+	@staticmethod
+	def clock():
+		return timer()
+
+	@staticmethod
+	def unary(name, function):
+		number = nativeLibrary.number
+
+		def native(x):
+			return float(function(number(name, x)))
+		return native
+
+	@staticmethod
+	def pow(x, y):
+		return math.pow(nativeLibrary.number("pow", x), nativeLibrary.number("pow", y))
+
+	@staticmethod
+	def str(value):
+		if type(value) is list or type(value) is numericArray or type(value) is listView:
+			parts = []
+			outputSink().serialize(value, parts.append)
+			return "".join(parts)
+		return outputSink.scalar(value)
+
+	@staticmethod
+	def num(value):
+		value = nativeLibrary.string("num", value)
+		try:
+			return float(value)
+		except ValueError:
+			raise ValueError("num could not read '" + value + "' as a number.")
+
+	@staticmethod
+	def upper(value):
+		return nativeLibrary.string("upper", value).upper()
+
+	@staticmethod
+	def lower(value):
+		return nativeLibrary.string("lower", value).lower()
+
+	@staticmethod
+	def trim(value):
+		return nativeLibrary.string("trim", value).strip()
+
+	@staticmethod
+	def find(value, part):
+		return float(nativeLibrary.string("find", value).find(nativeLibrary.string("find", part)))
+
+	@staticmethod
+	def substr(value, start, stop):
+		value = nativeLibrary.string("substr", value)
+		start = nativeLibrary.number("substr", start)
+		stop = nativeLibrary.number("substr", stop)
+		if not start.is_integer() or not stop.is_integer() or not 0 <= start <= stop <= len(value):
+			raise ValueError("substr bounds must be whole numbers within the string.")
+		return value[int(start):int(stop)]
+
+	@staticmethod
+	def numbers(name, value):
+		if type(value) is numericArray and value.values.dtype.kind == "f":
+			return value.values
+		items = nativeLibrary.items(name, value)
+		for item in items:
+			if type(item) is not float:
+				raise ValueError(name + " expects an array of numbers.")
+		return items
+
+	@staticmethod
+	def len(value):
+		# the resolver turns calls of it into length nodes, this runs when it is called some other way
+		if type(value) is list or type(value) is listView or type(value) is numericArray or type(value) is str:
+			return float(len(value))
+		raise ValueError("Can only take the length of arrays and strings.")
+
+	@staticmethod
+	def sum(value):
+		items = nativeLibrary.numbers("sum", value)
+		if type(items) is list:
+			return float(math.fsum(items))
+		return float(items.sum())
+
+	@staticmethod
+	def min(value):
+		items = nativeLibrary.numbers("min", value)
+		if len(items) == 0:
+			raise ValueError("min of an empty array.")
+		return float(items.min()) if type(items) is not list else min(items)
+
+	@staticmethod
+	def max(value):
+		items = nativeLibrary.numbers("max", value)
+		if len(items) == 0:
+			raise ValueError("max of an empty array.")
+		return float(items.max()) if type(items) is not list else max(items)
+
+	@staticmethod
+	def sort(value):
+		# returns a sorted copy, numbers and strings sort but never together
+		if type(value) is numericArray and value.values.dtype.kind == "f":
+			return numericArray(numericArray.library.sort(value.values))
+		items = nativeLibrary.items("sort", value)
+		if all(type(item) is float for item in items) or all(type(item) is str for item in items):
+			return numericArray.fromList(sorted(items))
+		raise ValueError("sort expects an array of numbers or of strings.")
+
+	@staticmethod
+	def memo(function):
+		if type(function) is palFunction:
+			return memoizedFunction(function, function.declaration)
+		elif type(function) is compiledFunction:
+			return memoizedFunction(function, function.code.declaration)
+		raise ValueError("memo expects a pal function.")
+
+
+class resolver():
+	'''
+	attrs: scopes(list(dict)), natives(dict), globalCount(int), pending(list(functionStatement)), function(functionStatement)
+	annotates variable and assignment expressions with the (depth, slot) of the scope they resolve to
+	natives maps the global slots given to referenced built-ins to their function
+	bodies of global functions are pending until every global is declared, so they can call each other
+	'''
+
+	def __init__(self):
+		self.scopes = [{}]
+		self.natives = {}
+		self.globalCount = 0
+		self.pending = []
+		self.function = None
+
+	def resolve(self, statements):
+		for statement in statements:
+			self.resolveStatement(statement)
+		while self.pending:
+			self.resolveFunction(self.pending.pop(0))
+		return self.globalCount
+
+	def resolveFunction(self, statement):
+		enclosing = self.function
+		self.function = statement
+		statement.pooled = True
+		self.scopes.append({})
+		for param in statement.params:
+			if param.lexeme in self.scopes[-1]:
+				interpreter.parseError(param, "Already a parameter with this name.")
+			self.declare(param)
+		for inner in statement.body:
+			self.resolveStatement(inner)
+		statement.slotCount = len(self.scopes.pop())
+		self.function = enclosing
+
+	def declare(self, name):
+		scope = self.scopes[-1]
+		if len(self.scopes) == 1:
+			# a global shadowing a built-in from here on gets its own slot, earlier references keep the built-in
+			if name.lexeme not in scope or scope[name.lexeme] in self.natives:
+				scope[name.lexeme] = self.globalSlot()
+		elif name.lexeme not in scope:
+			scope[name.lexeme] = len(scope)
+		return scope[name.lexeme]
+
+	def globalSlot(self):
+		self.globalCount += 1
+		return self.globalCount - 1
+
+	def lookup(self, expression):
+		name = expression.name
+		for depth in range(len(self.scopes)):
+			scope = self.scopes[-1-depth]
+			if name.lexeme in scope:
+				expression.depth = depth
+				expression.slot = scope[name.lexeme]
+				return
+		native = nativeLibrary.functions().get(name.lexeme)
+		if native != None:
+			slot = self.globalSlot()
+			self.scopes[0][name.lexeme] = slot
+			self.natives[slot] = native
+			expression.depth = len(self.scopes) - 1
+			expression.slot = slot
+			return
+		interpreter.parseError(name, "Undefined variable '" + str(name.lexeme) + "'.")
+
+	def native(self, expression):
+		# the built-in a name refers to at this point of the program, or None
+		if type(expression) is not variableExpr or expression.slot == None or expression.depth != len(self.scopes) - 1:
+			return None
+		return self.natives.get(expression.slot)
+
+	def resolveStatement(self, statement):
+		kind = type(statement)
+		if kind is expressionStatement or kind is printStatement:
+			statement.expression = self.resolveExpression(statement.expression)
+		elif kind is variableStatement:
+			if statement.initializer != None:
+				statement.initializer = self.resolveExpression(statement.initializer)
+			statement.slot = self.declare(statement.name)
+		elif kind is blockStatement and not statement.scoped:
+			for inner in statement.statements:
+				self.resolveStatement(inner)
+		elif kind is blockStatement:
+			self.scopes.append({})
+			for inner in statement.statements:
+				self.resolveStatement(inner)
+			statement.slotCount = len(self.scopes.pop())
+		elif kind is ifStatement:
+			statement.condition = self.resolveExpression(statement.condition)
+			self.resolveStatement(statement.thenBranch)
+			if statement.elseBranch != None:
+				self.resolveStatement(statement.elseBranch)
+		elif kind is whileStatement:
+			statement.condition = self.resolveExpression(statement.condition)
+			self.resolveStatement(statement.body)
+			statement.counted = resolver.counted(statement.condition, statement.body)
+		elif kind is functionStatement:
+			statement.slot = self.declare(statement.name)
+			if self.function != None:
+				# the closure keeps the enclosing call's enviroment alive after it returns
+				self.function.pooled = False
+			if len(self.scopes) == 1:
+				self.pending.append(statement)
+			else:
+				self.resolveFunction(statement)
+		elif kind is returnStatement:
+			if statement.value != None:
+				statement.value = self.resolveExpression(statement.value)
+
+	def resolveExpression(self, expression):
+		# returns the expression to use in its place, which is only ever a different one for a call of the built-in len
+		kind = type(expression)
+		if kind is variableExpr:
+			self.lookup(expression)
+		elif kind is assignExpr:
+			expression.value = self.resolveExpression(expression.value)
+			self.lookup(expression)
+			if expression.depth == len(self.scopes) - 1 and expression.slot in self.natives:
+				interpreter.parseError(expression.name, "Can't assign to native function '" + str(expression.name.lexeme) + "'.")
+		elif kind is binaryExpr or kind is logicalExpr:
+			expression.left = self.resolveExpression(expression.left)
+			expression.right = self.resolveExpression(expression.right)
+		elif kind is unaryExpr:
+			expression.right = self.resolveExpression(expression.right)
+		elif kind is groupingExpr:
+			expression.expression = self.resolveExpression(expression.expression)
+		elif kind is callExpr:
+			expression.callee = self.resolveExpression(expression.callee)
+			expression.arguments = [self.resolveExpression(argument) for argument in expression.arguments]
+			expression.native = self.native(expression.callee)
+			if expression.native != None and expression.native.arity != len(expression.arguments):
+				interpreter.parseError(expression.paren, "Expected " + str(expression.native.arity) + " arguments but got " +
+									   str(len(expression.arguments)) + ".")
+			elif expression.native is nativeLibrary.functions()["len"]:
+				# every backend runs a length node inline, a function the program declares as len is called as usual
+				return lengthExpr(expression.callee.name, expression.arguments[0])
+		elif kind is indexExpr or kind is setIndexExpr:
+			expression.object = self.resolveExpression(expression.object)
+			expression.index = self.resolveExpression(expression.index)
+			if kind is setIndexExpr:
+				expression.value = self.resolveExpression(expression.value)
+		elif kind is sliceExpr:
+			expression.object = self.resolveExpression(expression.object)
+			expression.start = None if expression.start == None else self.resolveExpression(expression.start)
+			expression.stop = None if expression.stop == None else self.resolveExpression(expression.stop)
+		elif kind is lengthExpr:
+			expression.argument = self.resolveExpression(expression.argument)
+		return expression
+
+	@staticmethod
+	def counted(condition, body):
+		# i compared to a literal or variable, the body closed by i = i + k or i = i - k and assigning i nowhere else
+		if type(condition) is not binaryExpr or condition.op.type not in ("LESS", "LESS_EQUAL", "GREATER", "GREATER_EQUAL"):
+			return False
+		if type(condition.left) is not variableExpr or type(condition.right) not in (literalExpr, variableExpr):
+			return False
+		if type(body) is not blockStatement or body.scoped or not body.statements:
+			return False
+		name = condition.left.name.lexeme
+		increment = body.statements[-1]
+		if type(increment) is not expressionStatement or type(increment.expression) is not assignExpr:
+			return False
+		step = increment.expression.value
+		return (increment.expression.name.lexeme == name and type(step) is binaryExpr and step.op.type in ("PLUS", "MINUS") and
+				type(step.left) is variableExpr and step.left.name.lexeme == name and type(step.right) is literalExpr and
+				type(step.right.value) is float and not resolver.assigns(body.statements[:-1], name))
+
+	@staticmethod
+	def assigns(statements, name):
+		# whether the statements, or a function declared in them, assign to a variable of that name
+		for statement in statements:
+			kind = type(statement)
+			if kind is expressionStatement or kind is printStatement:
+				if resolver.assignsIn(statement.expression, name):
+					return True
+			elif kind is variableStatement:
+				if statement.initializer != None and resolver.assignsIn(statement.initializer, name):
+					return True
+			elif kind is blockStatement:
+				if resolver.assigns(statement.statements, name):
+					return True
+			elif kind is ifStatement:
+				if (resolver.assignsIn(statement.condition, name) or resolver.assigns([statement.thenBranch], name) or
+						statement.elseBranch != None and resolver.assigns([statement.elseBranch], name)):
+					return True
+			elif kind is whileStatement:
+				if resolver.assignsIn(statement.condition, name) or resolver.assigns([statement.body], name):
+					return True
+			elif kind is functionStatement:
+				if resolver.assigns(statement.body, name):
+					return True
+			elif kind is returnStatement:
+				if statement.value != None and resolver.assignsIn(statement.value, name):
+					return True
+		return False
+
+	@staticmethod
+	def assignsIn(expression, name):
+		kind = type(expression)
+		if kind is assignExpr:
+			return expression.name.lexeme == name or resolver.assignsIn(expression.value, name)
+		elif kind is binaryExpr or kind is logicalExpr:
+			return resolver.assignsIn(expression.left, name) or resolver.assignsIn(expression.right, name)
+		elif kind is unaryExpr:
+			return resolver.assignsIn(expression.right, name)
+		elif kind is groupingExpr:
+			return resolver.assignsIn(expression.expression, name)
+		elif kind is callExpr:
+			return resolver.assignsIn(expression.callee, name) or any(resolver.assignsIn(argument, name) for argument in expression.arguments)
+		elif kind is indexExpr or kind is setIndexExpr:
+			return (resolver.assignsIn(expression.object, name) or resolver.assignsIn(expression.index, name) or
+					kind is setIndexExpr and resolver.assignsIn(expression.value, name))
+		elif kind is sliceExpr:
+			return any(resolver.assignsIn(inner, name) for inner in (expression.object, expression.start, expression.stop) if inner != None)
+		elif kind is lengthExpr:
+			return resolver.assignsIn(expression.argument, name)
+		return False
+
+
+class parseError(RuntimeError):
+	pass
+
+
+class interpreterRuntimeError(RuntimeError):
+	'''
+	attrs: token(token), message(string)
+	'''
+
+	def __init__(self, token, message):
+		self.message = message
+		self.token = token
+
+
+class numericArray():
+	'''
+	attrs: values(numpy.ndarray)
+	a homogeneous number array in a float64 buffer, arithmetic and comparisons apply element-wise in one numpy call
+	storing anything but a number turns the buffer into one of python objects, after which it behaves as a list
+	python lists of numbers, which is what arrays are without numpy, get the same element-wise operators one item at a time
+	'''
+
+	__slots__ = ("values",)
+	__hash__ = None
+	library = False
+
+	operators = {"PLUS": operator.add, "MINUS": operator.sub, "STAR": operator.mul, "SLASH": operator.truediv,
+				 "GREATER": operator.gt, "GREATER_EQUAL": operator.ge, "LESS": operator.lt, "LESS_EQUAL": operator.le}
+
+	def __init__(self, values):
+		self.values = values
+
+	@staticmethod
+	def numpy():
+		# numpy is optional and only imported when the first number array is built
+		if numericArray.library is False:
+			try:
+				import numpy
+				numericArray.library = numpy
+			except ImportError:
+				numericArray.library = None
+		return numericArray.library
+
+	@staticmethod
+	def fromList(items):
+		# without numpy, or with anything but numbers inside, arrays stay python lists
+		if not items:
+			return items
+		for item in items:
+			if type(item) is not float:
+				return items
+		numpy = numericArray.numpy()
+		if numpy == None:
+			return items
+		return numericArray(numpy.array(items, dtype=numpy.float64))
+
+	def tolist(self):
+		return self.values.tolist()
+
+	def __len__(self):
+		return len(self.values)
+
+	def __eq__(self, other):
+		if type(other) is numericArray:
+			return bool(numericArray.library.array_equal(self.values, other.values))
+		if type(other) is listView:
+			other = other.tolist()
+		return type(other) is list and self.tolist() == other
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __repr__(self):
+		return repr(self.tolist())
+
+	@staticmethod
+	def operand(value):
+		if type(value) is float:
+			return value
+		if type(value) is numericArray and value.values.dtype == numericArray.library.float64:
+			return value.values
+		return None
+
+	@staticmethod
+	def apply(op, left, right):
+		# the slow path behind every backend's number check, None when the operands are not number arrays
+		if type(left) is list or type(right) is list or type(left) is listView or type(right) is listView:
+			return numericArray.applyItems(op, left, right)
+		if type(left) is not numericArray and type(right) is not numericArray:
+			return None
+		function = numericArray.operators.get(op.type)
+		l = numericArray.operand(left)
+		r = numericArray.operand(right)
+		if function == None:
+			return None
+		if l is None or r is None:
+			# an array a store turned into python objects can still hold only numbers
+			return numericArray.applyItems(op, left, right)
+		if type(l) is not float and type(r) is not float and l.shape != r.shape:
+			raise interpreterRuntimeError(op, "Array operands must have the same length.")
+		try:
+			with numericArray.library.errstate(divide="raise", invalid="raise"):
+				return numericArray(function(l, r))
+		except FloatingPointError:
+			raise interpreterRuntimeError(op, "Array arithmetic has no defined result.")
+
+	@staticmethod
+	def items(value):
+		# the numbers of a list, a slice of one or a number array as a python list, None when it holds anything else
+		if type(value) is numericArray or type(value) is listView:
+			value = value.tolist()
+		for item in value:
+			if type(item) is not float:
+				return None
+		return value
+
+	@staticmethod
+	def applyItems(op, left, right):
+		# the numpy path one item at a time, with its results and errors, division by zero and nan from numbers included
+		function = numericArray.operators.get(op.type)
+		l = left if type(left) is float else numericArray.items(left) if type(left) in (list, listView, numericArray) else None
+		r = right if type(right) is float else numericArray.items(right) if type(right) in (list, listView, numericArray) else None
+		if function == None or l is None or r is None:
+			return None
+		if type(l) is float:
+			l = [l] * len(r)
+		elif type(r) is float:
+			r = [r] * len(l)
+		elif len(l) != len(r):
+			raise interpreterRuntimeError(op, "Array operands must have the same length.")
+		try:
+			values = [function(a, b) for a, b in zip(l, r)]
+		except ZeroDivisionError:
+			raise interpreterRuntimeError(op, "Array arithmetic has no defined result.")
+		if op.type not in ("PLUS", "MINUS", "STAR", "SLASH"):
+			return values
+		for a, b, value in zip(l, r, values):
+			if value != value and a == a and b == b:
+				raise interpreterRuntimeError(op, "Array arithmetic has no defined result.")
+		return numericArray.fromList(values)
+
+
+class listView():
+	'''
+	attrs: items(list), start(int), stop(int)
+	a window over a list array, slicing a view narrows the window over the same list instead of copying it
+	'''
+
+	__slots__ = ("items", "start", "stop")
+	__hash__ = None
+
+	def __init__(self, items, start, stop):
+		self.items = items
+		self.start = start
+		self.stop = stop
+
+	def __len__(self):
+		return self.stop - self.start
+
+	def __getitem__(self, position):
+		return self.items[self.start + position]
+
+	def __setitem__(self, position, value):
+		self.items[self.start + position] = value
+
+	def tolist(self):
+		return self.items[self.start:self.stop]
+
+	def __eq__(self, other):
+		if type(other) is listView or type(other) is numericArray:
+			other = other.tolist()
+		return type(other) is list and self.tolist() == other
+
+	def __ne__(self, other):
+		return not self.__eq__(other)
+
+	def __repr__(self):
+		return repr(self.tolist())
+
+
+class outputSink():
+	'''
+	attrs: mode(string), stream(file), chunks(list(string)), size(int), limit(int)
+	collects program output, writing it through per line, in blocks of limit characters, or keeping it in memory
+	'''
+
+	def __init__(self, mode="line", stream=None, limit=65536):
+		self.mode = mode
+		self.stream = stream
+		self.chunks = []
+		self.size = 0
+		self.limit = limit
+
+	@staticmethod
+	def scalar(obj):
+		if obj == None:
+			return "nil"
+		if type(obj) is float:
+			text = str(obj)
+			if len(text) > 2 and text[-2::] == ".0":
+				text = text[0:-2]
+			return text
+		return str(obj)
+
+	def serialize(self, value, append):
+		# writes arrays in the same form as printing the nested list stringify builds, without building it
+		append("[")
+		if type(value) is numericArray or type(value) is listView:
+			value = value.tolist()
+		first = True
+		for item in value:
+			if not first:
+				append(", ")
+			first = False
+			if type(item) is list or type(item) is numericArray or type(item) is listView:
+				self.serialize(item, append)
+			else:
+				append(repr(self.scalar(item)))
+		append("]")
+
+	def writeValue(self, value):
+		if type(value) is list or type(value) is numericArray or type(value) is listView:
+			if self.mode == "line":
+				parts = []
+				self.serialize(value, parts.append)
+				self.write("".join(parts) + "\n")
+				return
+			start = len(self.chunks)
+			self.serialize(value, self.chunks.append)
+			self.chunks.append("\n")
+			self.size += sum(len(chunk) for chunk in self.chunks[start:])
+			if self.size >= self.limit and self.mode == "block":
+				self.flush()
+		else:
+			self.write(self.scalar(value) + "\n")
+
+	def write(self, text):
+		if self.mode == "line":
+			stream = self.stream or sys.stdout
+			stream.write(text)
+			stream.flush()
+			return
+		self.chunks.append(text)
+		self.size += len(text)
+		if self.size >= self.limit and self.mode == "block":
+			self.flush()
+
+	def flush(self):
+		if self.mode == "capture" or not self.chunks:
+			return
+		stream = self.stream or sys.stdout
+		stream.write("".join(self.chunks))
+		stream.flush()
+		self.chunks = []
+		self.size = 0
+
+	def getvalue(self):
+		return "".join(self.chunks)
+
+
+class profiler():
+	'''
+	attrs: phases(dict), records(dict), children(list(float)), active(dict)
+	times the run phases and, once installed, every evaluate call per node class and operator
+	'''
+
+	def __init__(self):
+		self.phases = {}
+		self.records = {}
+		self.children = []
+		self.active = {}
+
+	def phase(self, name, seconds):
+		self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+	@staticmethod
+	def key(node):
+		op = getattr(node, "op", None)
+		if op != None:
+			return type(node).__name__ + " " + op.type
+		return type(node).__name__
+
+	def install(self, target):
+		# shadows evaluate on this one instance, the class method stays untouched when profiling is off
+		evaluate = target.evaluate
+		records = self.records
+		children = self.children
+		active = self.active
+		key = profiler.key
+
+		def profiled(node):
+			name = key(node)
+			depth = active.get(name, 0)
+			active[name] = depth + 1
+			children.append(0.0)
+			start = timer()
+			try:
+				return evaluate(node)
+			finally:
+				elapsed = timer() - start
+				inner = children.pop()
+				if children:
+					children[-1] += elapsed
+				active[name] = depth
+				record = records.get(name)
+				if record == None:
+					record = records[name] = [0, 0.0, 0.0]
+				record[0] += 1
+				# recursive calls of the same kind are already inside the outermost one's cumulative time
+				if depth == 0:
+					record[1] += elapsed
+				record[2] += elapsed - inner
+
+		target.evaluate = profiled
+
+	def report(self):
+		lines = ["phase".ljust(28) + "seconds".rjust(12)]
+		for name, seconds in self.phases.items():
+			lines.append(name.ljust(28) + str(round(seconds, 6)).rjust(12))
+		if self.records:
+			lines.append("")
+			lines.append("node".ljust(28) + "calls".rjust(12) + "cumulative".rjust(14) + "self".rjust(14))
+			for name, (calls, cumulative, own) in sorted(self.records.items(), key=lambda item: -item[1][2]):
+				lines.append(name.ljust(28) + str(calls).rjust(12) + str(round(cumulative, 6)).rjust(14) +
+							 str(round(own, 6)).rjust(14))
+		return "\n".join(lines)
+
+	def toJson(self):
+		nodes = {name: {"calls": calls, "cumulative": cumulative, "self": own}
+				 for name, (calls, cumulative, own) in self.records.items()}
+		return json.dumps({"phases": self.phases, "nodes": nodes}, indent=2)
+
+
+class sampler():
+	'''
+	attrs: interval(float), stacks(dict), hits(dict), samples(int), lines(dict), target(int), stopped(Event), thread(Thread)
+	periodically reads the statement chain of the running tree walker from a background thread
+	'''
+
+	def __init__(self, interval):
+		self.interval = interval
+		self.stacks = {}
+		self.hits = {}
+		self.samples = 0
+		self.lines = {}
+
+	def start(self):
+		self.target = threading.get_ident()
+		self.stopped = threading.Event()
+		self.thread = threading.Thread(target=self.loop, daemon=True)
+		self.thread.start()
+
+	def stop(self):
+		self.stopped.set()
+		self.thread.join()
+
+	def loop(self):
+		code = interpreter.evaluate.__code__
+		while not self.stopped.wait(self.interval):
+			frame = sys._current_frames().get(self.target)
+			chain = []
+			while frame != None:
+				if frame.f_code is code:
+					chain.append(frame.f_locals.get("obj"))
+				frame = frame.f_back
+			if chain:
+				chain.reverse()
+				self.record(chain)
+
+	def record(self, chain):
+		frames = []
+		line = None
+		for node in chain:
+			nodeLine = self.line(node)
+			if nodeLine != None:
+				line = nodeLine
+			if isinstance(node, statement):
+				frames.append(type(node).__name__ + ":" + str(nodeLine))
+		stack = ";".join(frames)
+		self.stacks[stack] = self.stacks.get(stack, 0) + 1
+		self.hits[line] = self.hits.get(line, 0) + 1
+		self.samples += 1
+
+	def line(self, node):
+		# the first token below a node, statements carry no token of their own
+		if id(node) in self.lines:
+			return self.lines[id(node)]
+		found = None
+		if isinstance(node, (token, tokenView)):
+			found = node.line
+		elif isinstance(node, list):
+			for item in node:
+				found = self.line(item)
+				if found != None:
+					break
+		elif isinstance(node, (statement, expr)):
+			for kind in type(node).__mro__:
+				for field in getattr(kind, "__slots__", ()):
+					found = self.line(getattr(node, field))
+					if found != None:
+						break
+				if found != None:
+					break
+			self.lines[id(node)] = found
+		return found
+
+	def collapsed(self):
+		return "".join(stack + " " + str(count) + "\n" for stack, count in sorted(self.stacks.items()))
+
+	def report(self, source):
+		sourceLines = source.split("\n") if source != None else []
+		lines = [str(self.samples) + " samples"]
+		lines.append("line".rjust(6) + "hits".rjust(10) + "share".rjust(9) + "  source")
+		for line, count in sorted(self.hits.items(), key=lambda item: -item[1]):
+			text = sourceLines[line].strip() if line != None and line < len(sourceLines) else ""
+			lines.append(str(line).rjust(6) + str(count).rjust(10) +
+						 (str(round(100 * count / self.samples, 1)) + "%").rjust(9) + "  " + text)
+		return "\n".join(lines)
+
+
+class interpreter:
+	'''
+	attrs: scanner(scanner), hadError(bool), args(dict), enviroment(enviroment), resolver(resolver), output(outputSink), profiler(profiler), sampler(sampler),
+		frames(list(enviroment)), returnValue(object), tailCall(tuple), memoized(list(memoizedFunction)), caches(list(inlineCache)),
+		reused(int)
+	statements hand RETURN back up to the call instead of raising, with the value or the pending tail call kept here
+	'''
+
+	hadError = False
+	hadRuntimeError = False
+	RETURN = object()
+	comparisons = {"LESS": operator.lt, "LESS_EQUAL": operator.le, "GREATER": operator.gt, "GREATER_EQUAL": operator.ge}
+
+	def __init__(self, args, scanner):
+		self.args = args
+		self.scanner = scanner
+		self.enviroment = enviroment()
+		for name, function in nativeLibrary.functions().items():
+			self.enviroment.define(name, function)
+		self.resolver = resolver()
+		self.output = outputSink(interpreter.outputMode(args))
+		self.profiler = profiler() if args.profile or args.profileJson else None
+		self.sampler = sampler(args.sampleInterval) if args.sample or args.collapsed else None
+		self.frames = []
+		self.returnValue = None
+		self.tailCall = None
+		self.memoized = []
+		self.caches = []
+		self.reused = 0
+
+	@staticmethod
+	def outputMode(args):
+		if args.output == "auto":
+			return "line" if sys.stdout.isatty() else "block"
+		return args.output
+
+	def run(self):
+		if interpreter.hadError or interpreter.hadRuntimeError:
+			exit()
+		cache = None
+		statements = None
+		if self.args.cache and self.scanner.path != None:
+			cache = programCache(self.scanner.path, self.scanner.source)
+			start = timer()
+			statements = cache.load()
+			if statements != None and self.profiler != None:
+				self.profiler.phase("load", timer() - start)
+		if statements == None:
+			statements = self.parse()
+			if interpreter.hadError:
+				return
+			if cache != None:
+				cache.store(statements)
+		elif self.args.verbose:
+			print("======= tokens =======")
+			print("skipped, program loaded from " + cache.path)
+			print("======================\n")
+		if self.args.optimize:
+			folder = optimizer(self)
+			folder.optimize(statements)
+			if self.args.verbose:
+				print("===== optimizer ======")
+				print("removed " + str(folder.removed) + " nodes")
+				print("======================\n")
+		if self.args.resolve:
+			self.resolve(statements)
+			if interpreter.hadError:
+				return
+		if self.args.verbose:
+			print("===== statements =====")
+			for s in statements:
+				try:
+					print(str(type(s)) + " " + s.toString())
+				except:
+					print(str(type(s)))
+			print("======================\n")
+		if self.args.dumpBytecode:
+			print("====== bytecode ======")
+			print(bytecodeCompiler().compile(statements).disassemble())
+			print("======================\n")
+		print("======= output =======")
+		allocated = enviroment.allocations
+		if self.profiler != None:
+			if self.args.backend == "tree":
+				self.profiler.install(self)
+			start = timer()
+		if self.sampler != None:
+			self.sampler.start()
+		try:
+			if self.args.backend == "closures":
+				self.interpretClosures(statements)
+			elif self.args.backend == "bytecode":
+				self.interpretBytecode(statements)
+			elif self.args.backend == "python":
+				self.interpretPython(statements)
+			else:
+				self.interpret(statements)
+		finally:
+			self.output.flush()
+			if self.sampler != None:
+				self.sampler.stop()
+		print("======================\n")
+		if self.sampler != None:
+			self.writeSamples()
+		if self.profiler != None:
+			self.profiler.phase("execute", timer() - start)
+			self.writeProfile()
+		if self.args.verbose and self.memoized:
+			print("======== memo ========")
+			for function in self.memoized:
+				print(function.name + ": " + str(function.hits) + " hits, " + str(function.misses) + " misses, " +
+					  str(function.evictions) + " evictions, " + str(function.bypassed) + " bypassed, " +
+					  str(len(function.cache)) + "/" + str(function.size) + " cached")
+			print("======================\n")
+		if self.args.verbose and self.caches:
+			self.writeCaches()
+		if self.args.verbose:
+			print("======= scopes =======")
+			print(str(enviroment.allocations - allocated) + " enviroments allocated, " + str(self.reused) +
+				  " loop passes reused one")
+			print("======================\n")
+
+	def writeCaches(self):
+		hits = sum(cache.hits for cache in self.caches)
+		misses = sum(cache.misses for cache in self.caches)
+		print("=== inline caches ====")
+		print(str(len(self.caches)) + " sites, " + str(hits) + " hits, " + str(misses) + " misses, " +
+			  str(round(100 * hits / max(hits + misses, 1), 1)) + "% hit rate")
+		for cache in sorted(self.caches, key=lambda cache: -cache.misses)[:10]:
+			if cache.misses:
+				print("line " + str(cache.name.line).ljust(6) + str(cache.name.lexeme).ljust(12) + str(cache.hits).rjust(10) +
+					  " hits " + str(cache.misses).rjust(10) + " misses")
+		print("======================\n")
+
+	def writeSamples(self):
+		if self.args.collapsed:
+			with open(self.args.collapsed, "w") as file:
+				file.write(self.sampler.collapsed())
+		print("====== samples =======")
+		print(self.sampler.report(self.scanner.source))
+		if self.args.backend != "tree":
+			print("statement chains are only sampled from the tree backend")
+		print("======================\n")
+
+	def writeProfile(self):
+		if self.args.profileJson:
+			with open(self.args.profileJson, "w") as file:
+				file.write(self.profiler.toJson())
+			return
+		print("====== profile =======")
+		print(self.profiler.report())
+		if self.args.backend != "tree":
+			print("node timings are only recorded by the tree backend")
+		print("======================\n")
+
+	def resolve(self, statements):
+		self.enviroment.reserve(self.resolver.resolve(statements))
+		for slot, function in self.resolver.natives.items():
+			self.enviroment.slots[slot] = function
+
+	def parse(self):
+		start = timer()
+		tokens = self.scanner.scanTokens()
+		if self.profiler != None:
+			self.profiler.phase("scan", timer() - start)
+		if self.args.verbose:
+			print("======= tokens =======")
+			for token in tokens:
+					print(token.toString())
+			print("======================\n")
+		tokenParser = self.tokenParser(tokens)
+		start = timer()
+		statements = tokenParser.parse()
+		if self.profiler != None:
+			self.profiler.phase("parse", timer() - start)
+		return statements
+
+	def tokenParser(self, tokens):
+		if self.args.parser == "pratt" and type(tokens) is tokenStore:
+			return columnarParser(tokens)
+		elif self.args.parser == "pratt":
+			return prattParser(tokens)
+		return parser(tokens)
+
+	def interpret(self, statements):
+		limit = self.deepen()
+		try:
+			for statement in statements:
+				self.execute(statement)
+		except interpreterRuntimeError as e:
+			self.output.flush()
+			interpreter.runTimeError(e)
+		finally:
+			sys.setrecursionlimit(limit)
+
+	def interpretClosures(self, statements):
+		limit = self.deepen()
+		try:
+			program = closureCompiler(self).compile(statements)
+			program(self.enviroment)
+		except interpreterRuntimeError as e:
+			self.output.flush()
+			interpreter.runTimeError(e)
+		finally:
+			sys.setrecursionlimit(limit)
+
+	@staticmethod
+	def deepen():
+		# non-tail pal calls nest python calls on the tree, closure and python backends, python 3.11 and later make those
+		# without growing the C stack, so the limit is raised from python's default 1000 frames to as many as the vm keeps,
+		# which stops runaway recursion at around 100MB, the caller puts the returned limit back when the program ends
+		limit = sys.getrecursionlimit()
+		if sys.version_info >= (3, 11):
+			sys.setrecursionlimit(max(limit, virtualMachine.frameLimit))
+		return limit
+
+	def interpretBytecode(self, statements):
+		try:
+			program = bytecodeCompiler().compile(statements)
+			virtualMachine(self).run(program)
+		except interpreterRuntimeError as e:
+			self.output.flush()
+			interpreter.runTimeError(e)
+
+	def interpretPython(self, statements):
+		limit = self.deepen()
+		try:
+			compiler = pythonCompiler(self)
+			try:
+				module = compiler.compile(statements)
+				if self.args.verbose:
+					print(ast.unparse(module))
+					print("======================\n")
+				code = compile(module, "<pal>", "exec")
+			except (SyntaxError, RecursionError) as e:
+				# python caps statically nested loops and expression depth, those programs are walked instead
+				if self.args.verbose:
+					print("python backend unavailable (" + str(e) + "), using the tree walker")
+				self.interpret(statements)
+				return
+			compiler.run(code)
+		except interpreterRuntimeError as e:
+			self.output.flush()
+			interpreter.runTimeError(e)
+		finally:
+			sys.setrecursionlimit(limit)
+
+	def execute(self, statement):
+		return self.evaluate(statement)
+
+	def stringify(self, obj):
+		if type(obj) is list:
+			return [self.stringify(item) for item in obj]
+		if type(obj) is numericArray or type(obj) is listView:
+			return [self.stringify(item) for item in obj.tolist()]
+		return outputSink.scalar(obj)
+	
+	def visitCallExpr(self, expression):
+		native = expression.native
+		if native != None:
+			# arity was checked when the call was resolved, so the arguments go straight to the function
+			arguments = expression.arguments
+			try:
+				if native.arity == 0:
+					return native.function()
+				elif native.arity == 1:
+					return native.function(self.evaluate(arguments[0]))
+				elif native.arity == 2:
+					return native.function(self.evaluate(arguments[0]), self.evaluate(arguments[1]))
+				return native.function(*[self.evaluate(argument) for argument in arguments])
+			except (ValueError, ArithmeticError) as e:
+				raise interpreterRuntimeError(expression.paren, str(e))
+		callee = self.evaluate(expression.callee)
+		arguments = []
+		for argument in expression.arguments:
+			arguments.append(self.evaluate(argument))
+		return self.callValue(expression.paren, callee, arguments)
+
+	def callValue(self, paren, callee, arguments):
+		if type(callee) is palFunction:
+			return self.callFunction(paren, callee, arguments)
+		if type(callee) is memoizedFunction:
+			return self.callMemoized(paren, callee, arguments)
+		if type(callee) is not nativeFunction:
+			raise interpreterRuntimeError(paren, "Can only call functions.")
+		if len(arguments) != callee.arity:
+			raise interpreterRuntimeError(paren, "Expected " + str(callee.arity) + " arguments but got " +
+										  str(len(arguments)) + ".")
+		try:
+			return callee.call(self, arguments)
+		except (ValueError, ArithmeticError) as e:
+			raise interpreterRuntimeError(paren, str(e))
+
+	def callMemoized(self, paren, callee, arguments):
+		self.adopt(callee)
+		key = callee.key(arguments)
+		if key is None:
+			return self.callValue(paren, callee.function, arguments)
+		if key in callee.cache:
+			return callee.hit(key)
+		value = self.callValue(paren, callee.function, arguments)
+		callee.store(key, value)
+		return value
+
+	def adopt(self, function):
+		# memo() can't see the interpreter, the first call sizes the cache and lists it for the verbose report
+		if function.size == None:
+			function.size = max(self.args.memoSize, 1)
+			self.memoized.append(function)
+
+	def callFunction(self, paren, function, arguments):
+		# a call in tail position comes back as tailCall, so a chain of them runs in this one python frame
+		while True:
+			frame = self.enterCall(paren, function, arguments)
+			previous = self.enviroment
+			self.enviroment = frame
+			try:
+				if function.body != None:
+					function.body(frame)
+				else:
+					for statement in function.declaration.body:
+						if self.execute(statement) is not None:
+							break
+			except RecursionError:
+				raise interpreterRuntimeError(paren, "Stack overflow.")
+			finally:
+				self.enviroment = previous
+			self.leaveCall(function.declaration, frame)
+			if self.tailCall is None:
+				value = self.returnValue
+				self.returnValue = None
+				return value
+			paren, function, arguments = self.tailCall
+			self.tailCall = None
+
+	def enterCall(self, paren, function, arguments):
+		declaration = function.declaration
+		if len(arguments) != len(declaration.params):
+			raise interpreterRuntimeError(paren, "Expected " + str(len(declaration.params)) + " arguments but got " +
+										  str(len(arguments)) + ".")
+		if declaration.slot == None:
+			frame = enviroment(function.closure)
+			for param, argument in zip(declaration.params, arguments):
+				frame.define(param.lexeme, argument)
+			return frame
+		if self.frames:
+			frame = self.frames.pop()
+			frame.enclosing = function.closure
+		else:
+			frame = enviroment(function.closure)
+		# the argument list is built fresh for every call, so it becomes the frame's slots
+		if declaration.slotCount > len(arguments):
+			arguments.extend([None] * (declaration.slotCount - len(arguments)))
+		frame.slots = arguments
+		return frame
+
+	def leaveCall(self, declaration, frame):
+		if declaration.pooled:
+			frame.enclosing = None
+			frame.slots = None
+			self.frames.append(frame)
+
+	def visitFunctionStatement(self, statement):
+		function = palFunction(statement, self.enviroment)
+		if statement.slot == None:
+			self.enviroment.define(statement.name.lexeme, function)
+		else:
+			self.enviroment.slots[statement.slot] = function
+		return None
+
+	def visitReturnStatement(self, statement):
+		value = statement.value
+		if type(value) is callExpr and value.native == None:
+			callee = self.evaluate(value.callee)
+			arguments = [self.evaluate(argument) for argument in value.arguments]
+			if type(callee) is palFunction:
+				# made by the calling loop once this frame is gone
+				self.tailCall = (value.paren, callee, arguments)
+				return interpreter.RETURN
+			self.returnValue = self.callValue(value.paren, callee, arguments)
+		elif value != None:
+			self.returnValue = self.evaluate(value)
+		return interpreter.RETURN
+
+	def returnCall(self, paren, callee, arguments):
+		# what the python backend runs for a return of a call, the same split as visitReturnStatement
+		if type(callee) is palFunction:
+			self.tailCall = (paren, callee, arguments)
+		else:
+			self.returnValue = self.callValue(paren, callee, arguments)
+		return interpreter.RETURN
+
+	def visitExpressionStatement(self, statement):
+		self.evaluate(statement.expression)
+		return None
+
+	def visitBlockStatement(self, statement):
+		if not statement.scoped:
+			for inner in statement.statements:
+				if self.execute(inner) is not None:
+					return interpreter.RETURN
+			return None
+		return self.executeBlock(statement.statements, enviroment(self.enviroment, statement.slotCount))
+
+	def visitWhileStatement(self, statement):
+		if statement.counted:
+			return self.countedLoop(statement)
+		return self.loop(statement)
+
+	def loop(self, statement):
+		if statement.scope != None:
+			return self.scopedLoop(statement)
+		while self.isTruthy(self.evaluate(statement.condition)):
+			if self.execute(statement.body) is not None:
+				return interpreter.RETURN
+		return None
+
+	def countedLoop(self, statement):
+		condition = statement.condition
+		compare = interpreter.comparisons[condition.op.type]
+		increment = statement.body.statements[-1]
+		step = increment.expression.value.right.value
+		if increment.expression.value.op.type == "MINUS":
+			step = -step
+		parts = statement.body.statements[:-1]
+		scope = statement.scope
+		local = enviroment(self.enviroment, scope.slotCount) if scope != None else None
+		values, key = self.enviroment.counter(condition.left)
+		while True:
+			counter = values[key]
+			limit = self.evaluate(condition.right)
+			if type(counter) is not float or type(limit) is not float:
+				# the generic loop evaluates the condition again and reports or handles whatever broke the guard
+				return self.loop(statement)
+			if not compare(counter, limit):
+				return None
+			for part in parts:
+				if part is scope:
+					self.reused += 1
+					signal = self.executeBlock(scope.statements, local)
+					local.clear()
+				else:
+					signal = self.execute(part)
+				if signal is not None:
+					return interpreter.RETURN
+			counter = values[key]
+			if type(counter) is float:
+				values[key] = counter + step
+			else:
+				self.execute(increment)
+
+	def scopedLoop(self, statement):
+		scope = statement.scope
+		local = enviroment(self.enviroment, scope.slotCount)
+		body = [scope] if statement.body is scope else statement.body.statements
+		while self.isTruthy(self.evaluate(statement.condition)):
+			for inner in body:
+				if inner is scope:
+					self.reused += 1
+					signal = self.executeBlock(scope.statements, local)
+					local.clear()
+				else:
+					signal = self.execute(inner)
+				if signal is not None:
+					return interpreter.RETURN
+		return None
+
+	def executeBlock(self, statements, enviroment):
+		previous = self.enviroment
+		try:
+			self.enviroment = enviroment
+			for statement in statements:
+				if self.execute(statement) is not None:
+					return interpreter.RETURN
+		finally:
+			self.enviroment = previous
+
+	def visitIfStatement(self, statement):
+		if self.isTruthy(self.evaluate(statement.condition)):
+			return self.execute(statement.thenBranch)
+		elif statement.elseBranch != None:
+			return self.execute(statement.elseBranch)
+		return None
+
+	def visitLogicalExpr(self, expression):
+		left = self.evaluate(expression.left)
+		if expression.op.type == "OR":
+			if self.isTruthy(left):
+				return left
+		else:
+			if not self.isTruthy(left):
+				return left
+		return self.evaluate(expression.right)
+
+	def visitPrintStatement(self, statement):
+		value = self.evaluate(statement.expression)
+		self.output.writeValue(value)
+		return None
+
+	def visitVarStatement(self, statement):
+		value = None
+		if statement.initializer != None:
+			value = self.evaluate(statement.initializer)
+		if statement.slot == None:
+			self.enviroment.define(statement.name.lexeme, value)
+		else:
+			self.enviroment.slots[statement.slot] = value
+		return None
+
+	def visitVariableExpr(self, expression):
+		if expression.slot == None:
+			return self.lookUp(expression).values[expression.name.lexeme]
+		return self.enviroment.getAt(expression.depth, expression.slot)
+
+	def lookUp(self, expression):
+		# the enviroment holding an unresolved name, remembered per expression
+		cache = expression.cache
+		if cache == None:
+			cache = expression.cache = self.inlineCache(expression.name)
+		return cache.lookup(self.enviroment)
+
+	def inlineCache(self, name):
+		cache = inlineCache(name)
+		self.caches.append(cache)
+		return cache
+
+	def visitLiteralExpr(self, expression):
+		value = expression.value
+		if type(value) is list or type(value) is numericArray:
+			return interpreter.copyArray(value)
+		return value
+
+	def visitIndexExpr(self, expression):
+		array = self.evaluate(expression.object)
+		return interpreter.indexArray(expression.bracket, array, self.evaluate(expression.index))
+
+	def visitSliceExpr(self, expression):
+		array = self.evaluate(expression.object)
+		start = None if expression.start == None else self.evaluate(expression.start)
+		stop = None if expression.stop == None else self.evaluate(expression.stop)
+		return interpreter.sliceArray(expression.bracket, array, start, stop)
+
+	def visitSetIndexExpr(self, expression):
+		array = self.evaluate(expression.object)
+		index = self.evaluate(expression.index)
+		return interpreter.storeIndex(expression.bracket, array, index, self.evaluate(expression.value))
+
+	def visitLengthExpr(self, expression):
+		return interpreter.arrayLength(expression.keyword, self.evaluate(expression.argument))
+
+	@staticmethod
+	def copyArray(value):
+		# arrays can be changed in place, so every evaluation of an array literal builds its own
+		if type(value) is numericArray:
+			return numericArray(value.values.copy())
+		return [interpreter.copyArray(item) if type(item) is list or type(item) is numericArray else item
+				for item in value]
+
+	@staticmethod
+	def arrayPosition(bracket, array, index, limit):
+		if type(array) is not list and type(array) is not listView and type(array) is not numericArray:
+			raise interpreterRuntimeError(bracket, "Only arrays can be indexed.")
+		if type(index) is not float or not index.is_integer():
+			raise interpreterRuntimeError(bracket, "Index must be a whole number.")
+		position = int(index)
+		if position < 0 or position >= len(array) + limit:
+			raise interpreterRuntimeError(bracket, "Index " + str(position) + " out of bounds for length " + str(len(array)) + ".")
+		return position
+
+	@staticmethod
+	def indexArray(bracket, array, index):
+		position = interpreter.arrayPosition(bracket, array, index, 0)
+		if type(array) is numericArray:
+			item = array.values[position]
+			return item if array.values.dtype.kind == "O" else item.item()
+		return array[position]
+
+	@staticmethod
+	def sliceArray(bracket, array, start, stop):
+		start = 0 if start == None else interpreter.arrayPosition(bracket, array, start, 1)
+		stop = len(array) if stop == None else interpreter.arrayPosition(bracket, array, stop, 1)
+		if start > stop:
+			raise interpreterRuntimeError(bracket, "Slice start is after its end.")
+		if type(array) is numericArray:
+			return numericArray(array.values[start:stop])
+		elif type(array) is listView:
+			return listView(array.items, array.start + start, array.start + stop)
+		return listView(array, start, stop)
+
+	@staticmethod
+	def storeIndex(bracket, array, index, value):
+		position = interpreter.arrayPosition(bracket, array, index, 0)
+		if type(array) is numericArray:
+			kind = array.values.dtype.kind
+			if kind == "f" and type(value) is not float or kind == "b" and type(value) is not bool:
+				# the buffer becomes one of python objects, so the array goes on holding anything the way a list does
+				# slices taken before keep viewing the old buffer, numpy can't change the type of one in place
+				array.values = array.values.astype(object)
+			array.values[position] = value
+		else:
+			array[position] = value
+		return value
+
+	@staticmethod
+	def arrayLength(keyword, value):
+		if type(value) is list or type(value) is listView or type(value) is numericArray or type(value) is str:
+			return float(len(value))
+		raise interpreterRuntimeError(keyword, "Can only take the length of arrays and strings.")
+
+	def visitGroupingExpr(self, expression):
+		return self.evaluate(expression.expression)
+
+	def visitUnaryExpr(self, expression):
+		right = self.evaluate(expression.right)
+		if expression.op.type == "MINUS":
+			self.checkNumberOperand(expression.op, right)
+			return -right
+		elif expression.op.type == "BANG":
+			return not self.isTruthy(right)
+		return None
+
+	def visitAssignExpr(self, expression):
+		value = self.evaluate(expression.value)
+		if expression.slot == None:
+			self.lookUp(expression).values[expression.name.lexeme] = value
+		else:
+			self.enviroment.assignAt(expression.depth, expression.slot, value)
+		return value
+
+	def isTruthy(self, object):
+		if object == None:
+			return False
+		elif type(object) is bool:
+			return bool(object)
+		return True
+
+	def visitBinaryExpr(self, expression):
+		left = self.evaluate(expression.left)
+		right = self.evaluate(expression.right)
+		if type(left) is not float or type(right) is not float:
+			result = numericArray.apply(expression.op, left, right)
+			if result is not None:
+				return result
+		if expression.op.type == "MINUS":
+			self.checkNumberOperands(expression.op, left, right)
+			return left - right
+		elif expression.op.type == "SLASH":
+			self.checkNumberOperands(expression.op, left, right)
+			return left / right
+		elif expression.op.type == "STAR":
+			self.checkNumberOperands(expression.op, left, right)
+			return left * right
+		elif expression.op.type == "PLUS":
+			if type(left) is float and type(right) is float:
+				return left + right
+			elif type(left) is str and type(right) is str:
+				return left + right
+			raise interpreterRuntimeError(
+				expression.op, "Operands must be two numbers or two strings.")
+		elif expression.op.type == "GREATER":
+			self.checkNumberOperands(expression.op, left, right)
+			return left > right
+		elif expression.op.type == "GREATER_EQUAL":
+			self.checkNumberOperands(expression.op, left, right)
+			return left >= right
+		elif expression.op.type == "LESS":
+			self.checkNumberOperands(expression.op, left, right)
+			return left < right
+		elif expression.op.type == "LESS_EQUAL":
+			self.checkNumberOperands(expression.op, left, right)
+			return left <= right
+		elif expression.op.type == "BANG_EQUAL":
+			return not self.isEqual(left, right)
+		elif expression.op.type == "EQUAL_EQUAL":
+			return self.isEqual(left, right)
+		return None
+
+	def checkNumberOperand(self, op, operand):
+		if type(operand) is float:
+			return
+		raise interpreterRuntimeError(op, "Operand must be a number.")
+
+	def checkNumberOperands(self, op, left, right):
+		if type(left) is float and type(right) is float:
+			return
+		raise interpreterRuntimeError(op, "Operands must be numbers")
+
+	def isEqual(self, left, right):
+		if left == None and right == None:
+			return True
+		if left == None:
+			return False
+		return left == right
+
+	def evaluate(self, obj):
+		if type(obj) is groupingExpr:
+			return self.visitGroupingExpr(obj)
+		elif type(obj) is literalExpr:
+			return self.visitLiteralExpr(obj)
+		elif type(obj) is binaryExpr:
+			return self.visitBinaryExpr(obj)
+		elif type(obj) is unaryExpr:
+			return self.visitUnaryExpr(obj)
+		elif type(obj) is expressionStatement:
+			return self.visitExpressionStatement(obj)
+		elif type(obj) is printStatement:
+			return self.visitPrintStatement(obj)
+		elif type(obj) is variableExpr:
+			return self.visitVariableExpr(obj)
+		elif type(obj) is variableStatement:
+			return self.visitVarStatement(obj)
+		elif type(obj) is assignExpr:
+			return self.visitAssignExpr(obj)
+		elif type(obj) is blockStatement:
+			return self.visitBlockStatement(obj)
+		elif type(obj) is ifStatement:
+			return self.visitIfStatement(obj)
+		elif type(obj) is logicalExpr:
+			return self.visitLogicalExpr(obj)
+		elif type(obj) is whileStatement:
+			return self.visitWhileStatement(obj)
+		elif type(obj) is callExpr:
+			return self.visitCallExpr(obj)
+		elif type(obj) is indexExpr:
+			return self.visitIndexExpr(obj)
+		elif type(obj) is setIndexExpr:
+			return self.visitSetIndexExpr(obj)
+		elif type(obj) is sliceExpr:
+			return self.visitSliceExpr(obj)
+		elif type(obj) is lengthExpr:
+			return self.visitLengthExpr(obj)
+		elif type(obj) is returnStatement:
+			return self.visitReturnStatement(obj)
+		elif type(obj) is functionStatement:
+			return self.visitFunctionStatement(obj)
+
+	@staticmethod
+	def parseError(token,  message):
+		if token.type == "EOF":
+			interpreter.report(str(token.line), " at end", str(message))
+		else:
+			interpreter.report(str(token.line), " at '" +
+							   str(token.lexeme) + "'", str(message))
+
+	@staticmethod
+	def error(line, message):
+		interpreter.report(line, "", message)
+
+	@staticmethod
+	def report(line, where, message):
+		print("[line " + str(line) + "] Error" +
+			  str(where) + ": " + str(message))
+		interpreter.hadError = True
+
+	@staticmethod
+	def runTimeError(error):
+		print(str(error.message) + " [line " + str(error.token.line) + "]")
+		interpreter.hadRuntimeError = True
+
+
+class expr(object):
+	__slots__ = ()
+
+
+class assignExpr(expr):
+	'''
+	attrs: name(token), value(expr), depth(int), slot(int), cache(inlineCache)
+	'''
+
+	__slots__ = ("name", "value", "depth", "slot", "cache")
+
+	def __init__(self, name, value):
+		self.name = name
+		self.value = value
+		self.depth = None
+		self.slot = None
+		self.cache = None
+
+	def toString(self):
+		return "(" + self.name.toString() + " " + self.value.toString() + ")"
+
+
+class binaryExpr(expr):
+	'''
+	attrs: left(expr),op(token),right(expr)
+	'''
+
+	__slots__ = ("left", "op", "right")
+
+	def __init__(self, left, op, right):
+		self.left = left
+		self.op = op
+		self.right = right
+
+	def toString(self):
+		return "((" + self.left.toString() + "),(" + str(self.op.toString()) + "),(" + self.right.toString() + "))"
+
+
+class logicalExpr(expr):
+	'''
+	attrs: left(expr),op(token),right(expr)
+	'''
+
+	__slots__ = ("left", "op", "right")
+
+	def __init__(self, left, op, right):
+		self.left = left
+		self.op = op
+		self.right = right
+
+	def toString(self):
+		return "((" + self.left.toString() + "),(" + str(self.op.toString()) + "),(" + self.right.toString() + "))"
+
+
+class unaryExpr(expr):
+	'''
+	attrs: op(token),right(expr)
+	'''
+
+	__slots__ = ("op", "right")
+
+	def __init__(self, op, right):
+		self.op = op
+		self.right = right
+
+	def toString(self):
+		return "((" + str(self.op.toString()) + "),(" + self.right.toString() + "))"
+
+
+class literalExpr(expr):
+	'''
+	attrs: value(object)?
+	'''
+
+	__slots__ = ("value",)
+
+	def __init__(self, value):
+		self.value = value
+
+	def toString(self):
+		return "(" + str(self.value) + ")"
+
+
+class groupingExpr(expr):
+	'''
+	attrs: expression(expr)
+	'''
+
+	__slots__ = ("expression",)
+
+	def __init__(self, expression):
+		self.expression = expression
+
+	def toString(self):
+		return "(" + self.expression.toString() + ")"
+
+
+class variableExpr(expr):
+	'''
+	attrs: name(token), depth(int), slot(int), cache(inlineCache)
+	'''
+
+	__slots__ = ("name", "depth", "slot", "cache")
+
+	def __init__(self, name):
+		self.name = name
+		self.depth = None
+		self.slot = None
+		self.cache = None
+
+	def toString(self):
+		return "(" + self.name.toString() + ")"
+
+
+class callExpr(expr):
+	'''
+	attrs: callee(expr), paren(token), arguments(list(expr)), native(nativeFunction)
+	'''
+
+	__slots__ = ("callee", "paren", "arguments", "native")
+
+	def __init__(self, callee, paren, arguments):
+		self.callee = callee
+		self.paren = paren
+		self.arguments = arguments
+		self.native = None
+
+	def toString(self):
+		return "(" + self.callee.toString() + " " + self.paren.toString() + " " + str(self.arguments) + ")"
+
+
+class indexExpr(expr):
+	'''
+	attrs: object(expr), bracket(token), index(expr)
+	'''
+
+	__slots__ = ("object", "bracket", "index")
+
+	def __init__(self, object, bracket, index):
+		self.object = object
+		self.bracket = bracket
+		self.index = index
+
+	def toString(self):
+		return "(" + self.object.toString() + "[" + self.index.toString() + "])"
+
+
+class sliceExpr(expr):
+	'''
+	attrs: object(expr), bracket(token), start(expr)?, stop(expr)?
+	'''
+
+	__slots__ = ("object", "bracket", "start", "stop")
+
+	def __init__(self, object, bracket, start, stop):
+		self.object = object
+		self.bracket = bracket
+		self.start = start
+		self.stop = stop
+
+	def toString(self):
+		start = "" if self.start == None else self.start.toString()
+		stop = "" if self.stop == None else self.stop.toString()
+		return "(" + self.object.toString() + "[" + start + ":" + stop + "])"
+
+
+class setIndexExpr(expr):
+	'''
+	attrs: object(expr), bracket(token), index(expr), value(expr)
+	'''
+
+	__slots__ = ("object", "bracket", "index", "value")
+
+	def __init__(self, object, bracket, index, value):
+		self.object = object
+		self.bracket = bracket
+		self.index = index
+		self.value = value
+
+	def toString(self):
+		return "(" + self.object.toString() + "[" + self.index.toString() + "] " + self.value.toString() + ")"
+
+
+class lengthExpr(expr):
+	'''
+	attrs: keyword(token), argument(expr)
+	'''
+
+	__slots__ = ("keyword", "argument")
+
+	def __init__(self, keyword, argument):
+		self.keyword = keyword
+		self.argument = argument
+
+	def toString(self):
+		return "(len " + self.argument.toString() + ")"
+
+
+class shape():
+	'''
+	attrs: transitions(dict(string, shape))
+	stands for the names an enviroment holds, every enviroment given the same names in the same order has the same shape
+	'''
+
+	__slots__ = ("transitions",)
+
+	def __init__(self):
+		self.transitions = {}
+
+	def add(self, name):
+		following = self.transitions.get(name)
+		if following is None:
+			following = self.transitions[name] = shape()
+		return following
+
+
+class enviroment():
+	'''
+	attrs: values(dict), slots(list), enclosing(enviroment), shape(shape)
+	values holds variables looked up by name, slots holds variables addressed by the resolver
+	shape changes whenever a name is added to or cleared from values, which is what invalidates inline caches through it
+	allocations counts every enviroment made, for the verbose report
+	'''
+
+	empty = shape()
+	allocations = 0
+
+	def __init__(self, enclosing=None, size=0):
+		enviroment.allocations += 1
+		self.values = {}
+		self.shape = enviroment.empty
+		self.slots = [None] * size
+		if enclosing == None:
+			self.enclosing = None
+		else:
+			self.enclosing = enclosing
+
+	def reserve(self, size):
+		if size > len(self.slots):
+			self.slots.extend([None] * (size - len(self.slots)))
+
+	def clear(self):
+		# slots are left as they are, every slot is written by its declaration before the resolver lets anything read it
+		if self.values:
+			self.values.clear()
+			self.shape = enviroment.empty
+
+	def define(self, name, value):
+		name = str(name)
+		if name not in self.values:
+			self.shape = self.shape.add(name)
+		self.values[name] = value
+
+	def ancestor(self, depth):
+		env = self
+		while depth:
+			env = env.enclosing
+			depth -= 1
+		return env
+
+	def find(self, name):
+		# the enviroment holding a name looked up by name
+		env = self
+		while env is not None:
+			if name.lexeme in env.values:
+				return env
+			env = env.enclosing
+		raise interpreterRuntimeError(
+			name, "Undefined variable '" + str(name.lexeme) + "'.")
+
+	def counter(self, variable):
+		# the container and key a variable is stored under, for loops that read and write it directly
+		if variable.slot == None:
+			return self.find(variable.name).values, variable.name.lexeme
+		return self.ancestor(variable.depth).slots, variable.slot
+
+	def getAt(self, depth, slot):
+		env = self
+		while depth:
+			env = env.enclosing
+			depth -= 1
+		return env.slots[slot]
+
+	def assignAt(self, depth, slot, value):
+		env = self
+		while depth:
+			env = env.enclosing
+			depth -= 1
+		env.slots[slot] = value
+
+	def get(self, name):
+		if name.lexeme in self.values:
+			return self.values[name.lexeme]
+		if self.enclosing != None:
+			return self.enclosing.get(name)
+		raise interpreterRuntimeError(
+			name, "Undefined variable '" + str(name.lexeme) + "'.")
+
+	def assign(self, name, value):
+		if name.lexeme in self.values:
+			self.values[str(name.lexeme)] = value
+			return
+		if self.enclosing != None:
+			self.enclosing.assign(name, value)
+			return
+		raise interpreterRuntimeError(
+			name, "Undefined variable '" + str(name.lexeme) + "'.")
+
+
+class inlineCache():
+	'''
+	attrs: name(token), path(tuple(shape)), shape(shape), hits(int), misses(int)
+	remembers for one lookup site the shapes of the enviroments passed on the way to the one the name was found in, and its shape
+	while the enviroments looked through have those shapes the name is in the same place, whichever enviroments they are,
+	so a fresh frame or loop scope given the same names hits and defining a name only misses the lookups through that scope
+	'''
+
+	__slots__ = ("name", "path", "shape", "hits", "misses")
+
+	def __init__(self, name):
+		self.name = name
+		self.path = ()
+		self.shape = None
+		self.hits = 0
+		self.misses = 0
+
+	def lookup(self, env):
+		holder = env
+		for passed in self.path:
+			if holder.shape is not passed:
+				return self.find(env)
+			holder = holder.enclosing
+			if holder is None:
+				return self.find(env)
+		if holder.shape is not self.shape:
+			return self.find(env)
+		self.hits += 1
+		return holder
+
+	def find(self, env):
+		self.misses += 1
+		lexeme = self.name.lexeme
+		path = []
+		while env is not None:
+			if lexeme in env.values:
+				self.path = tuple(path)
+				self.shape = env.shape
+				return env
+			path.append(env.shape)
+			env = env.enclosing
+		raise interpreterRuntimeError(
+			self.name, "Undefined variable '" + str(lexeme) + "'.")
+
+
+class programCache():
+	'''
+	attrs: directory(string), path(string), key(string)
+	keeps parsed programs in a __palcache__ directory next to the source, keyed by the hash of the source and the interpreter
+	'''
+
+	version = None
+	classes = None
+	fields = None
+
+	def __init__(self, sourcePath, source):
+		self.directory = os.path.join(os.path.dirname(os.path.abspath(sourcePath)), "__palcache__")
+		self.name = os.path.basename(sourcePath)
+		digest = hashlib.sha256(programCache.interpreterVersion().encode())
+		digest.update(source.encode("utf-8", "surrogatepass"))
+		self.key = digest.hexdigest()
+		self.path = os.path.join(self.directory, self.name + "." + self.key[:16] + ".palc")
+
+	@staticmethod
+	def interpreterVersion():
+		# marshal's format follows the python version and the node layout follows this file,
+		# the module name is left out so running pal.py and importing it share one cache
+		if programCache.version == None:
+			with open(os.path.abspath(__file__), "rb") as file:
+				programCache.version = sys.version + str(marshal.version) + hashlib.sha256(file.read()).hexdigest()
+		return programCache.version
+
+	def load(self):
+		collecting = gc.isenabled()
+		gc.disable()
+		try:
+			with open(self.path, "rb") as file:
+				key, program = marshal.loads(file.read())
+			if key != self.key:
+				return None
+			programCache.layout()
+			return self.decodeNode(program, programCache.classes)
+		except Exception:
+			return None
+		finally:
+			if collecting:
+				gc.enable()
+
+	def store(self, statements):
+		try:
+			data = marshal.dumps((self.key, self.encode(statements)))
+			os.makedirs(self.directory, exist_ok=True)
+			handle, temporary = tempfile.mkstemp(dir=self.directory, prefix=self.name + ".", suffix=".tmp")
+			try:
+				with os.fdopen(handle, "wb") as file:
+					file.write(data)
+				os.replace(temporary, self.path)
+			except BaseException:
+				os.remove(temporary)
+				raise
+		except (OSError, ValueError, RecursionError):
+			return
+		# only this source's older entries, a.pal.bak caches as a.pal.bak.<key>.palc and has to survive
+		stale = re.compile(re.escape(self.name) + r"\.[0-9a-f]{16}\.palc")
+		for entry in os.listdir(self.directory):
+			if stale.fullmatch(entry) and entry != os.path.basename(self.path):
+				try:
+					os.remove(os.path.join(self.directory, entry))
+				except OSError:
+					pass
+
+	def encode(self, node):
+		if isinstance(node, (statement, expr)):
+			kind = type(node)
+			index, fields = programCache.layout()[kind]
+			return (index,) + tuple(self.encode(getattr(node, field)) for field in fields)
+		elif isinstance(node, (token, tokenView)):
+			return (node.type, node.lexeme, node.literal, node.line)
+		elif type(node) is list:
+			return [self.encode(item) for item in node]
+		elif type(node) is numericArray:
+			return ("numericArray", node.tolist())
+		return node
+
+	def decodeNode(self, data, classes):
+		# nodes are rebuilt through their constructors, so only constructor arguments are stored
+		if type(data) is tuple:
+			if type(data[0]) is int:
+				return classes[data[0]](*[self.decodeNode(item, classes) if type(item) is tuple or type(item) is list
+										  else item for item in data[1:]])
+			elif data[0] == "numericArray":
+				return numericArray.fromList(data[1])
+			return token(*data)
+		elif type(data) is list:
+			return [self.decodeNode(item, classes) if type(item) is tuple or type(item) is list
+					else item for item in data]
+		return data
+
+	@staticmethod
+	def layout():
+		if programCache.fields == None:
+			kinds = sorted(statement.__subclasses__() + expr.__subclasses__(), key=lambda kind: kind.__name__)
+			programCache.classes = kinds
+			programCache.fields = {}
+			for index, kind in enumerate(kinds):
+				code = kind.__init__.__code__
+				programCache.fields[kind] = (index, code.co_varnames[1:code.co_argcount])
+		return programCache.fields
+
+
+class closureCompiler():
+	'''
+	attrs: interpreter(interpreter), functions(int)
+	compiles a statement list into nested python closures taking the current enviroment
+	inside function bodies statements return interpreter.RETURN to unwind to the call
+	'''
+
+	comparisons = ["GREATER", "GREATER_EQUAL", "LESS", "LESS_EQUAL", "BANG_EQUAL", "EQUAL_EQUAL"]
+	numeric = {"MINUS": operator.sub, "SLASH": operator.truediv, "STAR": operator.mul, "GREATER": operator.gt,
+			   "GREATER_EQUAL": operator.ge, "LESS": operator.lt, "LESS_EQUAL": operator.le}
+
+	def __init__(self, interpreter):
+		self.interpreter = interpreter
+		self.functions = 0
+
+	def compile(self, statements):
+		return self.compileStatements(statements)
+
+	def compileStatements(self, statements):
+		compiled = tuple(self.compileStatement(statement) for statement in statements)
+		if len(compiled) == 1:
+			return compiled[0]
+		if self.functions:
+			RETURN = interpreter.RETURN
+
+			def returning(env):
+				for statement in compiled:
+					if statement(env) is RETURN:
+						return RETURN
+			return returning
+
+		def sequence(env):
+			for statement in compiled:
+				statement(env)
+		return sequence
+
+	def compileStatement(self, statement):
+		kind = type(statement)
+		if kind is expressionStatement:
+			return self.compileExpression(statement.expression)
+		elif kind is printStatement:
+			return self.compilePrint(statement)
+		elif kind is variableStatement:
+			return self.compileVar(statement)
+		elif kind is blockStatement and not statement.scoped:
+			return self.compileStatements(statement.statements)
+		elif kind is blockStatement:
+			body = self.compileStatements(statement.statements)
+			size = statement.slotCount
+
+			def block(env):
+				return body(enviroment(env, size))
+			return block
+		elif kind is ifStatement:
+			return self.compileIf(statement)
+		elif kind is whileStatement and statement.counted:
+			return self.compileCountedLoop(statement)
+		elif kind is whileStatement:
+			condition = self.compileCondition(statement.condition)
+			if statement.scope != None:
+				return self.compileScopedLoop(statement, condition)
+			body = self.compileStatement(statement.body)
+			if self.functions:
+				RETURN = interpreter.RETURN
+
+				def returningLoop(env):
+					while condition(env):
+						if body(env) is RETURN:
+							return RETURN
+				return returningLoop
+
+			def loop(env):
+				while condition(env):
+					body(env)
+			return loop
+		elif kind is functionStatement:
+			return self.compileFunction(statement)
+		elif kind is returnStatement:
+			return self.compileReturn(statement)
+		return self.nothing
+
+	@staticmethod
+	def nothing(env):
+		return None
+
+	def compileCountedLoop(self, statement):
+		condition = statement.condition
+		compare = interpreter.comparisons[condition.op.type]
+		variable = condition.left
+		limit = self.compileExpression(condition.right)
+		# the generic condition and increment take over for good once the guard fails
+		generic = self.compileCondition(condition)
+		increment = statement.body.statements[-1]
+		advance = self.compileStatement(increment)
+		step = increment.expression.value.right.value
+		if increment.expression.value.op.type == "MINUS":
+			step = -step
+		scope = statement.scope
+		size = scope.slotCount if scope != None else 0
+		inner = self.compileStatements(scope.statements) if scope != None else None
+		parts = tuple(None if part is scope else self.compileStatement(part) for part in statement.body.statements[:-1])
+		runtime = self.interpreter
+		RETURN = interpreter.RETURN
+
+		def countedLoop(env):
+			local = enviroment(env, size) if scope != None else None
+			values, key = env.counter(variable)
+			fast = True
+			while True:
+				if fast:
+					counter = values[key]
+					bound = limit(env)
+					fast = type(counter) is float and type(bound) is float
+				if fast:
+					if not compare(counter, bound):
+						return None
+				elif not generic(env):
+					return None
+				for part in parts:
+					if part is None:
+						runtime.reused += 1
+						signal = inner(local)
+						local.clear()
+					else:
+						signal = part(env)
+					if signal is RETURN:
+						return RETURN
+				counter = values[key]
+				if fast and type(counter) is float:
+					values[key] = counter + step
+				else:
+					advance(env)
+		return countedLoop
+
+	def compileScopedLoop(self, statement, condition):
+		scope = statement.scope
+		size = scope.slotCount
+		inner = self.compileStatements(scope.statements)
+		# None marks where the scope block runs in the loop's one enviroment
+		parts = tuple(None if part is scope else self.compileStatement(part)
+					  for part in ([scope] if statement.body is scope else statement.body.statements))
+		runtime = self.interpreter
+		RETURN = interpreter.RETURN
+
+		def scopedLoop(env):
+			local = enviroment(env, size)
+			while condition(env):
+				for part in parts:
+					if part is None:
+						runtime.reused += 1
+						signal = inner(local)
+						local.clear()
+					else:
+						signal = part(env)
+					if signal is RETURN:
+						return RETURN
+		return scopedLoop
+
+	def compilePrint(self, statement):
+		value = self.compileExpression(statement.expression)
+		write = self.interpreter.output.writeValue
+
+		def printValue(env):
+			write(value(env))
+		return printValue
+
+	def compileVar(self, statement):
+		if statement.initializer == None:
+			initializer = self.nothing
+		else:
+			initializer = self.compileExpression(statement.initializer)
+		if statement.slot != None:
+			slot = statement.slot
+
+			def defineSlot(env):
+				env.slots[slot] = initializer(env)
+			return defineSlot
+		name = str(statement.name.lexeme)
+
+		def define(env):
+			env.define(name, initializer(env))
+		return define
+
+	def compileIf(self, statement):
+		condition = self.compileCondition(statement.condition)
+		thenBranch = self.compileStatement(statement.thenBranch)
+		if statement.elseBranch == None:
+			def ifThen(env):
+				if condition(env):
+					return thenBranch(env)
+			return ifThen
+		elseBranch = self.compileStatement(statement.elseBranch)
+
+		def ifThenElse(env):
+			if condition(env):
+				return thenBranch(env)
+			return elseBranch(env)
+		return ifThenElse
+
+	def compileFunction(self, statement):
+		self.functions += 1
+		try:
+			body = self.compileStatements(statement.body)
+		finally:
+			self.functions -= 1
+		if statement.slot != None:
+			slot = statement.slot
+
+			def declareSlot(env):
+				env.slots[slot] = palFunction(statement, env, body)
+			return declareSlot
+		name = str(statement.name.lexeme)
+
+		def declare(env):
+			env.define(name, palFunction(statement, env, body))
+		return declare
+
+	def compileReturn(self, statement):
+		runtime = self.interpreter
+		RETURN = interpreter.RETURN
+		value = statement.value
+		if type(value) is callExpr and value.native == None:
+			callee = self.compileExpression(value.callee)
+			arguments = tuple(self.compileExpression(argument) for argument in value.arguments)
+			paren = value.paren
+			callValue = runtime.callValue
+
+			def tailCall(env):
+				function = callee(env)
+				if type(function) is palFunction:
+					# made by the calling loop in interpreter.callFunction once this frame is gone
+					runtime.tailCall = (paren, function, [argument(env) for argument in arguments])
+				else:
+					runtime.returnValue = callValue(paren, function, [argument(env) for argument in arguments])
+				return RETURN
+			return tailCall
+		if value == None:
+			def returnNil(env):
+				return RETURN
+			return returnNil
+		result = self.compileExpression(value)
+
+		def returnValue(env):
+			runtime.returnValue = result(env)
+			return RETURN
+		return returnValue
+
+	def compileCondition(self, expression):
+		# comparisons of numbers already produce a python bool, anything else goes through isTruthy
+		while type(expression) is groupingExpr:
+			expression = expression.expression
+		if type(expression) is binaryExpr and expression.op.type in self.numeric:
+			# comparing arrays gives an array, which is truthy whatever its length
+			return self.compileNumeric(expression, self.numeric[expression.op.type], self.compileExpression(expression.left),
+									   self.compileExpression(expression.right), True)
+		if type(expression) is binaryExpr and expression.op.type in self.comparisons:
+			return self.compileExpression(expression)
+		if type(expression) is unaryExpr and expression.op.type == "BANG":
+			return self.compileExpression(expression)
+		value = self.compileExpression(expression)
+
+		def truthy(env):
+			result = value(env)
+			return not (result is None or result is False)
+		return truthy
+
+	def compileExpression(self, expression):
+		kind = type(expression)
+		if kind is literalExpr:
+			value = expression.value
+			if type(value) is list or type(value) is numericArray:
+				copyArray = interpreter.copyArray
+
+				def arrayLiteral(env):
+					return copyArray(value)
+				return arrayLiteral
+
+			def literal(env):
+				return value
+			return literal
+		elif kind is groupingExpr:
+			return self.compileExpression(expression.expression)
+		elif kind is variableExpr:
+			return self.compileGet(expression)
+		elif kind is assignExpr:
+			return self.compileAssign(expression)
+		elif kind is binaryExpr:
+			return self.compileBinary(expression)
+		elif kind is unaryExpr:
+			return self.compileUnary(expression)
+		elif kind is logicalExpr:
+			return self.compileLogical(expression)
+		elif kind is callExpr:
+			return self.compileCall(expression)
+		elif kind is indexExpr or kind is setIndexExpr or kind is sliceExpr or kind is lengthExpr:
+			return self.compileArray(expression)
+		return self.nothing
+
+	def compileArray(self, expression):
+		kind = type(expression)
+		if kind is lengthExpr:
+			argument = self.compileExpression(expression.argument)
+			keyword = expression.keyword
+			arrayLength = interpreter.arrayLength
+
+			def length(env):
+				return arrayLength(keyword, argument(env))
+			return length
+		array = self.compileExpression(expression.object)
+		bracket = expression.bracket
+		if kind is sliceExpr:
+			start = self.nothing if expression.start == None else self.compileExpression(expression.start)
+			stop = self.nothing if expression.stop == None else self.compileExpression(expression.stop)
+			sliceArray = interpreter.sliceArray
+
+			def slice(env):
+				return sliceArray(bracket, array(env), start(env), stop(env))
+			return slice
+		index = self.compileExpression(expression.index)
+		if kind is setIndexExpr:
+			value = self.compileExpression(expression.value)
+			storeIndex = interpreter.storeIndex
+
+			def store(env):
+				return storeIndex(bracket, array(env), index(env), value(env))
+			return store
+		indexArray = interpreter.indexArray
+
+		def load(env):
+			return indexArray(bracket, array(env), index(env))
+		return load
+
+	def compileGet(self, expression):
+		name = expression.name
+		lexeme = name.lexeme
+		depth = expression.depth
+		slot = expression.slot
+		if slot != None and depth == 0:
+			def getLocal(env):
+				return env.slots[slot]
+			return getLocal
+		elif slot != None and depth == 1:
+			def getEnclosing(env):
+				return env.enclosing.slots[slot]
+			return getEnclosing
+		elif slot != None and depth == 2:
+			def getEnclosingTwice(env):
+				return env.enclosing.enclosing.slots[slot]
+			return getEnclosingTwice
+		elif slot != None:
+			def getAt(env):
+				for i in range(depth):
+					env = env.enclosing
+				return env.slots[slot]
+			return getAt
+
+		cache = self.interpreter.inlineCache(name)
+
+		lookup = cache.lookup
+
+		def get(env):
+			return lookup(env).values[lexeme]
+		return get
+
+	def compileAssign(self, expression):
+		name = expression.name
+		lexeme = name.lexeme
+		value = self.compileExpression(expression.value)
+		depth = expression.depth
+		slot = expression.slot
+		if slot != None:
+			def assignAt(env):
+				result = value(env)
+				for i in range(depth):
+					env = env.enclosing
+				env.slots[slot] = result
+				return result
+			return assignAt
+
+		lookup = self.interpreter.inlineCache(name).lookup
+
+		def assign(env):
+			result = value(env)
+			lookup(env).values[lexeme] = result
+			return result
+		return assign
+
+	def compileUnary(self, expression):
+		op = expression.op
+		right = self.compileExpression(expression.right)
+		if op.type == "MINUS":
+			def negate(env):
+				value = right(env)
+				if type(value) is float:
+					return -value
+				raise interpreterRuntimeError(op, "Operand must be a number.")
+			return negate
+		elif op.type == "BANG":
+			def bang(env):
+				value = right(env)
+				return value is None or value is False
+			return bang
+		return self.nothing
+
+	def compileLogical(self, expression):
+		left = self.compileExpression(expression.left)
+		right = self.compileExpression(expression.right)
+		if expression.op.type == "OR":
+			def lOr(env):
+				value = left(env)
+				if not (value is None or value is False):
+					return value
+				return right(env)
+			return lOr
+
+		def lAnd(env):
+			value = left(env)
+			if value is None or value is False:
+				return value
+			return right(env)
+		return lAnd
+
+	def compileBinary(self, expression):
+		op = expression.op
+		left = self.compileExpression(expression.left)
+		right = self.compileExpression(expression.right)
+		if op.type in self.numeric:
+			return self.compileNumeric(expression, self.numeric[op.type], left, right)
+		elif op.type == "PLUS":
+			def plus(env):
+				l = left(env)
+				r = right(env)
+				if (type(l) is float and type(r) is float) or (type(l) is str and type(r) is str):
+					return l + r
+				result = numericArray.apply(op, l, r)
+				if result is not None:
+					return result
+				raise interpreterRuntimeError(
+					op, "Operands must be two numbers or two strings.")
+			return plus
+		elif op.type == "EQUAL_EQUAL":
+			def equal(env):
+				return left(env) == right(env)
+			return equal
+		elif op.type == "BANG_EQUAL":
+			def notEqual(env):
+				return not left(env) == right(env)
+			return notEqual
+		return self.nothing
+
+	def compileNumeric(self, expression, function, left, right, condition=False):
+		# as a condition an array result only has to be truthy, which every array is
+		op = expression.op
+		constant = self.numberLiteral(expression.right)
+		if constant != None:
+			def numericConstant(env):
+				l = left(env)
+				if type(l) is float:
+					return function(l, constant)
+				result = numericArray.apply(op, l, constant)
+				if result is not None:
+					return True if condition else result
+				raise interpreterRuntimeError(op, "Operands must be numbers")
+			return numericConstant
+
+		def numeric(env):
+			l = left(env)
+			r = right(env)
+			if type(l) is float and type(r) is float:
+				return function(l, r)
+			result = numericArray.apply(op, l, r)
+			if result is not None:
+				return True if condition else result
+			raise interpreterRuntimeError(op, "Operands must be numbers")
+		return numeric
+
+	@staticmethod
+	def numberLiteral(expression):
+		while type(expression) is groupingExpr:
+			expression = expression.expression
+		if type(expression) is literalExpr and type(expression.value) is float:
+			return expression.value
+		return None
+
+	def compileCall(self, expression):
+		arguments = tuple(self.compileExpression(argument) for argument in expression.arguments)
+		paren = expression.paren
+		if expression.native != None:
+			return self.compileNative(expression.native.guarded(paren), arguments)
+		callee = self.compileExpression(expression.callee)
+		callValue = self.interpreter.callValue
+		callFunction = self.interpreter.callFunction
+
+		def call(env):
+			function = callee(env)
+			if type(function) is palFunction:
+				return callFunction(paren, function, [argument(env) for argument in arguments])
+			return callValue(paren, function, [argument(env) for argument in arguments])
+		return call
+
+	def compileNative(self, function, arguments):
+		# one closure per arity, the arguments are passed positionally without building a list
+		if len(arguments) == 0:
+			def native0(env):
+				return function()
+			return native0
+		elif len(arguments) == 1:
+			first = arguments[0]
+
+			def native1(env):
+				return function(first(env))
+			return native1
+		elif len(arguments) == 2:
+			first, second = arguments
+
+			def native2(env):
+				return function(first(env), second(env))
+			return native2
+
+		def native(env):
+			return function(*[argument(env) for argument in arguments])
+		return native
+
+
+OpCode = Enum("OpCode", "CONSTANT LOAD STORE DEFINE POP PRINT ADD SUBTRACT MULTIPLY DIVIDE GREATER GREATER_EQUAL LESS LESS_EQUAL EQUAL NOT_EQUAL NEGATE NOT JUMP JUMP_IF_FALSE JUMP_IF_FALSE_OR_POP JUMP_IF_TRUE_OR_POP CALL UNDEFINED COPY INDEX STORE_INDEX SLICE LENGTH CALL_NATIVE LOAD_CELL STORE_CELL DEFINE_CELL LOAD_FREE STORE_FREE LOAD_GLOBAL STORE_GLOBAL CLOSURE RETURN TAIL_CALL HALT OPERAND ADD_CONSTANT SUBTRACT_CONSTANT MULTIPLY_CONSTANT DIVIDE_CONSTANT GREATER_CONSTANT GREATER_EQUAL_CONSTANT LESS_CONSTANT LESS_EQUAL_CONSTANT LOAD_ADD_CONSTANT LOAD_SUBTRACT_CONSTANT LOAD_MULTIPLY_CONSTANT LOAD_DIVIDE_CONSTANT LOAD_GREATER_CONSTANT LOAD_GREATER_EQUAL_CONSTANT LOAD_LESS_CONSTANT LOAD_LESS_EQUAL_CONSTANT")
+
+
+class chunk():
+	'''
+	attrs: code(list(int)), constants(list), tokens(list(token)), slotNames(list(string)), slotCount(int)
+	every instruction is two words, an opcode followed by its argument
+	an instruction with a second argument is followed by an OPERAND instruction carrying it, which is never dispatched
+	'''
+
+	def __init__(self):
+		self.code = []
+		self.constants = []
+		self.constantIndex = {}
+		self.tokens = []
+		self.slotNames = []
+		self.slotCount = 0
+
+	def emit(self, op, arg=0, token=None):
+		self.code.append(op.value)
+		self.code.append(arg)
+		self.tokens.append(token)
+		return len(self.code) - 2
+
+	def patch(self, offset, target):
+		self.code[offset+1] = target
+
+	def addConstant(self, value):
+		try:
+			key = (type(value), repr(value) if type(value) is float else value)
+			if key in self.constantIndex:
+				return self.constantIndex[key]
+			self.constantIndex[key] = len(self.constants)
+		except TypeError:
+			pass
+		self.constants.append(value)
+		return len(self.constants) - 1
+
+	def tokenAt(self, offset):
+		return self.tokens[offset // 2]
+
+	def disassemble(self):
+		lines = []
+		lines.append("constants: " + ", ".join(str(i) + "=" + self.constantString(c) for i, c in enumerate(self.constants)))
+		lines.append("slots: " + ", ".join(str(i) + "=" + name for i, name in enumerate(self.slotNames)))
+		for offset in range(0, len(self.code), 2):
+			op = OpCode(self.code[offset])
+			arg = self.code[offset+1]
+			token = self.tokenAt(offset)
+			line = "   |" if token == None else str(token.line).rjust(4)
+			text = str(offset).zfill(4) + " " + line + " " + op.name.ljust(20) + " " + str(arg)
+			if op in (OpCode.CONSTANT, OpCode.UNDEFINED, OpCode.CLOSURE, OpCode.OPERAND) or OpCode.ADD_CONSTANT.value <= op.value < OpCode.LOAD_ADD_CONSTANT.value:
+				text += " (" + self.constantString(self.constants[arg]) + ")"
+			elif (op in (OpCode.LOAD, OpCode.STORE, OpCode.DEFINE, OpCode.LOAD_CELL, OpCode.STORE_CELL, OpCode.DEFINE_CELL) or
+				  op.value >= OpCode.LOAD_ADD_CONSTANT.value):
+				text += " (" + self.slotNames[arg] + ")"
+			elif op in (OpCode.LOAD_FREE, OpCode.STORE_FREE):
+				text += " (" + self.freeNames[arg] + ")"
+			lines.append(text)
+		for value in self.constants:
+			if type(value) is functionChunk:
+				lines.append("")
+				lines.append("fun " + value.name + " arity " + str(value.arity) + ", cells " + str(value.cells) +
+							 ", captures " + str(value.captures))
+				lines.append(value.disassemble())
+		return "\n".join(lines)
+
+	@staticmethod
+	def constantString(value):
+		if type(value) is str:
+			return '"' + value + '"'
+		return str(value)
+
+
+class functionChunk(chunk):
+	'''
+	attrs: name(string), arity(int), declaration(functionStatement), cells(list(int)), captures(list(tuple)), freeNames(list(string)), pool(list(list))
+	the code of one pal function, which runs in its own frame of slotCount slots
+	cells are the parameter slots boxed on entry, captures says where a new closure takes each free cell from,
+	(True, slot) out of the enclosing frame or (False, index) out of the enclosing function's own free cells
+	'''
+
+	def __init__(self, declaration):
+		chunk.__init__(self)
+		self.name = declaration.name.lexeme
+		self.arity = len(declaration.params)
+		self.declaration = declaration
+		self.cells = []
+		self.captures = []
+		self.freeNames = []
+		self.pool = []
+
+	def __str__(self):
+		return "<fn " + str(self.name) + ">"
+
+
+class compiledFunction():
+	'''
+	attrs: code(functionChunk), cells(list(list))
+	a closure made by the virtual machine, each captured variable is shared through a one element list
+	'''
+
+	__slots__ = ("code", "cells")
+
+	def __init__(self, code, cells):
+		self.code = code
+		self.cells = cells
+
+	def __str__(self):
+		return "<fn " + str(self.code.name) + ">"
+
+
+class bytecodeCompiler():
+	'''
+	attrs: chunk(chunk), scopes(list(dict)), nextSlot(int), enclosing(list(tuple)), captured(set(token)), pending(list(tuple)),
+	       rebound(dict(string, token))
+	resolves every variable to a slot at compile time, blocks release their slots when they end
+	every function is compiled into its own functionChunk, enclosing holds the (chunk, scopes) of the ones around it
+	variables a nested function refers to are captured and kept in cells, one element lists the closures share
+	rebound holds the built-ins an unresolved program assigns to, which become globals that start out holding them
+	'''
+
+	binary = {"PLUS": OpCode.ADD, "MINUS": OpCode.SUBTRACT, "STAR": OpCode.MULTIPLY, "SLASH": OpCode.DIVIDE,
+			  "GREATER": OpCode.GREATER, "GREATER_EQUAL": OpCode.GREATER_EQUAL, "LESS": OpCode.LESS,
+			  "LESS_EQUAL": OpCode.LESS_EQUAL, "EQUAL_EQUAL": OpCode.EQUAL, "BANG_EQUAL": OpCode.NOT_EQUAL}
+	withConstant = {"PLUS": OpCode.ADD_CONSTANT, "MINUS": OpCode.SUBTRACT_CONSTANT, "STAR": OpCode.MULTIPLY_CONSTANT,
+					"SLASH": OpCode.DIVIDE_CONSTANT, "GREATER": OpCode.GREATER_CONSTANT, "GREATER_EQUAL": OpCode.GREATER_EQUAL_CONSTANT,
+					"LESS": OpCode.LESS_CONSTANT, "LESS_EQUAL": OpCode.LESS_EQUAL_CONSTANT}
+	withLocal = {name: OpCode["LOAD_" + op.name] for name, op in withConstant.items()}
+
+	loads = {"slot": OpCode.LOAD, "cell": OpCode.LOAD_CELL, "free": OpCode.LOAD_FREE, "global": OpCode.LOAD_GLOBAL}
+	stores = {"slot": OpCode.STORE, "cell": OpCode.STORE_CELL, "free": OpCode.STORE_FREE, "global": OpCode.STORE_GLOBAL}
+
+	def __init__(self):
+		self.chunk = chunk()
+		self.scopes = [{}]
+		self.nextSlot = 0
+		self.enclosing = []
+		self.captured = set()
+		self.pending = []
+		self.rebound = {}
+
+	def compile(self, statements):
+		self.findCaptured(statements, [({}, 0)])
+		for name in self.rebound.values():
+			self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(nativeLibrary.functions()[name.lexeme]), name)
+			self.compileDefine(name)
+		for statement in statements:
+			self.compileStatement(statement)
+		self.chunk.emit(OpCode.HALT)
+		# global functions are compiled last, so their bodies see every global
+		while self.pending:
+			self.compileFunction(*self.pending.pop(0))
+		return self.chunk
+
+	def findCaptured(self, statements, scopes):
+		# scopes are (names, function level) pairs, a name used from a deeper level than its declaration is captured
+		for statement in statements:
+			kind = type(statement)
+			if kind is expressionStatement or kind is printStatement:
+				self.findCapturedIn(statement.expression, scopes)
+			elif kind is variableStatement:
+				if statement.initializer != None:
+					self.findCapturedIn(statement.initializer, scopes)
+				scopes[-1][0].setdefault(statement.name.lexeme, statement.name)
+			elif kind is blockStatement:
+				self.findCaptured(statement.statements, scopes + [({}, scopes[-1][1])])
+			elif kind is ifStatement:
+				self.findCapturedIn(statement.condition, scopes)
+				self.findCaptured([statement.thenBranch], scopes)
+				if statement.elseBranch != None:
+					self.findCaptured([statement.elseBranch], scopes)
+			elif kind is whileStatement:
+				self.findCapturedIn(statement.condition, scopes)
+				self.findCaptured([statement.body], scopes)
+			elif kind is functionStatement:
+				scopes[-1][0].setdefault(statement.name.lexeme, statement.name)
+				names = {}
+				for param in statement.params:
+					names.setdefault(param.lexeme, param)
+				self.findCaptured(statement.body, scopes + [(names, scopes[-1][1] + 1)])
+			elif kind is returnStatement and statement.value != None:
+				self.findCapturedIn(statement.value, scopes)
+
+	def findCapturedIn(self, expression, scopes):
+		kind = type(expression)
+		if kind is variableExpr or kind is assignExpr:
+			if kind is assignExpr:
+				self.findCapturedIn(expression.value, scopes)
+			for index in range(len(scopes)-1, 0, -1):
+				names, level = scopes[index]
+				if expression.name.lexeme in names:
+					if level < scopes[-1][1]:
+						self.captured.add(names[expression.name.lexeme])
+					return
+			lexeme = expression.name.lexeme
+			if kind is assignExpr and lexeme not in scopes[0][0] and lexeme in nativeLibrary.functions():
+				# the resolver rejects these, so only programs run without it get here
+				self.rebound.setdefault(lexeme, expression.name)
+		elif kind is binaryExpr or kind is logicalExpr:
+			self.findCapturedIn(expression.left, scopes)
+			self.findCapturedIn(expression.right, scopes)
+		elif kind is unaryExpr:
+			self.findCapturedIn(expression.right, scopes)
+		elif kind is groupingExpr:
+			self.findCapturedIn(expression.expression, scopes)
+		elif kind is callExpr:
+			self.findCapturedIn(expression.callee, scopes)
+			for argument in expression.arguments:
+				self.findCapturedIn(argument, scopes)
+		elif kind is indexExpr or kind is setIndexExpr:
+			self.findCapturedIn(expression.object, scopes)
+			self.findCapturedIn(expression.index, scopes)
+			if kind is setIndexExpr:
+				self.findCapturedIn(expression.value, scopes)
+		elif kind is sliceExpr:
+			self.findCapturedIn(expression.object, scopes)
+			for bound in (expression.start, expression.stop):
+				if bound != None:
+					self.findCapturedIn(bound, scopes)
+		elif kind is lengthExpr:
+			self.findCapturedIn(expression.argument, scopes)
+
+	def compileFunction(self, code, statement):
+		saved = (self.chunk, self.scopes, self.nextSlot)
+		self.enclosing.append((self.chunk, self.scopes))
+		self.chunk = code
+		self.scopes = [{}]
+		self.nextSlot = 0
+		for param in statement.params:
+			slot, cell = self.declare(param)
+			if cell:
+				code.cells.append(slot)
+		for inner in statement.body:
+			self.compileStatement(inner)
+		self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(None))
+		self.chunk.emit(OpCode.RETURN)
+		self.enclosing.pop()
+		self.chunk, self.scopes, self.nextSlot = saved
+
+	def beginScope(self):
+		self.scopes.append({})
+		return self.nextSlot
+
+	def endScope(self, slot):
+		self.scopes.pop()
+		self.nextSlot = slot
+
+	def declare(self, name):
+		# the (slot, cell) of a new variable, a name declared again in the same scope keeps both
+		scope = self.scopes[-1]
+		if name.lexeme in scope:
+			return scope[name.lexeme]
+		slot = self.nextSlot
+		self.nextSlot += 1
+		if slot == len(self.chunk.slotNames):
+			self.chunk.slotNames.append(name.lexeme)
+		else:
+			self.chunk.slotNames[slot] += "/" + name.lexeme
+		self.chunk.slotCount = max(self.chunk.slotCount, self.nextSlot)
+		scope[name.lexeme] = (slot, name in self.captured)
+		return scope[name.lexeme]
+
+	def resolve(self, name):
+		# ("slot" or "cell", slot) in this frame, ("free", index) captured by this function, ("global", slot) or None
+		for scope in reversed(self.scopes):
+			if name.lexeme in scope:
+				slot, cell = scope[name.lexeme]
+				return ("cell" if cell else "slot", slot)
+		index = self.free(len(self.enclosing), name)
+		if index != None:
+			return ("free", index)
+		if self.enclosing and name.lexeme in self.enclosing[0][1][0]:
+			return ("global", self.enclosing[0][1][0][name.lexeme][0])
+		return None
+
+	def free(self, level, name):
+		# the free cell index of name in the function at this nesting level, threaded through every function between
+		if level == 0:
+			return None
+		code = self.chunk if level == len(self.enclosing) else self.enclosing[level][0]
+		if name.lexeme in code.freeNames:
+			return code.freeNames.index(name.lexeme)
+		scopes = self.enclosing[level-1][1]
+		for depth in range(len(scopes)-1, -1, -1):
+			if name.lexeme in scopes[depth]:
+				if level == 1 and depth == 0:
+					return None
+				capture = (True, scopes[depth][name.lexeme][0])
+				break
+		else:
+			index = self.free(level-1, name)
+			if index == None:
+				return None
+			capture = (False, index)
+		code.captures.append(capture)
+		code.freeNames.append(name.lexeme)
+		return len(code.captures) - 1
+
+	def compileStatement(self, statement):
+		kind = type(statement)
+		if kind is expressionStatement:
+			expression = statement.expression
+			location = self.resolve(expression.name) if type(expression) is assignExpr else None
+			if location != None and location[0] == "slot":
+				# an assignment whose value is discarded stores and pops in one instruction
+				self.compileExpression(expression.value)
+				self.chunk.emit(OpCode.DEFINE, location[1], expression.name)
+				return
+			self.compileExpression(expression)
+			self.chunk.emit(OpCode.POP)
+		elif kind is printStatement:
+			self.compileExpression(statement.expression)
+			self.chunk.emit(OpCode.PRINT)
+		elif kind is variableStatement:
+			if statement.initializer == None:
+				self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(None))
+			else:
+				self.compileExpression(statement.initializer)
+			self.compileDefine(statement.name)
+		elif kind is blockStatement:
+			slot = self.beginScope()
+			for inner in statement.statements:
+				self.compileStatement(inner)
+			self.endScope(slot)
+		elif kind is ifStatement:
+			self.compileExpression(statement.condition)
+			skipThen = self.chunk.emit(OpCode.JUMP_IF_FALSE)
+			self.compileStatement(statement.thenBranch)
+			if statement.elseBranch == None:
+				self.chunk.patch(skipThen, len(self.chunk.code))
+			else:
+				skipElse = self.chunk.emit(OpCode.JUMP)
+				self.chunk.patch(skipThen, len(self.chunk.code))
+				self.compileStatement(statement.elseBranch)
+				self.chunk.patch(skipElse, len(self.chunk.code))
+		elif kind is whileStatement:
+			start = len(self.chunk.code)
+			self.compileExpression(statement.condition)
+			skipBody = self.chunk.emit(OpCode.JUMP_IF_FALSE)
+			self.compileStatement(statement.body)
+			self.chunk.emit(OpCode.JUMP, start)
+			self.chunk.patch(skipBody, len(self.chunk.code))
+		elif kind is functionStatement:
+			code = functionChunk(statement)
+			if statement.name in self.captured and statement.name.lexeme not in self.scopes[-1]:
+				# the cell exists before the closure is made, so the function can capture its own name
+				self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(None))
+				self.compileDefine(statement.name)
+			else:
+				self.declare(statement.name)
+			if not self.enclosing and len(self.scopes) == 1:
+				self.pending.append((code, statement))
+			else:
+				self.compileFunction(code, statement)
+			self.chunk.emit(OpCode.CLOSURE, self.chunk.addConstant(code), statement.name)
+			self.compileDefine(statement.name)
+		elif kind is returnStatement:
+			value = statement.value
+			if type(value) is callExpr and value.native == None:
+				# a pal function called here replaces the current frame, anything else returns its result
+				self.compileExpression(value.callee)
+				for argument in value.arguments:
+					self.compileExpression(argument)
+				self.chunk.emit(OpCode.TAIL_CALL, len(value.arguments), value.paren)
+			elif value == None:
+				self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(None))
+			else:
+				self.compileExpression(value)
+			self.chunk.emit(OpCode.RETURN, 0, statement.keyword)
+
+	def compileDefine(self, name):
+		# the first declaration in a scope makes a new cell, declaring the name again stores into it
+		redeclared = name.lexeme in self.scopes[-1]
+		slot, cell = self.declare(name)
+		if not cell:
+			self.chunk.emit(OpCode.DEFINE, slot, name)
+		elif redeclared:
+			self.chunk.emit(OpCode.STORE_CELL, slot, name)
+			self.chunk.emit(OpCode.POP)
+		else:
+			self.chunk.emit(OpCode.DEFINE_CELL, slot, name)
+
+	def compileExpression(self, expression):
+		kind = type(expression)
+		if kind is literalExpr:
+			self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(expression.value))
+			if type(expression.value) is list or type(expression.value) is numericArray:
+				self.chunk.emit(OpCode.COPY)
+		elif kind is groupingExpr:
+			self.compileExpression(expression.expression)
+		elif kind is variableExpr:
+			self.compileAccess(OpCode.LOAD, expression.name)
+		elif kind is assignExpr:
+			self.compileExpression(expression.value)
+			self.compileAccess(OpCode.STORE, expression.name)
+		elif kind is binaryExpr:
+			constant = closureCompiler.numberLiteral(expression.right)
+			location = self.resolve(expression.left.name) if type(expression.left) is variableExpr else None
+			if constant != None and expression.op.type in self.withConstant and location != None and location[0] == "slot":
+				# a local and a number make one instruction instead of three, the constant rides in an OPERAND
+				self.chunk.emit(self.withLocal[expression.op.type], location[1], expression.op)
+				self.chunk.emit(OpCode.OPERAND, self.chunk.addConstant(constant))
+			elif constant != None and expression.op.type in self.withConstant:
+				# a number on the right is folded into the operator, one dispatch instead of two
+				self.compileExpression(expression.left)
+				self.chunk.emit(self.withConstant[expression.op.type], self.chunk.addConstant(constant), expression.op)
+			else:
+				self.compileExpression(expression.left)
+				self.compileExpression(expression.right)
+				self.chunk.emit(self.binary[expression.op.type], 0, expression.op)
+		elif kind is unaryExpr:
+			self.compileExpression(expression.right)
+			if expression.op.type == "MINUS":
+				self.chunk.emit(OpCode.NEGATE, 0, expression.op)
+			else:
+				self.chunk.emit(OpCode.NOT, 0, expression.op)
+		elif kind is logicalExpr:
+			self.compileExpression(expression.left)
+			if expression.op.type == "OR":
+				jump = self.chunk.emit(OpCode.JUMP_IF_TRUE_OR_POP)
+			else:
+				jump = self.chunk.emit(OpCode.JUMP_IF_FALSE_OR_POP)
+			self.compileExpression(expression.right)
+			self.chunk.patch(jump, len(self.chunk.code))
+		elif kind is callExpr and expression.native != None:
+			for argument in expression.arguments:
+				self.compileExpression(argument)
+			native = (expression.native.arity, expression.native.guarded(expression.paren))
+			self.chunk.emit(OpCode.CALL_NATIVE, self.chunk.addConstant(native), expression.paren)
+		elif kind is callExpr:
+			self.compileExpression(expression.callee)
+			for argument in expression.arguments:
+				self.compileExpression(argument)
+			self.chunk.emit(OpCode.CALL, len(expression.arguments), expression.paren)
+		elif kind is indexExpr or kind is setIndexExpr:
+			self.compileExpression(expression.object)
+			self.compileExpression(expression.index)
+			if kind is setIndexExpr:
+				self.compileExpression(expression.value)
+				self.chunk.emit(OpCode.STORE_INDEX, 0, expression.bracket)
+			else:
+				self.chunk.emit(OpCode.INDEX, 0, expression.bracket)
+		elif kind is sliceExpr:
+			self.compileExpression(expression.object)
+			for bound in (expression.start, expression.stop):
+				if bound == None:
+					self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(None))
+				else:
+					self.compileExpression(bound)
+			self.chunk.emit(OpCode.SLICE, 0, expression.bracket)
+		elif kind is lengthExpr:
+			self.compileExpression(expression.argument)
+			self.chunk.emit(OpCode.LENGTH, 0, expression.keyword)
+		else:
+			self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(None))
+
+	def compileAccess(self, op, name):
+		location = self.resolve(name)
+		if location == None and op == OpCode.LOAD and name.lexeme in nativeLibrary.functions():
+			self.chunk.emit(OpCode.CONSTANT, self.chunk.addConstant(nativeLibrary.functions()[name.lexeme]), name)
+		elif location == None:
+			self.chunk.emit(OpCode.UNDEFINED, self.chunk.addConstant(name.lexeme), name)
+		elif op == OpCode.LOAD:
+			self.chunk.emit(self.loads[location[0]], location[1], name)
+		else:
+			self.chunk.emit(self.stores[location[0]], location[1], name)
+
+
+class virtualMachine():
+	'''
+	attrs: interpreter(interpreter)
+	pal calls push a frame on a list instead of recursing, a tail call reuses the frame it returns from
+	'''
+
+	frameLimit = 200000
+	# the python function behind every arithmetic and comparison opcode, indexed by opcode value
+	operations = [None] * (len(OpCode) + 1)
+	for name, function in (("ADD", operator.add), ("SUBTRACT", operator.sub), ("MULTIPLY", operator.mul),
+						   ("DIVIDE", operator.truediv), ("GREATER", operator.gt), ("GREATER_EQUAL", operator.ge),
+						   ("LESS", operator.lt), ("LESS_EQUAL", operator.le)):
+		operations[OpCode[name].value] = operations[OpCode[name + "_CONSTANT"].value] = function
+		operations[OpCode["LOAD_" + name + "_CONSTANT"].value] = function
+	del name, function
+	# slot lists kept per function for reuse by later calls
+	poolSize = 16
+
+	def __init__(self, interpreter):
+		self.interpreter = interpreter
+
+	def run(self, program):
+		CONSTANT, LOAD, STORE, DEFINE = OpCode.CONSTANT.value, OpCode.LOAD.value, OpCode.STORE.value, OpCode.DEFINE.value
+		POP, PRINT, JUMP, JUMP_IF_FALSE = OpCode.POP.value, OpCode.PRINT.value, OpCode.JUMP.value, OpCode.JUMP_IF_FALSE.value
+		ADD, SUBTRACT, MULTIPLY, DIVIDE = OpCode.ADD.value, OpCode.SUBTRACT.value, OpCode.MULTIPLY.value, OpCode.DIVIDE.value
+		GREATER, GREATER_EQUAL, LESS, LESS_EQUAL = OpCode.GREATER.value, OpCode.GREATER_EQUAL.value, OpCode.LESS.value, OpCode.LESS_EQUAL.value
+		EQUAL, NOT_EQUAL, NEGATE, NOT = OpCode.EQUAL.value, OpCode.NOT_EQUAL.value, OpCode.NEGATE.value, OpCode.NOT.value
+		JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP = OpCode.JUMP_IF_FALSE_OR_POP.value, OpCode.JUMP_IF_TRUE_OR_POP.value
+		CALL, UNDEFINED = OpCode.CALL.value, OpCode.UNDEFINED.value
+		COPY, INDEX, STORE_INDEX, SLICE, LENGTH = (OpCode.COPY.value, OpCode.INDEX.value, OpCode.STORE_INDEX.value,
+												   OpCode.SLICE.value, OpCode.LENGTH.value)
+		CALL_NATIVE = OpCode.CALL_NATIVE.value
+		LOAD_CELL, STORE_CELL, DEFINE_CELL = OpCode.LOAD_CELL.value, OpCode.STORE_CELL.value, OpCode.DEFINE_CELL.value
+		LOAD_FREE, STORE_FREE, LOAD_GLOBAL, STORE_GLOBAL = (OpCode.LOAD_FREE.value, OpCode.STORE_FREE.value,
+															OpCode.LOAD_GLOBAL.value, OpCode.STORE_GLOBAL.value)
+		CLOSURE, RETURN, TAIL_CALL = OpCode.CLOSURE.value, OpCode.RETURN.value, OpCode.TAIL_CALL.value
+		ADD_CONSTANT, LOAD_ADD_CONSTANT, HALT = OpCode.ADD_CONSTANT.value, OpCode.LOAD_ADD_CONSTANT.value, OpCode.HALT.value
+		operations = virtualMachine.operations
+		code = program.code
+		constants = program.constants
+		slots = [None] * program.slotCount
+		globalSlots = slots
+		cells = None
+		frames = []
+		stack = []
+		push = stack.append
+		pop = stack.pop
+		write = self.interpreter.output.writeValue
+		pc = 0
+		# the program ends on HALT, every function on RETURN, so the loop needs no bounds check
+		while True:
+			op = code[pc]
+			arg = code[pc+1]
+			pc += 2
+			if op == LOAD:
+				push(slots[arg])
+			elif op >= ADD_CONSTANT:
+				# the operators taking a number constant are numbered last, each group in the same order as ADD to LESS_EQUAL
+				if op >= LOAD_ADD_CONSTANT:
+					left = slots[arg]
+					right = constants[code[pc+1]]
+					pc += 2
+					if type(left) is float:
+						push(operations[op](left, right))
+					else:
+						push(virtualMachine.mixed(program.tokenAt(pc-4), left, right, op == LOAD_ADD_CONSTANT))
+				else:
+					left = stack[-1]
+					if type(left) is float:
+						stack[-1] = operations[op](left, constants[arg])
+					else:
+						stack[-1] = virtualMachine.mixed(program.tokenAt(pc-2), left, constants[arg], op == ADD_CONSTANT)
+			elif op == CONSTANT:
+				push(constants[arg])
+			elif op == DEFINE:
+				slots[arg] = pop()
+			elif op == JUMP_IF_FALSE:
+				value = pop()
+				if value is None or value is False:
+					pc = arg
+			elif op == JUMP:
+				pc = arg
+			elif ADD <= op <= LESS_EQUAL:
+				# arithmetic and comparison opcodes are numbered contiguously from ADD
+				right = pop()
+				left = stack[-1]
+				if type(left) is float and type(right) is float:
+					stack[-1] = operations[op](left, right)
+				elif op == ADD and type(left) is str and type(right) is str:
+					stack[-1] = left + right
+				else:
+					stack[-1] = virtualMachine.mixed(program.tokenAt(pc-2), left, right, op == ADD)
+			elif op == STORE:
+				slots[arg] = stack[-1]
+			elif op == POP:
+				pop()
+			elif op == EQUAL:
+				right = pop()
+				stack[-1] = stack[-1] == right
+			elif op == NOT_EQUAL:
+				right = pop()
+				stack[-1] = not stack[-1] == right
+			elif op == PRINT:
+				write(pop())
+			elif op == NEGATE:
+				if type(stack[-1]) is not float:
+					raise interpreterRuntimeError(program.tokenAt(pc-2), "Operand must be a number.")
+				stack[-1] = -stack[-1]
+			elif op == NOT:
+				value = stack[-1]
+				stack[-1] = value is None or value is False
+			elif op == JUMP_IF_FALSE_OR_POP:
+				value = stack[-1]
+				if value is None or value is False:
+					pc = arg
+				else:
+					pop()
+			elif op == JUMP_IF_TRUE_OR_POP:
+				value = stack[-1]
+				if not (value is None or value is False):
+					pc = arg
+				else:
+					pop()
+			elif op == CALL_NATIVE:
+				arity, function = constants[arg]
+				if arity == 1:
+					stack[-1] = function(stack[-1])
+				elif arity == 0:
+					push(function())
+				else:
+					arguments = stack[len(stack)-arity:]
+					del stack[len(stack)-arity:]
+					push(function(*arguments))
+			elif op == CALL or op == TAIL_CALL:
+				function = stack[-arg-1]
+				memo = None
+				if type(function) is memoizedFunction:
+					self.interpreter.adopt(function)
+					key = function.key(stack[len(stack)-arg:])
+					if key is not None and key in function.cache:
+						del stack[len(stack)-arg:]
+						stack[-1] = function.hit(key)
+						continue
+					elif key is not None:
+						# stored by the RETURN of this frame, which a tail call would skip
+						memo = (function, key)
+						op = CALL
+					function = function.function
+					stack[-arg-1] = function
+				if type(function) is compiledFunction:
+					callee = function.code
+					if callee.arity != arg:
+						raise interpreterRuntimeError(program.tokenAt(pc-2), "Expected " + str(callee.arity) +
+													  " arguments but got " + str(arg) + ".")
+					if op == TAIL_CALL:
+						if len(program.pool) < self.poolSize:
+							program.pool.append(slots)
+					elif len(frames) < self.frameLimit:
+						frames.append((program, slots, cells, pc, memo))
+					else:
+						raise interpreterRuntimeError(program.tokenAt(pc-2), "Stack overflow.")
+					slots = callee.pool.pop() if callee.pool else [None] * callee.slotCount
+					while arg:
+						arg -= 1
+						slots[arg] = pop()
+					pop()
+					for slot in callee.cells:
+						slots[slot] = [slots[slot]]
+					program = callee
+					code = callee.code
+					constants = callee.constants
+					cells = function.cells
+					pc = 0
+				else:
+					# anything else is called in place, a tail call then returns its result with the RETURN after it
+					arguments = stack[len(stack)-arg:]
+					del stack[len(stack)-arg:]
+					stack[-1] = self.interpreter.callValue(program.tokenAt(pc-2), function, arguments)
+			elif op == RETURN:
+				# the result stays on top of the stack for the caller
+				if len(program.pool) < self.poolSize:
+					program.pool.append(slots)
+				program, slots, cells, pc, memo = frames.pop()
+				if memo is not None:
+					memo[0].store(memo[1], stack[-1])
+				code = program.code
+				constants = program.constants
+			elif op == LOAD_GLOBAL:
+				push(globalSlots[arg])
+			elif op == LOAD_FREE:
+				push(cells[arg][0])
+			elif op == LOAD_CELL:
+				push(slots[arg][0])
+			elif op == STORE_GLOBAL:
+				globalSlots[arg] = stack[-1]
+			elif op == STORE_FREE:
+				cells[arg][0] = stack[-1]
+			elif op == STORE_CELL:
+				slots[arg][0] = stack[-1]
+			elif op == DEFINE_CELL:
+				slots[arg] = [pop()]
+			elif op == CLOSURE:
+				function = constants[arg]
+				push(compiledFunction(function, [slots[index] if local else cells[index] for local, index in function.captures]))
+			elif op == UNDEFINED:
+				raise interpreterRuntimeError(
+					program.tokenAt(pc-2), "Undefined variable '" + str(constants[arg]) + "'.")
+			elif op == COPY:
+				stack[-1] = interpreter.copyArray(stack[-1])
+			elif op == INDEX:
+				index = pop()
+				stack[-1] = interpreter.indexArray(program.tokenAt(pc-2), stack[-1], index)
+			elif op == STORE_INDEX:
+				value = pop()
+				index = pop()
+				stack[-1] = interpreter.storeIndex(program.tokenAt(pc-2), stack[-1], index, value)
+			elif op == SLICE:
+				stop = pop()
+				start = pop()
+				stack[-1] = interpreter.sliceArray(program.tokenAt(pc-2), stack[-1], start, stop)
+			elif op == LENGTH:
+				stack[-1] = interpreter.arrayLength(program.tokenAt(pc-2), stack[-1])
+			elif op == HALT:
+				return
+
+	@staticmethod
+	def mixed(token, left, right, add):
+		# operands the number fast paths leave out, arrays are applied element-wise and anything else is an error
+		result = numericArray.apply(token, left, right)
+		if result is None and add:
+			raise interpreterRuntimeError(token, "Operands must be two numbers or two strings.")
+		elif result is None:
+			raise interpreterRuntimeError(token, "Operands must be numbers")
+		return result
+
+
+class pythonCompiler():
+	'''
+	attrs: interpreter(interpreter), scopes(list(dict)), tokens(list(token)), constants(list), count(int), captured(set(token)),
+	       cells(set(string)), functions(list(tuple)), pending(list(tuple))
+	translates statements into a python function, every pal variable becomes a renamed python local
+	pal functions become nested python functions run by interpreter.callFunction, like the closure backend's bodies
+	variables a nested function refers to are found as the bytecode compiler finds them and kept in one element list cells,
+	so each run of their declaration makes a new one, and a function gets the cells it uses as defaults when it is made
+	functions holds the (first scope, nonlocal names, cells used) of the functions being translated
+	'''
+
+	numeric = {"MINUS": ast.Sub, "SLASH": ast.Div, "STAR": ast.Mult, "PLUS": ast.Add}
+	comparisons = {"GREATER": ast.Gt, "GREATER_EQUAL": ast.GtE, "LESS": ast.Lt, "LESS_EQUAL": ast.LtE}
+	parameters = ["interpreter", "write", "fail", "constants"]
+	# runtime errors carry pal lines through fail(), the python locations only have to be present
+	location = {"lineno": 1, "col_offset": 0}
+	load = ast.Load()
+	store = ast.Store()
+
+	def __init__(self, interpreter):
+		self.interpreter = interpreter
+		self.scopes = [{}]
+		self.tokens = []
+		self.constants = []
+		self.count = 0
+		self.captured = set()
+		self.cells = set()
+		self.functions = []
+		self.pending = []
+
+	def compile(self, statements):
+		finder = bytecodeCompiler()
+		finder.findCaptured(statements, [({}, 0)])
+		self.captured = finder.captured
+		# built-ins an unresolved program assigns to are globals that start out holding them, as on the bytecode backend
+		body = [self.define(name, self.constant(nativeLibrary.functions()[name.lexeme])) for name in finder.rebound.values()]
+		body += self.compileBlock(statements)
+		# global functions are translated last, so their bodies see every global
+		while self.pending:
+			definition, statement = self.pending.pop(0)
+			self.compileFunction(definition, statement, self.scopes[:1])
+		prologue = [ast.Assign(**self.location, targets=[self.name("c" + str(i), self.store)],
+							   value=ast.Subscript(**self.location, value=self.name("constants"), slice=ast.Constant(**self.location, value=i), ctx=self.load))
+					for i in range(len(self.constants))]
+		# a function can run before a global it reads is declared, which reads nil as on the other backends
+		prologue += [ast.Assign(**self.location, targets=[self.name(identifier, self.store)], value=ast.Constant(**self.location, value=None))
+					 for identifier in self.scopes[0].values()]
+		function = self.function("program", self.parameters, prologue + body)
+		return ast.Module(body=[function], type_ignores=[])
+
+	def function(self, name, parameters, body):
+		arguments = ast.arguments(posonlyargs=[], args=[ast.arg(**self.location, arg=parameter) for parameter in parameters],
+								  kwonlyargs=[], kw_defaults=[], defaults=[])
+		function = ast.FunctionDef(**self.location, name=name, args=arguments, body=body or [ast.Pass(**self.location)],
+								   decorator_list=[], returns=None)
+		if "type_params" in ast.FunctionDef._fields:
+			function.type_params = []
+		return function
+
+	def run(self, code):
+		namespace = {}
+		exec(code, namespace)
+		namespace["program"](self.interpreter, self.interpreter.output.writeValue, self.fail, self.constants)
+
+	def fail(self, index, message, *operands):
+		if operands:
+			result = numericArray.apply(self.tokens[index], *operands)
+			if result is not None:
+				return result
+		raise interpreterRuntimeError(self.tokens[index], message)
+
+	def fresh(self, prefix):
+		self.count += 1
+		return prefix + str(self.count)
+
+	def name(self, identifier, ctx=None):
+		return ast.Name(**self.location, id=identifier, ctx=ctx or self.load)
+
+	def constant(self, value):
+		# values without a python literal form are handed to the program and bound to locals up front
+		self.constants.append(value)
+		return self.name("c" + str(len(self.constants)-1))
+
+	def helper(self, name, arguments):
+		function = ast.Attribute(**self.location, value=self.name("interpreter"), attr=name, ctx=self.load)
+		return ast.Call(**self.location, func=function, args=arguments, keywords=[])
+
+	def failure(self, token, message, operands=()):
+		self.tokens.append(token)
+		arguments = [ast.Constant(**self.location, value=len(self.tokens)-1), ast.Constant(**self.location, value=message)]
+		return ast.Call(**self.location, func=self.name("fail"), args=arguments + list(operands), keywords=[])
+
+	def declare(self, name):
+		scope = self.scopes[-1]
+		if name.lexeme not in scope:
+			suffix = name.lexeme if name.lexeme.isascii() and name.lexeme.isidentifier() else ""
+			scope[name.lexeme] = self.fresh("v") + "_" + suffix
+			if name in self.captured:
+				self.cells.add(scope[name.lexeme])
+		return scope[name.lexeme]
+
+	def define(self, name, value):
+		# the first declaration of a captured variable in a scope makes its cell, declaring it again stores into it
+		redeclared = name.lexeme in self.scopes[-1]
+		identifier = self.declare(name)
+		if identifier in self.cells and not redeclared:
+			return self.cell(identifier, value)
+		return self.assign(identifier, value)
+
+	def cell(self, identifier, value):
+		return ast.Assign(**self.location, targets=[self.name(identifier, self.store)], value=ast.List(**self.location, elts=[value], ctx=self.load))
+
+	def resolve(self, name):
+		for depth in range(len(self.scopes)-1, -1, -1):
+			if name.lexeme in self.scopes[depth]:
+				identifier = self.scopes[depth][name.lexeme]
+				if identifier in self.cells:
+					# every function between the use and the declaration has to be handed the cell
+					for first, nonlocals, cells in self.functions:
+						if depth < first:
+							cells.add(identifier)
+				return identifier
+		return None
+
+	def target(self, name):
+		# the python name an assignment stores to, a global assigned in a function is declared nonlocal there
+		identifier = self.resolve(name)
+		if self.functions and identifier != None and identifier == self.scopes[0].get(name.lexeme):
+			self.functions[-1][1].add(identifier)
+		return identifier
+
+	def variable(self, identifier):
+		if identifier in self.cells:
+			return ast.Subscript(**self.location, value=self.name(identifier), slice=ast.Constant(**self.location, value=0), ctx=self.load)
+		return self.name(identifier)
+
+	def assign(self, identifier, value):
+		if identifier in self.cells:
+			target = ast.Subscript(**self.location, value=self.name(identifier), slice=ast.Constant(**self.location, value=0), ctx=self.store)
+		else:
+			target = self.name(identifier, self.store)
+		return ast.Assign(**self.location, targets=[target], value=value)
+
+	def compileBlock(self, statements):
+		body = []
+		for statement in statements:
+			body.extend(self.compileStatement(statement))
+		return body
+
+	def compileStatement(self, statement):
+		kind = type(statement)
+		if kind is expressionStatement:
+			expression = statement.expression
+			if type(expression) is assignExpr and self.resolve(expression.name) != None:
+				value = self.compileExpression(expression.value)
+				return [self.assign(self.target(expression.name), value)]
+			return [ast.Expr(**self.location, value=self.compileExpression(expression))]
+		elif kind is printStatement:
+			return [ast.Expr(**self.location, value=ast.Call(**self.location, func=self.name("write"), args=[self.compileExpression(statement.expression)], keywords=[]))]
+		elif kind is variableStatement:
+			if statement.initializer == None:
+				value = ast.Constant(**self.location, value=None)
+			else:
+				value = self.compileExpression(statement.initializer)
+			return [self.define(statement.name, value)]
+		elif kind is blockStatement:
+			self.scopes.append({})
+			body = self.compileBlock(statement.statements)
+			self.scopes.pop()
+			return body
+		elif kind is ifStatement:
+			test = self.compileCondition(statement.condition)
+			body = self.compileStatement(statement.thenBranch) or [ast.Pass(**self.location)]
+			orelse = []
+			if statement.elseBranch != None:
+				orelse = self.compileStatement(statement.elseBranch)
+			return [ast.If(**self.location, test=test, body=body, orelse=orelse)]
+		elif kind is whileStatement:
+			test = self.compileCondition(statement.condition)
+			body = self.compileStatement(statement.body) or [ast.Pass(**self.location)]
+			return [ast.While(**self.location, test=test, body=body, orelse=[])]
+		elif kind is functionStatement:
+			redeclared = statement.name.lexeme in self.scopes[-1]
+			identifier = self.declare(statement.name)
+			definition = self.function(self.fresh("f"), ["frame"], [])
+			if len(self.scopes) == 1 and not self.functions:
+				self.pending.append((definition, statement))
+			else:
+				self.compileFunction(definition, statement, self.scopes)
+			value = ast.Call(**self.location, func=self.constant(palFunction), args=[self.constant(statement), ast.Constant(**self.location, value=None),
+																				 self.name(definition.name)], keywords=[])
+			if identifier in self.cells and not redeclared:
+				# the cell exists before the function is made, so the function can call itself
+				return [self.cell(identifier, ast.Constant(**self.location, value=None)), definition, self.assign(identifier, value)]
+			return [definition, self.assign(identifier, value)]
+		elif kind is returnStatement:
+			value = statement.value
+			if type(value) is callExpr and value.native == None:
+				# a pal function called here is left to the calling loop in interpreter.callFunction once this frame is gone
+				arguments = ast.List(**self.location, elts=[self.compileExpression(argument) for argument in value.arguments], ctx=self.load)
+				return [ast.Return(**self.location, value=self.helper("returnCall", [self.constant(value.paren), self.compileExpression(value.callee), arguments]))]
+			body = [ast.Return(**self.location, value=self.constant(interpreter.RETURN))]
+			if value != None:
+				target = ast.Attribute(**self.location, value=self.name("interpreter"), attr="returnValue", ctx=self.store)
+				body.insert(0, ast.Assign(**self.location, targets=[target], value=self.compileExpression(value)))
+			return body
+		return []
+
+	def compileFunction(self, definition, statement, scopes):
+		# interpreter.enterCall leaves the arguments in the frame's slots, or by name when the program was not resolved
+		saved = self.scopes
+		self.scopes = scopes + [{}]
+		nonlocals = set()
+		cells = set()
+		self.functions.append((len(self.scopes) - 1, nonlocals, cells))
+		body = []
+		for index, param in enumerate(statement.params):
+			if statement.slot == None:
+				argument = ast.Subscript(**self.location, value=ast.Attribute(**self.location, value=self.name("frame"), attr="values", ctx=self.load),
+										 slice=ast.Constant(**self.location, value=str(param.lexeme)), ctx=self.load)
+			else:
+				argument = ast.Subscript(**self.location, value=ast.Attribute(**self.location, value=self.name("frame"), attr="slots", ctx=self.load),
+										 slice=ast.Constant(**self.location, value=index), ctx=self.load)
+			body.append(self.define(param, argument))
+		body += self.compileBlock(statement.body)
+		self.functions.pop()
+		self.scopes = saved
+		if nonlocals:
+			body.insert(0, ast.Nonlocal(**self.location, names=sorted(nonlocals)))
+		definition.body[:] = body or [ast.Pass(**self.location)]
+		# python closures would see whatever cell a variable holds when the function runs, a default keeps the one it was made with
+		definition.args.args += [ast.arg(**self.location, arg=identifier) for identifier in sorted(cells)]
+		definition.args.defaults = [self.name(identifier) for identifier in sorted(cells)]
+
+	def compileCondition(self, expression):
+		while type(expression) is groupingExpr:
+			expression = expression.expression
+		if type(expression) is binaryExpr and expression.op.type in self.comparisons:
+			test = self.compileExpression(expression)
+			if type(test) is not ast.IfExp:
+				return self.truthy(test)
+			# only the fallback for arrays can return something other than a bool, and every array is truthy
+			test.orelse = self.truthy(test.orelse)
+			return test
+		if type(expression) is binaryExpr and expression.op.type in ("EQUAL_EQUAL", "BANG_EQUAL"):
+			return self.compileExpression(expression)
+		if type(expression) is unaryExpr and expression.op.type == "BANG":
+			return self.compileExpression(expression)
+		return self.truthy(self.compileExpression(expression))
+
+	def truthy(self, value):
+		temporary = self.fresh("t")
+		return ast.BoolOp(**self.location, op=ast.And(), values=[
+			ast.Compare(**self.location, left=ast.NamedExpr(**self.location, target=self.name(temporary, self.store), value=value), ops=[ast.IsNot()], comparators=[ast.Constant(**self.location, value=None)]),
+			ast.Compare(**self.location, left=self.name(temporary), ops=[ast.IsNot()], comparators=[ast.Constant(**self.location, value=False)])])
+
+	def isType(self, value, kind):
+		return ast.Compare(**self.location, left=ast.Call(**self.location, func=self.name("type"), args=[value], keywords=[]), ops=[ast.Is()], comparators=[self.name(kind)])
+
+	def compileExpression(self, expression):
+		kind = type(expression)
+		if kind is literalExpr:
+			if type(expression.value) is list or type(expression.value) is numericArray:
+				return self.helper("copyArray", [self.constant(expression.value)])
+			return ast.Constant(**self.location, value=expression.value)
+		elif kind is indexExpr:
+			return self.helper("indexArray", [self.constant(expression.bracket), self.compileExpression(expression.object),
+											  self.compileExpression(expression.index)])
+		elif kind is setIndexExpr:
+			return self.helper("storeIndex", [self.constant(expression.bracket), self.compileExpression(expression.object),
+											  self.compileExpression(expression.index), self.compileExpression(expression.value)])
+		elif kind is sliceExpr:
+			bounds = [ast.Constant(**self.location, value=None) if bound == None else self.compileExpression(bound)
+					  for bound in (expression.start, expression.stop)]
+			return self.helper("sliceArray", [self.constant(expression.bracket), self.compileExpression(expression.object)] + bounds)
+		elif kind is lengthExpr:
+			return self.helper("arrayLength", [self.constant(expression.keyword), self.compileExpression(expression.argument)])
+		elif kind is groupingExpr:
+			return self.compileExpression(expression.expression)
+		elif kind is variableExpr:
+			name = self.resolve(expression.name)
+			if name == None and expression.name.lexeme in nativeLibrary.functions():
+				return self.constant(nativeLibrary.functions()[expression.name.lexeme])
+			elif name == None:
+				return self.failure(expression.name, "Undefined variable '" + str(expression.name.lexeme) + "'.")
+			return self.variable(name)
+		elif kind is assignExpr:
+			value = self.compileExpression(expression.value)
+			name = self.target(expression.name)
+			if name == None:
+				failure = self.failure(expression.name, "Undefined variable '" + str(expression.name.lexeme) + "'.")
+				return ast.Subscript(**self.location, value=ast.Tuple(**self.location, elts=[value, failure], ctx=self.load), slice=ast.Constant(**self.location, value=1), ctx=self.load)
+			if name in self.cells:
+				# a cell is stored through a call, the value is kept in a temporary to be the result
+				temporary = self.fresh("t")
+				store = ast.Call(**self.location, func=ast.Attribute(**self.location, value=self.name(name), attr="__setitem__", ctx=self.load),
+								 args=[ast.Constant(**self.location, value=0), ast.NamedExpr(**self.location, target=self.name(temporary, self.store), value=value)], keywords=[])
+				return ast.Subscript(**self.location, value=ast.Tuple(**self.location, elts=[store, self.name(temporary)], ctx=self.load), slice=ast.Constant(**self.location, value=1), ctx=self.load)
+			return ast.NamedExpr(**self.location, target=self.name(name, self.store), value=value)
+		elif kind is binaryExpr:
+			return self.compileBinary(expression)
+		elif kind is unaryExpr:
+			temporary = self.fresh("t")
+			right = ast.NamedExpr(**self.location, target=self.name(temporary, self.store), value=self.compileExpression(expression.right))
+			if expression.op.type == "MINUS":
+				return ast.IfExp(**self.location, test=self.isType(right, "float"), body=ast.UnaryOp(**self.location, op=ast.USub(), operand=self.name(temporary)),
+								 orelse=self.failure(expression.op, "Operand must be a number."))
+			return ast.BoolOp(**self.location, op=ast.Or(), values=[
+				ast.Compare(**self.location, left=right, ops=[ast.Is()], comparators=[ast.Constant(**self.location, value=None)]),
+				ast.Compare(**self.location, left=self.name(temporary), ops=[ast.Is()], comparators=[ast.Constant(**self.location, value=False)])])
+		elif kind is logicalExpr:
+			# the left operand is kept in the truthiness temporary and returned when it decides the result
+			left = self.truthy(self.compileExpression(expression.left))
+			temporary = left.values[1].left.id
+			if expression.op.type == "AND":
+				left = ast.UnaryOp(**self.location, op=ast.Not(), operand=left)
+			return ast.IfExp(**self.location, test=left, body=self.name(temporary), orelse=self.compileExpression(expression.right))
+		elif kind is callExpr:
+			arguments = [self.compileExpression(argument) for argument in expression.arguments]
+			if expression.native != None:
+				function = self.constant(expression.native.guarded(expression.paren))
+				return ast.Call(**self.location, func=function, args=arguments, keywords=[])
+			callee = self.compileExpression(expression.callee)
+			return self.helper("callValue", [self.constant(expression.paren), callee,
+											 ast.List(**self.location, elts=arguments, ctx=self.load)])
+		return ast.Constant(**self.location, value=None)
+
+	def compileBinary(self, expression):
+		op = expression.op
+		left = self.compileExpression(expression.left)
+		right = self.compileExpression(expression.right)
+		if op.type == "EQUAL_EQUAL":
+			return ast.Compare(**self.location, left=left, ops=[ast.Eq()], comparators=[right])
+		elif op.type == "BANG_EQUAL":
+			return ast.UnaryOp(**self.location, op=ast.Not(), operand=ast.Compare(**self.location, left=left, ops=[ast.Eq()], comparators=[right]))
+		leftName = self.fresh("t")
+		rightName = self.fresh("t")
+		leftValue = self.name(leftName)
+		rightValue = self.name(rightName)
+		if op.type in self.comparisons:
+			result = ast.Compare(**self.location, left=leftValue, ops=[self.comparisons[op.type]()], comparators=[rightValue])
+		else:
+			result = ast.BinOp(**self.location, left=leftValue, op=self.numeric[op.type](), right=rightValue)
+		message = "Operands must be two numbers or two strings." if op.type == "PLUS" else "Operands must be numbers"
+		if type(expression.right) is literalExpr and type(expression.right.value) is float:
+			# a number literal on the right only leaves the left operand to check
+			if type(result) is ast.BinOp:
+				result.right = right
+			else:
+				result.comparators = [right]
+			test = self.isType(ast.NamedExpr(**self.location, target=self.name(leftName, self.store), value=left), "float")
+			return ast.IfExp(**self.location, test=test, body=result, orelse=self.failure(op, message, [leftValue, right]))
+		test = ast.BinOp(**self.location, left=self.isType(ast.NamedExpr(**self.location, target=self.name(leftName, self.store), value=left), "float"),
+						 op=ast.BitAnd(), right=self.isType(ast.NamedExpr(**self.location, target=self.name(rightName, self.store), value=right), "float"))
+		if op.type == "PLUS":
+			strings = ast.BinOp(**self.location, left=self.isType(leftValue, "str"), op=ast.BitAnd(), right=self.isType(rightValue, "str"))
+			test = ast.BoolOp(**self.location, op=ast.Or(), values=[test, strings])
+		return ast.IfExp(**self.location, test=test, body=result, orelse=self.failure(op, message, [leftValue, rightValue]))
+
+
+class repl():
+	'''
+	attrs: args(dict), scannerClass(class), interpreter(interpreter), timings(dict)
+	keeps one interpreter with its global enviroment and resolver alive between inputs, so each input only pays for its own phases
+	input that does not end in ';' or '}' is a bare expression, parsed with parseSingle and printed
+	'''
+
+	phases = ["scan", "parse", "resolve", "execute"]
+	statements = ["VAR", "FUN", "PRINT", "IF", "WHILE", "FOR", "RETURN", "LEFT_BRACE"]
+
+	def __init__(self, args):
+		self.args = args
+		if args.backend not in ("tree", "closures"):
+			# the vm and the generated python keep their globals to one run
+			print("the " + args.backend + " backend starts every run from fresh globals, using the tree backend")
+			args.backend = "tree"
+		self.scannerClass = {"regex": regexScanner, "columnar": columnarScanner, "character": scanner}[args.scanner]
+		self.interpreter = interpreter(args, self.scannerClass(None, ""))
+		self.timings = {}
+
+	def loop(self):
+		print("Pal interactive session, :time [input] shows the phase timings of the last input, :quit leaves")
+		while True:
+			try:
+				source = self.read()
+			except EOFError:
+				print()
+				return
+			except KeyboardInterrupt:
+				print()
+				continue
+			command = source.strip()
+			if command == ":quit":
+				return
+			elif command == ":time":
+				self.writeTimings()
+			elif command.startswith(":time "):
+				self.evaluate(command[len(":time "):])
+				self.writeTimings()
+			elif command.startswith(":"):
+				print("Unknown command " + command.split()[0] + ", try :time or :quit.")
+			elif command:
+				self.evaluate(source)
+
+	def read(self):
+		lines = [input("> ")]
+		# a block stays open until its braces balance, strings and comments are whole lexemes and never count
+		while True:
+			lexemes = regexScanner.pattern.findall("\n".join(lines))
+			if lexemes.count("{") <= lexemes.count("}"):
+				return "\n".join(lines)
+			lines.append(input("... "))
+
+	def evaluate(self, source):
+		interpreter.hadError = False
+		interpreter.hadRuntimeError = False
+		self.timings = {}
+		try:
+			start = timer()
+			instance = self.scannerClass(None, source)
+			tokens = instance.scanTokens()
+			self.timings["scan"] = timer() - start
+			if interpreter.hadError:
+				return
+			start = timer()
+			statements = self.parse(tokens)
+			if interpreter.hadError:
+				return
+			if self.args.optimize:
+				optimizer(self.interpreter).optimize(statements)
+			self.timings["parse"] = timer() - start
+			if self.args.resolve:
+				start = timer()
+				state = self.snapshot()
+				try:
+					self.interpreter.resolve(statements)
+				except Exception:
+					self.restore(state)
+					raise
+				self.timings["resolve"] = timer() - start
+				if interpreter.hadError:
+					self.restore(state)
+					return
+			self.interpreter.scanner = instance
+			start = timer()
+			try:
+				if self.args.backend == "closures":
+					self.interpreter.interpretClosures(statements)
+				else:
+					self.interpreter.interpret(statements)
+			finally:
+				self.interpreter.output.flush()
+			self.timings["execute"] = timer() - start
+		except KeyboardInterrupt:
+			print("Interrupted.")
+		except Exception as e:
+			print(e)
+
+	def snapshot(self):
+		# what resolving an input changes, an input with errors is rolled back so none of its declarations stay behind
+		resolver = self.interpreter.resolver
+		return dict(resolver.scopes[0]), resolver.globalCount, dict(resolver.natives), list(resolver.pending)
+
+	def restore(self, state):
+		resolver = self.interpreter.resolver
+		names, resolver.globalCount, resolver.natives, resolver.pending = state
+		resolver.scopes = [dict(names)]
+		resolver.function = None
+
+	def parse(self, tokens):
+		if len(tokens) == 1:
+			return []
+		tokenParser = self.interpreter.tokenParser(tokens)
+		if tokens[-2].type in ("SEMICOLON", "RIGHT_BRACE") or tokens[0].type in self.statements:
+			return tokenParser.parse()
+		expression = tokenParser.parseSingle()
+		if expression != None and not tokenParser.isAtEnd():
+			interpreter.parseError(tokenParser.peek(), "Expect end of expression.")
+		return [printStatement(expression)]
+
+	def writeTimings(self):
+		if not self.timings:
+			print("Nothing timed yet.")
+			return
+		for phase in self.phases:
+			if phase in self.timings:
+				print(phase.ljust(10) + str(round(self.timings[phase] * 1000, 3)).rjust(10) + " ms")
+		print("total".ljust(10) + str(round(sum(self.timings.values()) * 1000, 3)).rjust(10) + " ms")
+
+
+class server():
+	'''
+	attrs: path(string), workers(int), timeout(float), requests(queue.Queue), latencies(deque(float)), counts(dict), lock(threading.Lock)
+	serves palc.py clients on a unix socket, the module is imported once and every request runs in a process forked from it,
+	so each program gets a fresh interpreter and enviroment and a request past its timeout can be killed
+	a fixed number of worker threads take accepted requests off the queue, each one waiting on its own forked process
+	every connection gets a short lived thread that reads its request, a slow client never holds up the accept loop
+	forking with threads running is safe here: the child only runs the interpreter on a fresh pipe and leaves with os._exit,
+	it never touches the queue, the lock or the sockets the other threads may have been using when it was forked
+	'''
+
+	readTimeout = 5.0
+
+	def __init__(self, path, workers, timeout):
+		self.path = path
+		self.workers = max(workers, 1)
+		self.timeout = timeout
+		self.requests = queue.Queue()
+		self.latencies = deque(maxlen=1000)
+		self.counts = {"requests": 0, "ok": 0, "failed": 0, "timeouts": 0, "running": 0, "maxQueue": 0}
+		self.lock = threading.Lock()
+
+	def serve(self):
+		if os.path.exists(self.path):
+			os.remove(self.path)
+		listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		listener.bind(self.path)
+		listener.listen(64)
+		for i in range(self.workers):
+			threading.Thread(target=self.work, daemon=True).start()
+		# stopping the daemon with kill cleans up the same way as with ctrl-c
+		signal.signal(signal.SIGTERM, signal.default_int_handler)
+		# python 3.12 warns about every fork from a process with threads, see the docstring for why these are fine
+		warnings.filterwarnings("ignore", message=".*use of fork\\(\\) may lead to deadlocks", category=DeprecationWarning)
+		print("serving on " + self.path + " with " + str(self.workers) + " workers, " + str(self.timeout) + " s timeout")
+		try:
+			while True:
+				connection, address = listener.accept()
+				threading.Thread(target=self.accept, args=(connection,), daemon=True).start()
+		except KeyboardInterrupt:
+			print()
+			print(json.dumps(self.metrics()))
+		finally:
+			listener.close()
+			os.remove(self.path)
+
+	def accept(self, connection):
+		# metrics are answered here, so they never wait behind the programs in the queue
+		try:
+			connection.settimeout(server.readTimeout)
+			with connection.makefile("rb") as file:
+				request = json.loads(file.readline())
+			connection.settimeout(None)
+			if request.get("metrics"):
+				server.send(connection, self.metrics())
+				connection.close()
+				return
+		except (OSError, ValueError):
+			connection.close()
+			return
+		self.requests.put((connection, request, timer()))
+		with self.lock:
+			self.counts["maxQueue"] = max(self.counts["maxQueue"], self.requests.qsize())
+
+	def work(self):
+		while True:
+			connection, request, queued = self.requests.get()
+			with self.lock:
+				self.counts["running"] += 1
+			try:
+				self.handle(connection, request, queued)
+			except OSError:
+				pass
+			finally:
+				connection.close()
+				with self.lock:
+					self.counts["running"] -= 1
+
+	@staticmethod
+	def send(connection, message):
+		connection.sendall((json.dumps(message) + "\n").encode())
+
+	def handle(self, connection, request, queued):
+		start = timer()
+		status = self.execute(connection, request)
+		end = timer()
+		server.send(connection, {"status": status, "queued": start - queued, "seconds": end - start})
+		with self.lock:
+			self.counts["requests"] += 1
+			self.counts[{"ok": "ok", "timeout": "timeouts"}.get(status, "failed")] += 1
+			self.latencies.append(end - queued)
+
+	def execute(self, connection, request):
+		read, write = os.pipe()
+		pid = os.fork()
+		if pid == 0:
+			os.close(read)
+			os._exit(server.child(write, request))
+		os.close(write)
+		decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+		deadline = timer() + self.timeout
+		try:
+			while True:
+				remaining = deadline - timer()
+				if remaining <= 0 or not select.select([read], [], [], remaining)[0]:
+					os.kill(pid, signal.SIGKILL)
+					os.waitpid(pid, 0)
+					return "timeout"
+				chunk = os.read(read, 65536)
+				if not chunk:
+					break
+				server.send(connection, {"output": decoder.decode(chunk)})
+		except OSError:
+			# the client went away, there is nobody left to run the program for
+			os.kill(pid, signal.SIGKILL)
+			os.waitpid(pid, 0)
+			raise
+		finally:
+			os.close(read)
+		pid, code = os.waitpid(pid, 0)
+		return "ok" if os.WIFEXITED(code) and os.WEXITSTATUS(code) == 0 else "error"
+
+	@staticmethod
+	def child(write, request):
+		# runs in the forked process, the pal arguments are parsed as if they had been given to pal.py directly
+		code = 1
+		try:
+			sys.stdout = sys.stderr = os.fdopen(write, "w")
+			os.chdir(request["cwd"])
+			args = pal.arguments().parse_args(request["argv"])
+			if args.input == None or args.serve != None:
+				print("the daemon runs one program per request, give an input file or - for stdin")
+				return code
+			if args.output == "auto":
+				args.output = "line" if request.get("tty") else "block"
+			if args.input == "-":
+				pal.runFile(args, None, request.get("source", ""))
+			else:
+				pal.runFile(args, [args.input])
+			code = 1 if interpreter.hadError or interpreter.hadRuntimeError else 0
+		except SystemExit as e:
+			code = e.code if type(e.code) is int else 1
+		except BaseException as e:
+			print(e)
+		finally:
+			sys.stdout.flush()
+		return code
+
+	def metrics(self):
+		with self.lock:
+			latencies = sorted(self.latencies)
+			metrics = dict(self.counts)
+		metrics["queue"] = self.requests.qsize()
+		if latencies:
+			metrics["latency"] = {"median": latencies[len(latencies) // 2], "p95": latencies[int(len(latencies) * 0.95)],
+								  "max": latencies[-1], "window": len(latencies)}
+		return metrics
+
+
+class batch():
+	'''
+	attrs: args(dict), targets(list(string)), paths(list(string)), workers(int)
+	runs many programs on a pool of worker processes, each worker imports the module once and runs file after file
+	output is captured per file and printed in path order, a program that fails only fails its own entry
+	'''
+
+	def __init__(self, args, targets, workers):
+		self.args = args
+		self.targets = targets
+		paths = set()
+		for target in targets:
+			# a directory stands for every program below it, anything else is a path or glob pattern
+			pattern = os.path.join(target, "**", "*.pal") if os.path.isdir(target) else target
+			paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+		self.paths = sorted(paths)
+		self.workers = max(min(workers or os.cpu_count() or 1, len(self.paths)), 1)
+
+	@staticmethod
+	def runOne(args, path):
+		# runs in a worker process, the class wide error flags are reset so one program's errors stay its own
+		interpreter.hadError = False
+		interpreter.hadRuntimeError = False
+		stdout = sys.stdout
+		sys.stdout = captured = io.StringIO()
+		status = "ok"
+		start = timer()
+		try:
+			pal.runFile(args, [path])
+		except SystemExit:
+			pass
+		except Exception as e:
+			print(e)
+			status = "crashed"
+		finally:
+			sys.stdout = stdout
+		seconds = timer() - start
+		if status == "ok" and interpreter.hadError:
+			status = "parse error"
+		elif status == "ok" and interpreter.hadRuntimeError:
+			status = "runtime error"
+		return status, seconds, captured.getvalue()
+
+	def run(self):
+		if not self.paths:
+			print("no programs match " + " ".join(self.targets))
+			return 1
+		start = timer()
+		results = []
+		with concurrent.futures.ProcessPoolExecutor(self.workers) as pool:
+			futures = [pool.submit(batch.runOne, self.args, path) for path in self.paths]
+			# waiting in submission order prints every file as soon as the ones before it are done
+			for path, future in zip(self.paths, futures):
+				try:
+					status, seconds, output = future.result()
+				except Exception as e:
+					status, seconds, output = "crashed", 0.0, "worker failed: " + str(e) + "\n"
+				print("==> " + path + " <==")
+				sys.stdout.write(output)
+				sys.stdout.flush()
+				results.append((path, status, seconds))
+		self.writeSummary(results, timer() - start)
+		return 0 if all(status == "ok" for path, status, seconds in results) else 1
+
+	def writeSummary(self, results, wall):
+		counts = {}
+		for path, status, seconds in results:
+			counts[status] = counts.get(status, 0) + 1
+		print("======== batch =======")
+		print(str(len(results)) + " files, " + ", ".join(str(count) + " " + status for status, count in sorted(counts.items())))
+		print(str(round(sum(seconds for path, status, seconds in results), 3)) + " s running programs, " +
+			  str(round(wall, 3)) + " s wall on " + str(self.workers) + " workers")
+		for path, status, seconds in sorted(results, key=lambda result: -result[2])[:5]:
+			print("slowest " + str(round(seconds, 3)).rjust(8) + " s  " + path)
+		for path, status, seconds in results:
+			if status != "ok":
+				print("failed  " + status.ljust(14) + path)
+		print("======================")
+
+
+class pal():
+
+	def __init__(self):
+		argParser = pal.arguments()
+		self.args = argParser.parse_args()
+		inputFilePath = [self.args.input] if self.args.input != None else None
+		# run
+		if self.args.serve != None:
+			server(self.args.serve, self.args.workers or 4, self.args.timeout).serve()
+		elif self.args.batch != None:
+			sys.exit(batch(self.args, self.args.batch, self.args.workers).run())
+		elif inputFilePath == None:
+			repl(self.args).loop()
+		else:
+			try:
+				self.interpreter = pal.runFile(self.args, inputFilePath)
+			except Exception as e:
+				print(e)
+
+	@staticmethod
+	def arguments():
+		# input arguments
+		argParser = argparse.ArgumentParser(
+			description="A basic interpreter for Pal, a general purpouse programming language")
+		argParser.add_argument(
+			"input", nargs="?", help="specify a input file containing a program to run, without one an interactive session starts, - is stdin for palc.py")
+		argParser.add_argument("-v", "--verbose", dest="verbose",
+							   action="store_true", help="show debugging output")
+		argParser.add_argument("--scanner", dest="scanner", choices=["regex", "columnar", "character"], default="regex",
+							   help="tokenizer: master regular expression producing token objects or a columnar token store, or the character by character scanner")
+		argParser.add_argument("--parser", dest="parser", choices=["pratt", "descent"], default="pratt",
+							   help="expression parser: binding power table or one recursive method per precedence level")
+		argParser.add_argument("--backend", dest="backend", choices=["tree", "closures", "bytecode", "python"], default="tree",
+							   help="execution engine: tree walking interpreter, compiled closures, bytecode vm or code transpiled to python")
+		argParser.add_argument("--output", dest="output", choices=["auto", "line", "block"], default="auto",
+							   help="flush program output after every line or in large blocks, auto picks line for terminals")
+		argParser.add_argument("--no-resolve", dest="resolve", action="store_false",
+							   help="look variables up by name at runtime instead of resolving them ahead of time")
+		argParser.add_argument("--no-optimize", dest="optimize", action="store_false",
+							   help="skip folding constant expressions before running")
+		argParser.add_argument("--no-cache", dest="cache", action="store_false",
+							   help="always scan and parse instead of loading the program from __palcache__")
+		argParser.add_argument("--dump-bytecode", dest="dumpBytecode",
+							   action="store_true", help="show the compiled bytecode before running")
+		argParser.add_argument("--profile", dest="profile", action="store_true",
+							   help="time the scan, parse and execute phases and every node evaluation and print a report")
+		argParser.add_argument("--profile-json", dest="profileJson", metavar="FILE",
+							   help="write the profile to FILE as json instead of printing it, implies --profile")
+		argParser.add_argument("--sample", dest="sample", action="store_true",
+							   help="sample the executing source line from a background thread and print a per line hit table")
+		argParser.add_argument("--sample-interval", dest="sampleInterval", type=float, default=0.001, metavar="SECONDS",
+							   help="time between samples, bounded below by the interpreter thread switch interval")
+		argParser.add_argument("--collapsed", dest="collapsed", metavar="FILE",
+							   help="write the sampled statement chains to FILE in collapsed stack format for flame graph tools, implies --sample")
+		argParser.add_argument("--memo-size", dest="memoSize", type=int, default=1024, metavar="N",
+							   help="results kept per memo() function before the least recently used one is evicted")
+		argParser.add_argument("--serve", dest="serve", metavar="SOCKET",
+							   help="run as a daemon on the unix socket SOCKET, executing the programs palc.py sends")
+		argParser.add_argument("--batch", dest="batch", nargs="+", metavar="DIR|GLOB",
+							   help="run every program in the directories or matching the patterns on a process pool and summarize them")
+		argParser.add_argument("--workers", dest="workers", type=int, metavar="N",
+							   help="programs the daemon or a batch runs at once, by default 4 for the daemon and the core count for a batch")
+		argParser.add_argument("--timeout", dest="timeout", type=float, default=30, metavar="SECONDS",
+							   help="time after which the daemon kills a running program")
+		return argParser
+
+	@staticmethod
+	def runFile(args, inputFilePath, source=None):
+		if args.scanner == "regex":
+			programScanner = regexScanner(inputFilePath, source)
+		elif args.scanner == "columnar":
+			programScanner = columnarScanner(inputFilePath, source)
+		else:
+			programScanner = scanner(inputFilePath, source)
+		runner = interpreter(args, programScanner)
+		start = timer()
+		runner.run()
+		end = timer()
+		if args.verbose:
+			print("Execution finished in", (end-start), "seconds")
+		return runner
+
+
+if __name__ == "__main__":
+	pal()
@@ -0,0 +1,65 @@
+import json
+import os
+import socket
+import sys
+
+# runs a program on a pal.py --serve daemon, taking the same arguments as pal.py
+# only the standard library pieces needed to talk to the socket are imported, so starting this is cheap
+# usage: palc.py [--socket PATH] [--metrics] <pal.py arguments>
+
+
+def connect(path):
+	connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	try:
+		connection.connect(path)
+	except OSError:
+		connection.close()
+		return None
+	return connection
+
+
+def request(connection, message):
+	try:
+		connection.sendall((json.dumps(message) + "\n").encode())
+		with connection.makefile("rb") as file:
+			for line in file:
+				yield json.loads(line)
+	finally:
+		connection.close()
+
+
+def main():
+	argv = sys.argv[1:]
+	path = os.environ.get("PAL_SOCKET", "/tmp/pal.sock")
+	if argv[:1] == ["--socket"] and len(argv) > 1:
+		path = argv[1]
+		argv = argv[2:]
+	if argv == ["--metrics"]:
+		message = {"metrics": True}
+	else:
+		message = {"argv": argv, "cwd": os.getcwd(), "tty": sys.stdout.isatty()}
+		if "-" in argv:
+			message["source"] = sys.stdin.read()
+	# connecting after stdin is read, the daemon gives up on requests that take too long to arrive
+	connection = connect(path)
+	if connection == None:
+		print("daemon not running at " + path)
+		return 1
+	if "metrics" in message:
+		for response in request(connection, message):
+			print(json.dumps(response, indent=2))
+		return 0
+	status = "error"
+	for response in request(connection, message):
+		if "output" in response:
+			sys.stdout.write(response["output"])
+			sys.stdout.flush()
+		else:
+			status = response["status"]
+	if status == "timeout":
+		print("Program timed out.")
+	return 0 if status == "ok" else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())